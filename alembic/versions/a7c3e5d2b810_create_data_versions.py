@@ -0,0 +1,27 @@
+"""create data_versions table
+
+Revision ID: a7c3e5d2b810
+Revises: f2a6b1c9d4e7
+Create Date: 2025-04-03
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a7c3e5d2b810"
+down_revision = "f2a6b1c9d4e7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "data_versions",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade():
+    op.drop_table("data_versions")
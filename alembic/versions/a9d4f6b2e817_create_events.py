@@ -0,0 +1,38 @@
+"""create events table
+
+Revision ID: a9d4f6b2e817
+Revises: f3b7d2a5c618
+Create Date: 2025-04-10
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a9d4f6b2e817"
+down_revision = "f3b7d2a5c618"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "events",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("entity_type", sa.String(length=30), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=True),
+        sa.Column("action", sa.String(length=50), nullable=False),
+        sa.Column("actor", sa.String(length=150), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_events_created_at", "events", ["created_at", "id"])
+    op.create_index("ix_events_entity", "events", ["entity_type", "entity_id"])
+    op.create_index("ix_events_actor", "events", ["actor"])
+
+
+def downgrade():
+    op.drop_index("ix_events_actor", table_name="events")
+    op.drop_index("ix_events_entity", table_name="events")
+    op.drop_index("ix_events_created_at", table_name="events")
+    op.drop_table("events")
@@ -0,0 +1,26 @@
+"""add composite key index on stock_logs
+
+Revision ID: b4d9f1a6c2e3
+Revises: a7c3e5d2b810
+Create Date: 2025-04-04
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b4d9f1a6c2e3"
+down_revision = "a7c3e5d2b810"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_stock_logs_key_tarih",
+        "stock_logs",
+        ["donanim_tipi", "marka", "model", "ifs_no", "tarih", "id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_stock_logs_key_tarih", table_name="stock_logs")
@@ -0,0 +1,24 @@
+"""add actor index for the paginated logs page
+
+Revision ID: b4e8c2f6a713
+Revises: a9d4f6b2e817
+Create Date: 2025-04-11
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b4e8c2f6a713"
+down_revision = "a9d4f6b2e817"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_inventory_log_actor_created_at", "inventory_log", ["actor", "created_at"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_inventory_log_actor_created_at", table_name="inventory_log")
@@ -0,0 +1,28 @@
+"""create schema_fingerprints table
+
+Revision ID: b6e2d8f4a173
+Revises: e4c9a7d2b815
+Create Date: 2025-04-24
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "b6e2d8f4a173"
+down_revision = "e4c9a7d2b815"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "schema_fingerprints",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("applied_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("schema_fingerprints")
@@ -0,0 +1,52 @@
+"""add search keys to person and number columns
+
+Revision ID: c3f9e1a7d462
+Revises: b6e2d8f4a173
+Create Date: 2025-04-25
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from utils.normalize import normalize_search
+
+# revision identifiers, used by Alembic.
+revision = "c3f9e1a7d462"
+down_revision = "b6e2d8f4a173"
+branch_labels = None
+depends_on = None
+
+SEARCH_KEYS = (
+    ("users", "full_name", "full_name_norm"),
+    ("inventories", "no", "no_norm"),
+    ("inventories", "seri_no", "seri_no_norm"),
+    ("inventories", "sorumlu_personel", "sorumlu_personel_norm"),
+    ("inventories", "ifs_no", "ifs_no_norm"),
+    ("printers", "envanter_no", "envanter_no_norm"),
+    ("printers", "seri_no", "seri_no_norm"),
+    ("printers", "sorumlu_personel", "sorumlu_personel_norm"),
+    ("printers", "ifs_no", "ifs_no_norm"),
+    ("licenses", "sorumlu_personel", "sorumlu_personel_norm"),
+    ("licenses", "ifs_no", "ifs_no_norm"),
+)
+
+
+def upgrade():
+    conn = op.get_bind()
+    for table, source, target in SEARCH_KEYS:
+        op.add_column(table, sa.Column(target, sa.String(length=200), nullable=True))
+        op.create_index(f"ix_{table}_{target}", table, [target])
+        rows = conn.execute(
+            sa.text(f"SELECT id, {source} FROM {table} WHERE {source} IS NOT NULL")
+        ).all()
+        if rows:
+            conn.execute(
+                sa.text(f"UPDATE {table} SET {target} = :key WHERE id = :id"),
+                [{"id": row[0], "key": normalize_search(row[1])} for row in rows],
+            )
+
+
+def downgrade():
+    for table, source, target in reversed(SEARCH_KEYS):
+        op.drop_index(f"ix_{table}_{target}", table_name=table)
+        op.drop_column(table, target)
@@ -0,0 +1,24 @@
+"""add created_at index on printer_histories for log archival
+
+Revision ID: c6f1a8d3e592
+Revises: b4e8c2f6a713
+Create Date: 2025-04-12
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c6f1a8d3e592"
+down_revision = "b4e8c2f6a713"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_printer_histories_created_at", "printer_histories", ["created_at"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_printer_histories_created_at", table_name="printer_histories")
@@ -0,0 +1,22 @@
+"""add (tarih, id) index on stock_logs
+
+Revision ID: c8e2a4f7d135
+Revises: b4d9f1a6c2e3
+Create Date: 2025-04-05
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c8e2a4f7d135"
+down_revision = "b4d9f1a6c2e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_stock_logs_tarih_id", "stock_logs", ["tarih", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_stock_logs_tarih_id", table_name="stock_logs")
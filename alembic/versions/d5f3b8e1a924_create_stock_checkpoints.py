@@ -0,0 +1,59 @@
+"""create stock checkpoint tables
+
+Revision ID: d5f3b8e1a924
+Revises: c8e2a4f7d135
+Create Date: 2025-04-07
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "d5f3b8e1a924"
+down_revision = "c8e2a4f7d135"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "stock_checkpoints",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("taken_at", sa.DateTime(), nullable=False),
+        sa.Column("last_log_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_stock_checkpoints_taken_at", "stock_checkpoints", ["taken_at"], unique=True
+    )
+    op.create_table(
+        "stock_checkpoint_balances",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "checkpoint_id",
+            sa.Integer(),
+            sa.ForeignKey("stock_checkpoints.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("stock_key", sa.String(length=600), nullable=False),
+        sa.Column("donanim_tipi", sa.String(length=150), nullable=False),
+        sa.Column("marka", sa.String(length=150), nullable=True),
+        sa.Column("model", sa.String(length=150), nullable=True),
+        sa.Column("ifs_no", sa.String(length=100), nullable=True),
+        sa.Column("miktar", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_tarih", sa.DateTime(), nullable=True),
+        sa.Column("last_log_id", sa.Integer(), nullable=True),
+        sa.Column("source_type", sa.String(length=50), nullable=True),
+        sa.Column("source_id", sa.Integer(), nullable=True),
+        sa.Column("lisans_anahtari", sa.String(length=500), nullable=True),
+        sa.Column("mail_adresi", sa.String(length=200), nullable=True),
+        sa.UniqueConstraint(
+            "checkpoint_id", "stock_key", name="uq_stock_checkpoint_balance_key"
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table("stock_checkpoint_balances")
+    op.drop_index("ix_stock_checkpoints_taken_at", table_name="stock_checkpoints")
+    op.drop_table("stock_checkpoints")
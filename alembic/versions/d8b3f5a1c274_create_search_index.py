@@ -0,0 +1,28 @@
+"""create FTS5 search index
+
+Revision ID: d8b3f5a1c274
+Revises: c6f1a8d3e592
+Create Date: 2025-04-14
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d8b3f5a1c274"
+down_revision = "c6f1a8d3e592"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Documents are filled on start-up or by ``python -m
+    # scripts.rebuild_search_index``.
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+        "entity_type UNINDEXED, entity_id UNINDEXED, title, body, alt,"
+        " tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS search_index")
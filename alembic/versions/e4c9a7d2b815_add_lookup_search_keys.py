@@ -0,0 +1,49 @@
+"""add normalized search keys to lookup tables
+
+Revision ID: e4c9a7d2b815
+Revises: d8b3f5a1c274
+Create Date: 2025-04-21
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from utils.normalize import normalize_search
+
+# revision identifiers, used by Alembic.
+revision = "e4c9a7d2b815"
+down_revision = "d8b3f5a1c274"
+branch_labels = None
+depends_on = None
+
+SEARCH_KEYS = (
+    ("brands", "name", "name_norm", ("name_norm",)),
+    ("models", "name", "name_norm", ("brand_id", "name_norm")),
+    ("factories", "name", "name_norm", ("name_norm",)),
+    ("usage_areas", "name", "name_norm", ("name_norm",)),
+    ("hardware_types", "name", "name_norm", ("name_norm",)),
+    ("license_names", "name", "name_norm", ("name_norm",)),
+    ("bilgi_kategorileri", "ad", "ad_norm", ("ad_norm",)),
+    ("lookups", "value", "value_norm", ("type", "value_norm")),
+)
+
+
+def upgrade():
+    conn = op.get_bind()
+    for table, source, target, index_columns in SEARCH_KEYS:
+        op.add_column(table, sa.Column(target, sa.String(length=200), nullable=True))
+        op.create_index(
+            f"ix_{table}_{'_'.join(index_columns)}", table, list(index_columns)
+        )
+        rows = conn.execute(sa.text(f"SELECT id, {source} FROM {table}")).all()
+        if rows:
+            conn.execute(
+                sa.text(f"UPDATE {table} SET {target} = :key WHERE id = :id"),
+                [{"id": row[0], "key": normalize_search(row[1])} for row in rows],
+            )
+
+
+def downgrade():
+    for table, source, target, index_columns in reversed(SEARCH_KEYS):
+        op.drop_index(f"ix_{table}_{'_'.join(index_columns)}", table_name=table)
+        op.drop_column(table, target)
@@ -0,0 +1,24 @@
+"""add timestamp indexes for the recent activity feed
+
+Revision ID: e7a1c4d9b356
+Revises: d5f3b8e1a924
+Create Date: 2025-04-08
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e7a1c4d9b356"
+down_revision = "d5f3b8e1a924"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_inventory_log_created_at", "inventory_log", ["created_at"])
+    op.create_index("ix_license_logs_tarih", "license_logs", ["tarih"])
+
+
+def downgrade():
+    op.drop_index("ix_license_logs_tarih", table_name="license_logs")
+    op.drop_index("ix_inventory_log_created_at", table_name="inventory_log")
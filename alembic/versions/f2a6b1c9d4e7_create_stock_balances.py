@@ -0,0 +1,46 @@
+"""create stock_balances table
+
+Revision ID: f2a6b1c9d4e7
+Revises: 5cf4d4b998eb
+Create Date: 2025-04-02
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "f2a6b1c9d4e7"
+down_revision = "5cf4d4b998eb"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "stock_balances",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("stock_key", sa.String(length=600), nullable=False),
+        sa.Column("donanim_tipi", sa.String(length=150), nullable=False),
+        sa.Column("marka", sa.String(length=150), nullable=True),
+        sa.Column("model", sa.String(length=150), nullable=True),
+        sa.Column("ifs_no", sa.String(length=100), nullable=True),
+        sa.Column("miktar", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_tarih", sa.DateTime(), nullable=True),
+        sa.Column("last_log_id", sa.Integer(), nullable=True),
+        sa.Column("source_type", sa.String(length=50), nullable=True),
+        sa.Column("source_id", sa.Integer(), nullable=True),
+        sa.Column("lisans_anahtari", sa.String(length=500), nullable=True),
+        sa.Column("mail_adresi", sa.String(length=200), nullable=True),
+    )
+    op.create_index(
+        "ix_stock_balances_stock_key", "stock_balances", ["stock_key"], unique=True
+    )
+    op.create_index(
+        "ix_stock_balances_donanim_tipi", "stock_balances", ["donanim_tipi"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_stock_balances_donanim_tipi", table_name="stock_balances")
+    op.drop_index("ix_stock_balances_stock_key", table_name="stock_balances")
+    op.drop_table("stock_balances")
@@ -0,0 +1,28 @@
+"""create dashboard_counters table
+
+Revision ID: f3b7d2a5c618
+Revises: e7a1c4d9b356
+Create Date: 2025-04-09
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "f3b7d2a5c618"
+down_revision = "e7a1c4d9b356"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "dashboard_counters",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("value", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("reconciled_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table("dashboard_counters")
@@ -1,5 +1,15 @@
 """Core utilities for the application."""
 
-from .security import hash_password, pwd_context, verify_password
+from .security import (
+    hash_password,
+    pwd_context,
+    verify_and_update_password,
+    verify_password,
+)
 
-__all__ = ["hash_password", "verify_password", "pwd_context"]
+__all__ = [
+    "hash_password",
+    "verify_password",
+    "verify_and_update_password",
+    "pwd_context",
+]
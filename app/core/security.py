@@ -1,22 +1,67 @@
-"""Security helpers shared across the application."""
+"""Security helpers shared across the application.
+
+bcrypt is deliberately slow, so hashing and verification run on a small
+bounded thread pool: async handlers await it without blocking the event
+loop, and a login burst can occupy at most ``PASSWORD_HASH_WORKERS`` threads
+instead of every worker thread of the server.  The cost is configured with
+``BCRYPT_ROUNDS``; hashes made with another cost are upgraded on the next
+successful login (:func:`verify_and_update_password`).
+"""
 
 from __future__ import annotations
 
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+)
+
+_pool = ThreadPoolExecutor(
+    max_workers=max(1, PASSWORD_HASH_WORKERS), thread_name_prefix="password-hash"
+)
 
 
 def hash_password(password: str) -> str:
     """Hash a plaintext password using the configured crypt context."""
 
-    return pwd_context.hash(password)
+    return _pool.submit(pwd_context.hash, password).result()
 
 
 def verify_password(plain_password: str, password_hash: str) -> bool:
     """Verify a plaintext password against a stored hash."""
 
-    return pwd_context.verify(plain_password, password_hash)
+    return _pool.submit(pwd_context.verify, plain_password, password_hash).result()
+
+
+async def verify_and_update_password(
+    plain_password: str, password_hash: str
+) -> tuple[bool, str | None]:
+    """Verify a password and return a replacement hash when one is due.
+
+    The second item is a new hash of ``plain_password`` when the stored one
+    uses a deprecated scheme or another cost than ``BCRYPT_ROUNDS``,
+    otherwise ``None``.  Malformed stored hashes never verify.
+    """
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            _pool, pwd_context.verify_and_update, plain_password, password_hash
+        )
+    except (TypeError, ValueError):
+        return False, None
 
 
-__all__ = ["hash_password", "verify_password", "pwd_context"]
+__all__ = [
+    "hash_password",
+    "verify_password",
+    "verify_and_update_password",
+    "pwd_context",
+]
@@ -1,8 +1,28 @@
-"""Database bootstrap and lightweight migration utilities."""
+"""Database bootstrap and lightweight migration utilities.
+
+The start-up sweep inspects every table and applies the missing columns,
+indexes and backfills.  Once it has completed, the fingerprint of the schema
+it produced (:func:`schema_fingerprint`) is recorded in
+``schema_fingerprints``; later start-ups that find the same fingerprint skip
+the sweep.  Any change to the ORM tables or to this module changes the
+fingerprint and runs the sweep again.
+
+The data repairs (search keys, stock balances, events, search index) are not
+part of the sweep: each starts with a cheap check and runs on every start-up,
+and the fingerprint is only recorded once all of them have succeeded.
+"""
 
 from __future__ import annotations
 
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
 from sqlalchemy import inspect, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.exc import OperationalError
+
+SCHEMA_KEY = "app"
 
 
 def _table_exists(conn, name: str) -> bool:
@@ -12,10 +32,68 @@ def _table_exists(conn, name: str) -> bool:
     return row is not None
 
 
+def schema_fingerprint() -> str:
+    """Return the hash of the schema the start-up sweep produces.
+
+    It covers the ORM tables (columns, types, nullability, indexes) and the
+    source of this module, which holds the migrations themselves.
+    """
+
+    from models import Base
+
+    dialect = sqlite.dialect()
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        digest.update(f"\n{table.name}".encode())
+        for column in table.columns:
+            column_type = column.type.compile(dialect=dialect)
+            digest.update(
+                f"|{column.name}:{column_type}:{column.nullable}".encode()
+            )
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            columns = ",".join(c.name for c in index.columns)
+            digest.update(f"|{index.name}({columns}):{index.unique}".encode())
+    return digest.hexdigest()
+
+
+def schema_is_current(engine) -> bool:
+    """Whether the database records the fingerprint of the current schema."""
+
+    try:
+        with engine.connect() as conn:
+            stored = conn.execute(
+                text("SELECT fingerprint FROM schema_fingerprints WHERE name = :name"),
+                {"name": SCHEMA_KEY},
+            ).scalar()
+    except OperationalError:
+        # Tablo henüz yok: ilk kurulum veya eski veritabanı.
+        return False
+    return stored == schema_fingerprint()
+
+
+def _record_schema_fingerprint(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT OR REPLACE INTO schema_fingerprints"
+                " (name, fingerprint, applied_at) VALUES (:name, :fingerprint, :at)"
+            ),
+            {
+                "name": SCHEMA_KEY,
+                "fingerprint": schema_fingerprint(),
+                "at": datetime.utcnow(),
+            },
+        )
+
+
 def bootstrap_schema() -> None:
     """Perform ad-hoc schema adjustments for legacy SQLite databases."""
 
     from models import engine
+    from utils.schema_capabilities import invalidate_capabilities
+
+    if schema_is_current(engine):
+        return
 
     with engine.begin() as conn:
         if not _table_exists(conn, "licenses"):
@@ -64,11 +142,33 @@ def bootstrap_schema() -> None:
         """
         )
 
+    invalidate_capabilities()
+
 
-def init_db() -> None:
-    """Create tables and perform lightweight migrations for SQLite."""
+def init_db(force: bool = False) -> None:
+    """Create tables and perform lightweight migrations for SQLite.
 
-    from models import Base, engine
+    The sweep is skipped when the recorded schema fingerprint matches;
+    ``force`` runs it anyway.  The data repairs and the dashboard counters
+    run on every start-up.
+    """
+
+    from models import engine
+
+    migrate = force or not schema_is_current(engine)
+    if migrate:
+        _migrate(engine)
+    if _repair_data(engine) and migrate:
+        _record_schema_fingerprint(engine)
+
+    # -- Dashboard counters ------------------------------------------------------
+    _reconcile_dashboard_counters()
+
+
+def _migrate(engine) -> None:
+    import utils.search_index  # noqa: F401  (FTS tablosunun DDL dinleyicisi)
+    from models import Base
+    from utils.schema_capabilities import invalidate_capabilities
 
     # Create all tables if they do not exist
     Base.metadata.create_all(bind=engine)
@@ -221,6 +321,30 @@ def init_db() -> None:
                 )
             else:
                 conn.execute(text("ALTER TABLE license_logs ADD COLUMN tarih DATETIME"))
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_license_logs_tarih ON license_logs"
+                " (tarih)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_inventory_log_created_at"
+                " ON inventory_log (created_at)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_inventory_log_actor_created_at"
+                " ON inventory_log (actor, created_at)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_printer_histories_created_at"
+                " ON printer_histories (created_at)"
+            )
+        )
 
     # -- Inventories -----------------------------------------------------------
     insp = inspect(engine)
@@ -356,3 +480,224 @@ def init_db() -> None:
             )
         if "source_id" not in cols:
             conn.execute(text("ALTER TABLE stock_logs ADD COLUMN source_id INTEGER"))
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_stock_logs_key_tarih ON stock_logs"
+                " (donanim_tipi, marka, model, ifs_no, tarih, id)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_stock_logs_tarih_id ON stock_logs"
+                " (tarih, id)"
+            )
+        )
+
+    # -- Search keys -------------------------------------------------------------
+    _add_search_keys(engine)
+
+    # Sütun bilgisi yeniden okunmalı: eski şemalara sütun eklenmiş olabilir.
+    invalidate_capabilities()
+
+
+def _repair_data(engine) -> bool:
+    """Run the start-up data repairs; ``False`` when one of them failed.
+
+    Every step first checks whether it has anything to do, so this is cheap
+    on an up-to-date database and runs even when the sweep is skipped.
+    """
+
+    # Adımlar birbirinden bağımsız; biri başarısız olsa da diğerleri çalışır.
+    results = [
+        _fill_search_keys(engine),
+        _backfill_stock_balances(),
+        _backfill_events(),
+        _build_search_index(),
+    ]
+    return all(results)
+
+
+# (tablo, kaynak kolon, arama anahtarı kolonu, indeks kolonları)
+_SEARCH_KEYS = (
+    ("brands", "name", "name_norm", ("name_norm",)),
+    ("models", "name", "name_norm", ("brand_id", "name_norm")),
+    ("factories", "name", "name_norm", ("name_norm",)),
+    ("usage_areas", "name", "name_norm", ("name_norm",)),
+    ("hardware_types", "name", "name_norm", ("name_norm",)),
+    ("license_names", "name", "name_norm", ("name_norm",)),
+    ("bilgi_kategorileri", "ad", "ad_norm", ("ad_norm",)),
+    ("lookups", "value", "value_norm", ("type", "value_norm")),
+    ("users", "full_name", "full_name_norm", ("full_name_norm",)),
+    ("inventories", "no", "no_norm", ("no_norm",)),
+    ("inventories", "seri_no", "seri_no_norm", ("seri_no_norm",)),
+    (
+        "inventories",
+        "sorumlu_personel",
+        "sorumlu_personel_norm",
+        ("sorumlu_personel_norm",),
+    ),
+    ("inventories", "ifs_no", "ifs_no_norm", ("ifs_no_norm",)),
+    ("printers", "envanter_no", "envanter_no_norm", ("envanter_no_norm",)),
+    ("printers", "seri_no", "seri_no_norm", ("seri_no_norm",)),
+    (
+        "printers",
+        "sorumlu_personel",
+        "sorumlu_personel_norm",
+        ("sorumlu_personel_norm",),
+    ),
+    ("printers", "ifs_no", "ifs_no_norm", ("ifs_no_norm",)),
+    (
+        "licenses",
+        "sorumlu_personel",
+        "sorumlu_personel_norm",
+        ("sorumlu_personel_norm",),
+    ),
+    ("licenses", "ifs_no", "ifs_no_norm", ("ifs_no_norm",)),
+)
+
+
+def _add_search_keys(engine) -> None:
+    """Add the normalized ``*_norm`` search key columns and their indexes."""
+
+    insp = inspect(engine)
+    tables = set(insp.get_table_names())
+    with engine.begin() as conn:
+        for table, source, target, index_columns in _SEARCH_KEYS:
+            if table not in tables:
+                continue
+            cols = {col["name"] for col in insp.get_columns(table)}
+            if source not in cols:
+                continue
+            if target not in cols:
+                conn.execute(
+                    text(f"ALTER TABLE {table} ADD COLUMN {target} VARCHAR(200)")
+                )
+            conn.execute(
+                text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_{'_'.join(index_columns)}"
+                    f" ON {table} ({', '.join(index_columns)})"
+                )
+            )
+
+
+def _fill_search_keys(engine) -> bool:
+    """Fill the ``NULL`` search keys.
+
+    The models keep the keys current on write; rows written before the
+    column existed, or by tools bypassing the ORM, have ``NULL`` keys and
+    are filled here.
+    """
+
+    from utils.normalize import normalize_search
+    from utils.schema_capabilities import table_capabilities
+
+    try:
+        with engine.begin() as conn:
+            for table, source, target, _ in _SEARCH_KEYS:
+                if not table_capabilities(table).has(source, target):
+                    continue
+                rows = conn.execute(
+                    text(
+                        f"SELECT id, {source} FROM {table}"
+                        f" WHERE {target} IS NULL AND {source} IS NOT NULL"
+                    )
+                ).all()
+                if rows:
+                    conn.execute(
+                        text(f"UPDATE {table} SET {target} = :key WHERE id = :id"),
+                        [
+                            {"id": row[0], "key": normalize_search(row[1])}
+                            for row in rows
+                        ],
+                    )
+    except OperationalError:
+        # Tablo henüz yok; yetenek kaydı bu durumda model kolonlarını bildirir.
+        return False
+    return True
+
+
+def _backfill_stock_balances() -> bool:
+    """Populate ``stock_balances`` from the ledger on first start-up.
+
+    Existing deployments already have movements in ``stock_logs`` when the
+    materialised table is introduced; an empty balance table next to a
+    non-empty ledger means it has never been built.
+    """
+
+    from models import SessionLocal
+    from utils.stock_balance import rebuild_stock_balances
+    from utils.stock_log import get_available_columns
+
+    db = SessionLocal()
+    try:
+        has_balances = db.execute(text("SELECT 1 FROM stock_balances LIMIT 1")).first()
+        has_logs = db.execute(text("SELECT 1 FROM stock_logs LIMIT 1")).first()
+        if has_balances or not has_logs:
+            return True
+        rebuild_stock_balances(db, get_available_columns(db))
+        db.commit()
+    except OperationalError:
+        db.rollback()
+        return False
+    finally:
+        db.close()
+    return True
+
+
+def _backfill_events() -> bool:
+    """Copy the module logs into ``events`` when the table is introduced."""
+
+    from models import SessionLocal
+    from utils.events import backfill_events
+
+    db = SessionLocal()
+    try:
+        if backfill_events(db):
+            db.commit()
+    except OperationalError:
+        # Partially migrated schemas lack some of the copied columns.
+        db.rollback()
+        return False
+    finally:
+        db.close()
+    return True
+
+
+def _reconcile_dashboard_counters() -> None:
+    """Recount the dashboard statistics on start-up.
+
+    The counters are maintained by ORM hooks; bulk statements and writes made
+    by other tools while the application was down are picked up here.
+    """
+
+    from models import SessionLocal
+    from utils.dashboard_counters import reconcile_counters
+
+    db = SessionLocal()
+    try:
+        reconcile_counters(db)
+        db.commit()
+    except OperationalError:
+        # Partially migrated schemas lack some of the counted columns.
+        db.rollback()
+    finally:
+        db.close()
+
+
+def _build_search_index() -> bool:
+    """Fill the full-text search index when it is introduced (still empty)."""
+
+    from models import SessionLocal
+    from utils.search_index import rebuild_search_index, search_index_is_empty
+
+    db = SessionLocal()
+    try:
+        if search_index_is_empty(db) and any(rebuild_search_index(db).values()):
+            db.commit()
+    except OperationalError:
+        # SQLite without FTS5 or partially migrated schemas.
+        db.rollback()
+        return False
+    finally:
+        db.close()
+    return True
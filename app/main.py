@@ -16,7 +16,7 @@ from starlette.middleware.sessions import SessionMiddleware
 from app.core.security import hash_password
 from app.db.init import bootstrap_schema, init_db
 from app.web import register_web_routes
-from utils.template_filters import register_filters
+from utils.templating import precompile_templates, templates
 
 load_dotenv()
 
@@ -167,7 +167,6 @@ async def redirect_on_auth(request: Request, exc: HTTPException):
 def _register_global_state() -> None:
     """Initialise shared application state such as templates."""
 
-    templates = register_filters(Jinja2Templates(directory="templates"))
     app.state.templates = templates
 
 
@@ -197,6 +196,9 @@ def on_startup():
     load_dotenv()
     bootstrap_schema()
     init_db()
+    # İlk istekte derlenmesinler: şablonlar açılışta önbelleğe alınır.
+    for name in precompile_templates():
+        print(f"[!] Şablon derlenemedi: {name}")
     db = SessionLocal()
     try:
         existing = (
@@ -6,11 +6,13 @@ from typing import Optional
 from fastapi import APIRouter, Depends, FastAPI, Form, Request, status
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
-from app.core.security import verify_password
+from app.core.security import verify_and_update_password
 from auth import get_user_by_username
 from database import get_db
+from models import User
 from routers import bilgiler as bilgiler_router
 from routers import catalog as catalog_router
 from routers import (
@@ -42,17 +44,13 @@ from routes.admin import router as admin_router
 from routes.scrap import router as scrap_router
 from routes.talepler import router as talepler_router
 from security import current_user, require_roles
-from utils.template_filters import register_filters
+from utils.templating import templates as shared_templates
 
 router = APIRouter()
 
 
 def _get_templates(request: Request) -> Jinja2Templates:
-    templates = getattr(request.app.state, "templates", None)
-    if templates is None:
-        templates = register_filters(Jinja2Templates(directory="templates"))
-        request.app.state.templates = templates
-    return templates
+    return getattr(request.app.state, "templates", None) or shared_templates
 
 
 def _ensure_csrf(request: Request) -> str:
@@ -119,7 +117,17 @@ async def login_submit(
         )
 
     user = get_user_by_username(db, username.strip())
-    if not user or not verify_password(password, user.password_hash):
+    # Doğrulama beklenirken bağlantı havuza dönsün; aksi halde eşzamanlı
+    # girişler havuzu tüketir ve olay döngüsü bağlantı beklerken kilitlenir.
+    # Kapatılan oturumdaki kullanıcı nesnesi yüklü alanlarını korur.
+    db.close()
+    verified, new_hash = False, None
+    if user:
+        # bcrypt olay döngüsünü bloklamasın: sınırlı parola havuzunda çalışır.
+        verified, new_hash = await verify_and_update_password(
+            password, user.password_hash
+        )
+    if not verified:
         csrf_token = _ensure_csrf(request)
         return templates.TemplateResponse(
             "login.html",
@@ -132,6 +140,13 @@ async def login_submit(
             status_code=status.HTTP_401_UNAUTHORIZED,
         )
 
+    if new_hash:
+        # Maliyet (BCRYPT_ROUNDS) değiştiyse parola girişte yeniden özetlenir.
+        db.execute(
+            update(User).where(User.id == user.id).values(password_hash=new_hash)
+        )
+        db.commit()
+
     request.session["user_id"] = user.id
     request.session["user_name"] = user.full_name or user.username
     request.session["user_role"] = getattr(user, "role", "")
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from sqlalchemy.orm import Session
 
-from models import SessionLocal
+from models import ReadSessionLocal, SessionLocal
 
 
 def get_db() -> Session:
@@ -11,3 +11,13 @@ def get_db() -> Session:
         yield db
     finally:
         db.close()
+
+
+def get_read_db() -> Session:
+    """Session on the read-only engine for handlers that never write."""
+
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -17,11 +17,13 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
     create_engine,
+    event,
     func,
 )
 from sqlalchemy.dialects.sqlite import JSON as SQLITE_JSON
@@ -33,9 +35,12 @@ from sqlalchemy.orm import (
     relationship,
     sessionmaker,
     synonym,
+    validates,
 )
 from sqlalchemy.pool import StaticPool
 
+from utils.normalize import normalize_search
+
 load_dotenv()
 
 
@@ -99,10 +104,66 @@ if _is_sqlite_url(database_url):
     if db_path and db_path != ":memory:":
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
-_engine_kwargs = engine_kwargs_for_url(database_url)
-_engine_kwargs.update(engine_pool_kwargs(database_url))
-engine = create_engine(DATABASE_URL, **_engine_kwargs)
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "8"))
+
+
+def _is_sqlite_file(url: str | URL) -> bool:
+    parsed = url if isinstance(url, URL) else make_url(url)
+    return _is_sqlite_url(parsed) and parsed.database not in (None, "", ":memory:")
+
+
+def configure_sqlite_connections(engine, *, read_only: bool = False) -> None:
+    """Apply the application's pragmas to every new SQLite connection.
+
+    WAL lets readers and the single writer proceed concurrently, the busy
+    timeout makes a blocked writer wait instead of failing with "database is
+    locked" and ``mmap_size`` serves reads from the page cache.  Read-only
+    connections additionally refuse every write (``query_only``).
+    """
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+            cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+
+def create_app_engine(url: str | URL, *, read_only: bool = False):
+    """Create an engine for ``url`` with the application's settings.
+
+    ``read_only`` engines are meant for request handlers that only read
+    (lists, lookups, exports, the dashboard); they get their own, larger
+    connection pool so long reads never queue behind writes.
+    """
+
+    kwargs = engine_kwargs_for_url(url)
+    kwargs.update(engine_pool_kwargs(url))
+    if read_only and _is_sqlite_file(url):
+        kwargs.setdefault("pool_size", SQLITE_READ_POOL_SIZE)
+    created = create_engine(url, **kwargs)
+    if _is_sqlite_file(url):
+        configure_sqlite_connections(created, read_only=read_only)
+    return created
+
+
+engine = create_app_engine(database_url)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# In-memory databases exist once per connection, so reads share the writer.
+read_engine = (
+    create_app_engine(database_url, read_only=True)
+    if _is_sqlite_file(database_url)
+    else engine
+)
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False)
 
 
 class Base(DeclarativeBase):
@@ -117,6 +178,7 @@ class User(Base):
     first_name: Mapped[str] = mapped_column(String(60), default="")
     last_name: Mapped[str] = mapped_column(String(60), default="")
     full_name: Mapped[str] = mapped_column(String(120), default="")
+    full_name_norm: Mapped[str | None] = mapped_column(String(120), index=True)
     # E-posta artık opsiyonel ve benzersiz
     email: Mapped[str | None] = mapped_column(String(255), unique=True, nullable=True)
     role: Mapped[str] = mapped_column(String(16), default="admin")  # admin/staff/user
@@ -137,6 +199,11 @@ class User(Base):
     def is_admin(self) -> bool:
         return self.role == "admin"
 
+    @validates("full_name")
+    def _normalize_full_name(self, key, value):
+        self.full_name_norm = normalize_search(value)
+        return value
+
 
 class Connection(Base):
     __tablename__ = "connections"
@@ -195,6 +262,11 @@ class Inventory(Base):
     islem_yapan: Mapped[str | None] = mapped_column(String(150))
     durum: Mapped[str | None] = mapped_column(String(50), default="aktif")
     not_: Mapped[str | None] = mapped_column("not", Text)
+    # Türkçe duyarlı arama anahtarları (bkz. utils.normalize)
+    no_norm: Mapped[str | None] = mapped_column(String(100), index=True)
+    seri_no_norm: Mapped[str | None] = mapped_column(String(150), index=True)
+    sorumlu_personel_norm: Mapped[str | None] = mapped_column(String(150), index=True)
+    ifs_no_norm: Mapped[str | None] = mapped_column(String(150), index=True)
 
     logs: Mapped[list["InventoryLog"]] = relationship(
         "InventoryLog", back_populates="inventory", cascade="all, delete-orphan"
@@ -207,6 +279,11 @@ class Inventory(Base):
         passive_deletes=True,
     )
 
+    @validates("no", "seri_no", "sorumlu_personel", "ifs_no")
+    def _normalize_search_keys(self, key, value):
+        setattr(self, f"{key}_norm", normalize_search(value))
+        return value
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -238,10 +315,16 @@ class InventoryLog(Base):
     after_json: Mapped[dict | None] = mapped_column(JSON)
     note: Mapped[str | None] = mapped_column(Text)
     actor: Mapped[str | None] = mapped_column(String)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True
+    )
 
     inventory: Mapped["Inventory"] = relationship("Inventory", back_populates="logs")
 
+    __table_args__ = (
+        Index("ix_inventory_log_actor_created_at", "actor", "created_at"),
+    )
+
 
 class ScrapItem(Base):
     __tablename__ = "scrap_items"
@@ -297,12 +380,20 @@ class License(Base):
     )
     durum = Column(String(20), default="aktif")
     notlar = Column(Text, nullable=True)
+    # Türkçe duyarlı arama anahtarları (bkz. utils.normalize)
+    sorumlu_personel_norm = Column(String(120), index=True, nullable=True)
+    ifs_no_norm = Column(String(100), index=True, nullable=True)
 
     logs = relationship(
         "LicenseLog", back_populates="license", cascade="all, delete-orphan"
     )
     inventory = relationship("Inventory", back_populates="licenses")
 
+    @validates("sorumlu_personel", "ifs_no")
+    def _normalize_search_keys(self, key, value):
+        setattr(self, f"{key}_norm", normalize_search(value))
+        return value
+
 
 class LicenseLog(Base):
     __tablename__ = "license_logs"
@@ -311,11 +402,26 @@ class LicenseLog(Base):
     islem = Column(String(50))
     detay = Column(Text)
     islem_yapan = Column(String(120))
-    tarih = Column(DateTime, default=datetime.utcnow)
+    tarih = Column(DateTime, default=datetime.utcnow, index=True)
     license = relationship("License", back_populates="logs")
 
 
-class Brand(Base):
+class NormalizedName:
+    """``name`` with a persisted, indexed search key in ``name_norm``.
+
+    See :mod:`utils.normalize`; the key is refreshed whenever ``name`` is
+    assigned through the ORM.
+    """
+
+    name_norm: Mapped[str | None] = mapped_column(String(200), index=True)
+
+    @validates("name")
+    def _normalize_name(self, key, value):
+        self.name_norm = normalize_search(value)
+        return value
+
+
+class Brand(NormalizedName, Base):
     __tablename__ = "brands"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -328,7 +434,7 @@ class Brand(Base):
     )
 
 
-class Model(Base):
+class Model(NormalizedName, Base):
     __tablename__ = "models"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -336,12 +442,17 @@ class Model(Base):
         ForeignKey("brands.id", ondelete="CASCADE"), nullable=False, index=True
     )
     name: Mapped[str] = mapped_column(String(150), nullable=False, index=True)
+    # Model aramaları her zaman markaya göre yapılır.
+    name_norm: Mapped[str | None] = mapped_column(String(200))
 
     brand: Mapped["Brand"] = relationship("Brand", back_populates="models")
-    __table_args__ = (UniqueConstraint("brand_id", "name", name="uq_brand_model"),)
+    __table_args__ = (
+        UniqueConstraint("brand_id", "name", name="uq_brand_model"),
+        Index("ix_models_brand_id_name_norm", "brand_id", "name_norm"),
+    )
 
 
-class UsageArea(Base):
+class UsageArea(NormalizedName, Base):
     __tablename__ = "usage_areas"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -350,7 +461,7 @@ class UsageArea(Base):
     )
 
 
-class Factory(Base):
+class Factory(NormalizedName, Base):
     __tablename__ = "factories"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -359,7 +470,7 @@ class Factory(Base):
     )
 
 
-class LicenseName(Base):
+class LicenseName(NormalizedName, Base):
     __tablename__ = "license_names"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -368,7 +479,7 @@ class LicenseName(Base):
     )
 
 
-class HardwareType(Base):
+class HardwareType(NormalizedName, Base):
     __tablename__ = "hardware_types"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -404,6 +515,16 @@ class Printer(Base):
     histories = relationship(
         "PrinterHistory", back_populates="printer", cascade="all, delete-orphan"
     )
+    # Türkçe duyarlı arama anahtarları (bkz. utils.normalize)
+    envanter_no_norm = Column(String(100), index=True, nullable=True)
+    seri_no_norm = Column(String(100), index=True, nullable=True)
+    sorumlu_personel_norm = Column(String(150), index=True, nullable=True)
+    ifs_no_norm = Column(String(100), index=True, nullable=True)
+
+    @validates("envanter_no", "seri_no", "sorumlu_personel", "ifs_no")
+    def _normalize_search_keys(self, key, value):
+        setattr(self, f"{key}_norm", normalize_search(value))
+        return value
 
 
 class PrinterHistory(Base):
@@ -414,7 +535,7 @@ class PrinterHistory(Base):
     action = Column(String(50))
     changes = Column(SQLITE_JSON, nullable=True)
     actor = Column(String(150), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     printer = relationship("Printer", back_populates="histories")
 
@@ -497,6 +618,21 @@ class StockLog(Base):
     source_type = Column(String(50), nullable=True)
     source_id = Column(Integer, nullable=True)
 
+    # Son hareketi anahtar bazında indeks üzerinden bulmak için (stok atama).
+    __table_args__ = (
+        Index(
+            "ix_stock_logs_key_tarih",
+            "donanim_tipi",
+            "marka",
+            "model",
+            "ifs_no",
+            "tarih",
+            "id",
+        ),
+        # Hareket listesinin (tarih, id) imleçli sayfalaması için.
+        Index("ix_stock_logs_tarih_id", "tarih", "id"),
+    )
+
 
 class StockAssignment(Base):
     __tablename__ = "stock_assignments"
@@ -541,6 +677,147 @@ class StockTotal(Base):
     toplam = Column(Integer, nullable=False, default=0)
 
 
+class StockBalance(Base):
+    """Materialised net quantity per stock item.
+
+    One row per ``donanim_tipi|marka|model|ifs_no`` key, maintained on every
+    ``stock_logs`` insert so status screens do not have to aggregate the whole
+    ledger. The columns prefixed with ``last_`` and the source fields mirror
+    the most recent movement of the item.
+    """
+
+    __tablename__ = "stock_balances"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    stock_key = Column(String(600), unique=True, index=True, nullable=False)
+    donanim_tipi = Column(String(150), nullable=False, index=True)
+    marka = Column(String(150), nullable=True)
+    model = Column(String(150), nullable=True)
+    ifs_no = Column(String(100), nullable=True)
+    miktar = Column(Integer, nullable=False, default=0)
+    last_tarih = Column(DateTime, nullable=True)
+    last_log_id = Column(Integer, nullable=True)
+    source_type = Column(String(50), nullable=True)
+    source_id = Column(Integer, nullable=True)
+    lisans_anahtari = Column(String(500), nullable=True)
+    mail_adresi = Column(String(200), nullable=True)
+
+
+class StockCheckpoint(Base):
+    """Snapshot of every stock balance at ``taken_at``.
+
+    ``last_log_id`` is the highest ``stock_logs.id`` that existed when the
+    checkpoint was written; movements recorded later but dated on or before
+    ``taken_at`` are applied on top when the checkpoint is read.
+    """
+
+    __tablename__ = "stock_checkpoints"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    taken_at = Column(DateTime, nullable=False, unique=True, index=True)
+    last_log_id = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class StockCheckpointBalance(Base):
+    """Balance of one stock key within a :class:`StockCheckpoint`."""
+
+    __tablename__ = "stock_checkpoint_balances"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    checkpoint_id = Column(
+        Integer,
+        ForeignKey("stock_checkpoints.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    stock_key = Column(String(600), nullable=False)
+    donanim_tipi = Column(String(150), nullable=False)
+    marka = Column(String(150), nullable=True)
+    model = Column(String(150), nullable=True)
+    ifs_no = Column(String(100), nullable=True)
+    miktar = Column(Integer, nullable=False, default=0)
+    last_tarih = Column(DateTime, nullable=True)
+    last_log_id = Column(Integer, nullable=True)
+    source_type = Column(String(50), nullable=True)
+    source_id = Column(Integer, nullable=True)
+    lisans_anahtari = Column(String(500), nullable=True)
+    mail_adresi = Column(String(200), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "checkpoint_id", "stock_key", name="uq_stock_checkpoint_balance_key"
+        ),
+    )
+
+
+class DataVersion(Base):
+    """Monotonic change counters shared by all worker processes.
+
+    Writes to tables whose contents are cached in-process (reference data,
+    system room entries, stock) bump the matching row so every worker can
+    tell that its cached copy is outdated with a single indexed lookup.
+    """
+
+    __tablename__ = "data_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class SchemaFingerprint(Base):
+    """Fingerprint of the schema the start-up migrations last completed.
+
+    See :func:`app.db.init.schema_fingerprint`; a matching row lets start-up
+    skip the schema sweep.
+    """
+
+    __tablename__ = "schema_fingerprints"
+
+    name = Column(String(50), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class Event(Base):
+    """Append-only activity stream shared by all modules.
+
+    One row per logged action, written next to the module specific log
+    tables (see :mod:`utils.events`) so timelines and audit screens can query
+    a single indexed table.  ``payload`` holds a compact JSON document with
+    the details of the source record.
+    """
+
+    __tablename__ = "events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity_type = Column(String(30), nullable=False)
+    entity_id = Column(Integer, nullable=True)
+    action = Column(String(50), nullable=False)
+    actor = Column(String(150), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    payload = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_events_created_at", "created_at", "id"),
+        Index("ix_events_entity", "entity_type", "entity_id"),
+        Index("ix_events_actor", "actor"),
+    )
+
+
+class DashboardCounter(Base):
+    """Dashboard statistics kept up to date by the ORM write paths.
+
+    See :mod:`utils.dashboard_counters`; the values are recomputed from the
+    source tables by the periodic reconcile step.
+    """
+
+    __tablename__ = "dashboard_counters"
+
+    name = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+    reconciled_at = Column(DateTime, nullable=True)
+
+
 class TalepDurum(str, enum.Enum):
     ACIK = "acik"
     TAMAMLANDI = "tamamlandi"
@@ -590,12 +867,21 @@ class Lookup(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     type: Mapped[str] = mapped_column(String(50), index=True, nullable=False)
     value: Mapped[str] = mapped_column(String(200), nullable=False)
+    value_norm: Mapped[str | None] = mapped_column(String(200))
     created_by: Mapped[str | None] = mapped_column(String(150))
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
     )
 
-    __table_args__ = (UniqueConstraint("type", "value", name="uq_lookup_type_value"),)
+    __table_args__ = (
+        UniqueConstraint("type", "value", name="uq_lookup_type_value"),
+        Index("ix_lookups_type_value_norm", "type", "value_norm"),
+    )
+
+    @validates("value")
+    def _normalize_value(self, key, value):
+        self.value_norm = normalize_search(value)
+        return value
 
 
 class BilgiKategori(Base):
@@ -605,6 +891,7 @@ class BilgiKategori(Base):
     ad: Mapped[str] = mapped_column(
         String(150), unique=True, index=True, nullable=False
     )
+    ad_norm: Mapped[str | None] = mapped_column(String(150), index=True)
     aciklama: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
@@ -614,6 +901,11 @@ class BilgiKategori(Base):
         "Bilgi", back_populates="kategori", cascade="all, delete-orphan"
     )
 
+    @validates("ad")
+    def _normalize_ad(self, key, value):
+        self.ad_norm = normalize_search(value)
+        return value
+
 
 class Bilgi(Base):
     __tablename__ = "bilgiler"
@@ -660,9 +952,9 @@ class UserPinLimit(Base):
     user: Mapped["User"] = relationship("User", back_populates="pin_limit")
 
 
-def init_db() -> None:
+def init_db(force: bool = False) -> None:
     """Backwards compatible wrapper for :mod:`app.db.init`."""
 
     from app.db.init import init_db as _init_db
 
-    _init_db()
+    _init_db(force=force)
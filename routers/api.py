@@ -1,11 +1,22 @@
-from typing import List
+from datetime import datetime
+from typing import Any, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import case, func, literal, or_
+from sqlalchemy import case, func, or_
 from sqlalchemy.orm import Session
 
 import models
-from database import get_db
+from database import get_db, get_read_db
+from utils.normalize import contains_match
+from utils.refdata import get_refdata
+from utils.search_index import SEARCH_LIMIT, SEARCH_LIMIT_MAX, SEARCH_TYPES, search
+from utils.stock_balance import (
+    REQUIRED_LEDGER_COLUMNS,
+    ledger_balances,
+    read_stock_balances,
+)
+from utils.stock_cache import cached_snapshot
+from utils.stock_checkpoint import stock_balances_as_of
 from utils.stock_log import create_stock_log, get_available_columns, normalize_islem
 
 router = APIRouter(prefix="/api", tags=["API"])
@@ -21,7 +32,7 @@ ENTITY_TABLE = {
 
 
 @router.get("/lookup_plain/{entity}", response_model=List[str])
-def lookup_entity(entity: str, db: Session = Depends(get_db)):
+def lookup_entity(entity: str, db: Session = Depends(get_read_db)):
     entity = entity.strip().lower()
     tbl = ENTITY_TABLE.get(entity)
     if not tbl:
@@ -30,14 +41,39 @@ def lookup_entity(entity: str, db: Session = Depends(get_db)):
     return [r[0] for r in rows if r[0]]
 
 
+@router.get("/search")
+def global_search(
+    q: str = "",
+    tur: Optional[str] = None,
+    limit: int = Query(SEARCH_LIMIT, ge=1, le=SEARCH_LIMIT_MAX),
+    db: Session = Depends(get_read_db),
+):
+    """Envanter, yazıcı, lisans, talep ve bilgi kayıtlarında tam metin arama.
+
+    ``tur`` virgülle ayrılmış türlerle (``inventory,printer,...``) sonucu
+    daraltır; sonuçlar en iyi eşleşmeden başlayarak sıralanır.
+    """
+
+    types = None
+    if tur:
+        types = [t.strip() for t in tur.split(",") if t.strip()]
+        unknown = set(types) - set(SEARCH_TYPES)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Geçersiz arama türü: {', '.join(sorted(unknown))}",
+            )
+    return {"q": q, "items": search(db, q, types=types, limit=limit)}
+
+
 @router.get("/users/names")
-def user_names(db: Session = Depends(get_db)):
+def user_names(db: Session = Depends(get_read_db)):
     users = db.query(models.User).order_by(models.User.full_name.asc()).all()
     return [u.full_name for u in users if u.full_name]
 
 
 @router.get("/licenses/names")
-def license_names(db: Session = Depends(get_db)):
+def license_names(db: Session = Depends(get_read_db)):
     if hasattr(models, "LicenseName"):
         rows = (
             db.query(models.LicenseName.name)
@@ -56,7 +92,7 @@ def license_names(db: Session = Depends(get_db)):
 
 @router.get("/printers/models")
 def printer_models(
-    brand: str = Query(..., min_length=1), db: Session = Depends(get_db)
+    brand: str = Query(..., min_length=1), db: Session = Depends(get_read_db)
 ):
     if not hasattr(models, "Model"):
         raise HTTPException(status_code=500, detail="Model tablosu tanımlı değil")
@@ -71,7 +107,7 @@ def printer_models(
 
 
 @router.get("/licenses/list")
-def licenses_list(db: Session = Depends(get_db)):
+def licenses_list(db: Session = Depends(get_read_db)):
     active_licenses = or_(
         models.License.durum.is_(None),
         ~models.License.durum.in_(["hurda", "stok"]),
@@ -95,7 +131,7 @@ def licenses_list(db: Session = Depends(get_db)):
 
 
 @router.get("/printers/list")
-def printers_list(db: Session = Depends(get_db)):
+def printers_list(db: Session = Depends(get_read_db)):
     active_printers = or_(
         models.Printer.durum.is_(None), models.Printer.durum != "hurda"
     )
@@ -122,14 +158,15 @@ def printers_list(db: Session = Depends(get_db)):
 def users_list(
     q: str | None = None,
     role: str | None = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     query = db.query(models.User)
     if q:
         like = f"%{q}%"
         filters = [models.User.username.ilike(like)]
-        if hasattr(models.User, "full_name"):
-            filters.append(models.User.full_name.ilike(like))
+        full_name = contains_match(models.User.full_name_norm, q)
+        if full_name is not None:
+            filters.append(full_name)
         if hasattr(models.User, "first_name"):
             filters.append(models.User.first_name.ilike(like))
         if hasattr(models.User, "last_name"):
@@ -157,7 +194,7 @@ def inventory_list(
     q: str | None = None,
     fabrika: str | None = None,
     departman: str | None = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     active_inventory = or_(
         models.Inventory.durum.is_(None), models.Inventory.durum != "hurda"
@@ -165,17 +202,22 @@ def inventory_list(
     query = db.query(models.Inventory).filter(active_inventory)
     if q:
         like = f"%{q}%"
-        query = query.filter(
-            or_(
-                models.Inventory.no.ilike(like),
-                models.Inventory.sorumlu_personel.ilike(like),
-                models.Inventory.marka.ilike(like),
-                models.Inventory.model.ilike(like),
-                models.Inventory.bilgisayar_adi.ilike(like),
-                models.Inventory.seri_no.ilike(like),
-                models.Inventory.ifs_no.ilike(like),
-            )
-        )
+        filters = [
+            models.Inventory.marka.ilike(like),
+            models.Inventory.model.ilike(like),
+            models.Inventory.bilgisayar_adi.ilike(like),
+        ]
+        # Kişi ve numara alanları Türkçe duyarlı arama anahtarlarından aranır.
+        for column in (
+            models.Inventory.no_norm,
+            models.Inventory.sorumlu_personel_norm,
+            models.Inventory.seri_no_norm,
+            models.Inventory.ifs_no_norm,
+        ):
+            criterion = contains_match(column, q)
+            if criterion is not None:
+                filters.append(criterion)
+        query = query.filter(or_(*filters))
     if fabrika:
         query = query.filter(models.Inventory.fabrika == fabrika)
     if departman:
@@ -186,21 +228,34 @@ def inventory_list(
 
 # === STOCK API ===
 @router.get("/stock/detail")
-def stock_status_detail(db: Session = Depends(get_db)):
-    """Return current stock grouped by item details."""
+def stock_status_detail(
+    db: Session = Depends(get_read_db), as_of: Optional[datetime] = None
+):
+    """Return current stock grouped by item details.
+
+    The result is cached until the ledger, system room or reference data
+    change (see :mod:`utils.stock_cache`); treat it as read-only.  With
+    ``as_of`` the balances at that moment are returned instead (see
+    :mod:`utils.stock_checkpoint`); those are computed on every call.
+    """
+
+    if as_of is not None:
+        return _stock_status_detail(db, as_of)
+    return cached_snapshot(
+        db, "stock_status_detail", lambda: _stock_status_detail(db)
+    )
+
 
+def _stock_status_detail(
+    db: Session, as_of: Optional[datetime] = None
+) -> dict[str, Any]:
     totals_db = {t.donanim_tipi: t.toplam for t in db.query(models.StockTotal).all()}
 
     license_name_candidates: set[str] = set()
     try:
-        if hasattr(models, "LicenseName"):
-            license_name_candidates.update(
-                {
-                    (name or "").strip().lower()
-                    for (name,) in db.query(models.LicenseName.name).all()
-                    if name
-                }
-            )
+        license_name_candidates.update(
+            name.strip().lower() for name in get_refdata(db).licenses.names()
+        )
     except Exception:  # pragma: no cover - legacy deployments without the table
         license_name_candidates = set()
 
@@ -216,76 +271,19 @@ def stock_status_detail(db: Session = Depends(get_db)):
         except Exception:  # pragma: no cover - legacy deployments without the table
             license_name_candidates = set()
 
-    available_columns = set(get_available_columns(db))
-    if not available_columns:
-        available_columns = {col.name for col in models.StockLog.__table__.columns}
-
-    has_marka = "marka" in available_columns
-    has_model = "model" in available_columns
-    has_ifs_no = "ifs_no" in available_columns
-    has_source_type = "source_type" in available_columns
-    has_source_id = "source_id" in available_columns
-    has_lisans_key = "lisans_anahtari" in available_columns
-    has_mail = "mail_adresi" in available_columns
-
-    q = db.query(
-        models.StockLog.donanim_tipi,
-        (models.StockLog.marka if has_marka else literal(None)).label("marka"),
-        (models.StockLog.model if has_model else literal(None)).label("model"),
-        (models.StockLog.ifs_no if has_ifs_no else literal(None)).label("ifs_no"),
-        func.sum(
-            case(
-                (models.StockLog.islem == "girdi", models.StockLog.miktar),
-                else_=-models.StockLog.miktar,
-            )
-        ).label("qty"),
-        func.max(models.StockLog.tarih).label("last_tarih"),
-    )
-
-    group_cols = [models.StockLog.donanim_tipi]
-    if has_marka:
-        group_cols.append(models.StockLog.marka)
-    if has_model:
-        group_cols.append(models.StockLog.model)
-    if has_ifs_no:
-        group_cols.append(models.StockLog.ifs_no)
-
-    q = q.group_by(*group_cols)
-
-    rows = q.all()
-
-    # Determine the source of the last movement for each item
-    last_logs_query = db.query(
-        models.StockLog.donanim_tipi,
-        (models.StockLog.marka if has_marka else literal(None)).label("marka"),
-        (models.StockLog.model if has_model else literal(None)).label("model"),
-        (models.StockLog.ifs_no if has_ifs_no else literal(None)).label("ifs_no"),
-        (models.StockLog.source_type if has_source_type else literal(None)).label(
-            "source_type"
-        ),
-        (models.StockLog.source_id if has_source_id else literal(None)).label(
-            "source_id"
-        ),
-        (models.StockLog.lisans_anahtari if has_lisans_key else literal(None)).label(
-            "lisans_anahtari"
-        ),
-        (models.StockLog.mail_adresi if has_mail else literal(None)).label(
-            "mail_adresi"
-        ),
-        models.StockLog.tarih,
-        models.StockLog.id,
-    )
-
-    order_cols = [models.StockLog.donanim_tipi]
-    if has_marka:
-        order_cols.append(models.StockLog.marka)
-    if has_model:
-        order_cols.append(models.StockLog.model)
-    if has_ifs_no:
-        order_cols.append(models.StockLog.ifs_no)
-    order_cols.extend([models.StockLog.tarih.desc(), models.StockLog.id.desc()])
+    available_columns = get_available_columns(db)
 
-    last_logs = last_logs_query.order_by(*order_cols).all()
+    # Legacy ledgers lack the columns the materialised balances are keyed on;
+    # aggregate those directly instead.
+    if as_of is not None:
+        try:
+            rows = stock_balances_as_of(db, as_of, available_columns)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+    elif REQUIRED_LEDGER_COLUMNS <= available_columns:
+        rows = read_stock_balances(db)
+    else:
+        rows = ledger_balances(db, available_columns)
 
     def clean(value: str | None) -> str:
         return (value or "").strip()
@@ -319,13 +317,13 @@ def stock_status_detail(db: Session = Depends(get_db)):
             return lowered.split(":", 1)[1]
         return lowered
 
-    def detect_item_type(row, src: dict[str, str | int | None]) -> str:
-        base = normalize_type(base_type_from_source(src.get("source_type")))
+    def detect_item_type(row: dict[str, Any]) -> str:
+        base = normalize_type(base_type_from_source(row.get("source_type")))
         if base in {"lisans", "yazici"}:
             return base
-        if src.get("lisans_anahtari") or src.get("mail_adresi"):
+        if row.get("lisans_anahtari") or row.get("mail_adresi"):
             return "lisans"
-        label = clean(row.donanim_tipi).lower()
+        label = clean(row["donanim_tipi"]).lower()
         if license_name_candidates and label in license_name_candidates:
             return "lisans"
         if "yazici" in label or "printer" in label:
@@ -347,20 +345,6 @@ def stock_status_detail(db: Session = Depends(get_db)):
             clean(ifs_no),
         )
 
-    last_source: dict[
-        tuple[str, str, str, str],
-        dict[str, str | int | None],
-    ] = {}
-    for r in last_logs:
-        key = (clean(r.donanim_tipi), clean(r.marka), clean(r.model), clean(r.ifs_no))
-        if key not in last_source:
-            last_source[key] = {
-                "source_type": r.source_type,
-                "source_id": r.source_id,
-                "lisans_anahtari": r.lisans_anahtari,
-                "mail_adresi": r.mail_adresi,
-            }
-
     system_room_entries = db.query(models.SystemRoomItem).all()
     system_room_map = {
         make_lookup_key(
@@ -377,34 +361,32 @@ def stock_status_detail(db: Session = Depends(get_db)):
     totals_calc: dict[str, int] = {}
 
     for r in rows:
-        qty = int(r.qty or 0)
+        qty = int(r["qty"] or 0)
         if qty <= 0:
             continue
-        key = (clean(r.donanim_tipi), clean(r.marka), clean(r.model), clean(r.ifs_no))
-        src = last_source.get(key, {})
-        item_type = detect_item_type(r, src)
+        item_type = detect_item_type(r)
         system_key = make_lookup_key(
-            item_type, r.donanim_tipi, r.marka, r.model, r.ifs_no
+            item_type, r["donanim_tipi"], r["marka"], r["model"], r["ifs_no"]
         )
         system_entry = system_room_map.get(system_key)
         assignment_hint = None
-        source_raw = src.get("source_type")
+        source_raw = r.get("source_type")
         if isinstance(source_raw, str):
             lowered = source_raw.strip().lower()
             if lowered.startswith("talep:"):
                 assignment_hint = normalize_type(lowered.split(":", 1)[1])
         items.append(
             {
-                "donanim_tipi": r.donanim_tipi,
-                "marka": r.marka,
-                "model": r.model,
-                "ifs_no": r.ifs_no,
+                "donanim_tipi": r["donanim_tipi"],
+                "marka": r["marka"],
+                "model": r["model"],
+                "ifs_no": r["ifs_no"],
                 "net": qty,
-                "last_tarih": r.last_tarih,
-                "source_type": src.get("source_type"),
-                "source_id": src.get("source_id"),
-                "lisans_anahtari": src.get("lisans_anahtari"),
-                "mail_adresi": src.get("mail_adresi"),
+                "last_tarih": r["last_tarih"],
+                "source_type": r.get("source_type"),
+                "source_id": r.get("source_id"),
+                "lisans_anahtari": r.get("lisans_anahtari"),
+                "mail_adresi": r.get("mail_adresi"),
                 "item_type": item_type,
                 "assignment_hint": assignment_hint,
                 "system_room": system_entry is not None,
@@ -416,9 +398,10 @@ def stock_status_detail(db: Session = Depends(get_db)):
                 ),
             }
         )
-        totals_calc[r.donanim_tipi] = totals_calc.get(r.donanim_tipi, 0) + qty
+        totals_calc[r["donanim_tipi"]] = totals_calc.get(r["donanim_tipi"], 0) + qty
 
-    totals = totals_db or totals_calc
+    # ``stock_totals`` only holds the current totals.
+    totals = totals_calc if as_of is not None else (totals_db or totals_calc)
     return {"totals": totals, "items": items}
 
 
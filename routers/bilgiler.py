@@ -15,7 +15,6 @@ from fastapi import (
     status,
 )
 from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 from sqlalchemy import or_
 from sqlalchemy.orm import Session, joinedload
@@ -23,10 +22,9 @@ from sqlalchemy.orm import Session, joinedload
 from database import get_db
 from models import Bilgi, BilgiKategori, UserPinLimit
 from security import SessionUser, current_user
-from utils.template_filters import register_filters
+from utils.templating import templates
 
 router = APIRouter(prefix="/bilgiler", tags=["Bilgiler"])
-templates = register_filters(Jinja2Templates(directory="templates"))
 
 UPLOAD_DIR = Path("static/uploads/bilgiler")
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif"}
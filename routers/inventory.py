@@ -1,5 +1,4 @@
-from datetime import date, datetime
-from io import BytesIO
+from datetime import datetime
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
 from fastapi.responses import (
@@ -7,13 +6,11 @@ from fastapi.responses import (
     JSONResponse,
     PlainTextResponse,
     RedirectResponse,
-    StreamingResponse,
 )
-from fastapi.templating import Jinja2Templates
 from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
-from database import get_db
+from database import get_db, get_read_db
 from models import (
     Brand,
     Factory,
@@ -24,29 +21,26 @@ from models import (
     LicenseLog,
     Model,
     ScrapItem,
-    ScrapPrinter,
     StockTotal,
     UsageArea,
     User,
 )
+from routers.lookup import TABLE_SPECS
 from security import current_user
+from utils.excel_export import iter_rows, workbook_response
 from utils.faults import FAULT_STATUS_SCRAP, resolve_fault
 from utils.http import get_request_user_name
+from utils.log_archive import archive_available, archived_history
+from utils.scraps import SCRAP_PAGE_SIZE, scrap_page
 from utils.stock_log import create_stock_log
-from utils.template_filters import register_filters
-
-templates = register_filters(Jinja2Templates(directory="templates"))
-
+from utils.table_query import table_page
+from utils.templating import templates
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
 
 @router.get("/export")
-async def export_inventory(db: Session = Depends(get_db)):
-    from openpyxl import Workbook
-
-    wb = Workbook()
-    ws = wb.active
+async def export_inventory(db: Session = Depends(get_read_db)):
     headers = [
         "ID",
         "No",
@@ -66,41 +60,28 @@ async def export_inventory(db: Session = Depends(get_db)):
         "Durum",
         "Not",
     ]
-    ws.append(headers)
-
-    items = db.query(Inventory).order_by(Inventory.id.asc()).all()
-    for i in items:
-        ws.append(
-            [
-                i.id,
-                i.no,
-                i.fabrika,
-                i.departman,
-                i.donanim_tipi,
-                i.bilgisayar_adi,
-                i.marka,
-                i.model,
-                i.seri_no,
-                i.sorumlu_personel,
-                i.bagli_envanter_no,
-                i.kullanim_alani,
-                i.ifs_no,
-                i.tarih,
-                i.islem_yapan,
-                i.durum,
-                i.not_,
-            ]
-        )
-
-    stream = BytesIO()
-    wb.save(stream)
-    stream.seek(0)
-
-    headers = {"Content-Disposition": "attachment; filename=inventory.xlsx"}
-    return StreamingResponse(
-        stream,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers=headers,
+    query = db.query(
+        Inventory.id,
+        Inventory.no,
+        Inventory.fabrika,
+        Inventory.departman,
+        Inventory.donanim_tipi,
+        Inventory.bilgisayar_adi,
+        Inventory.marka,
+        Inventory.model,
+        Inventory.seri_no,
+        Inventory.sorumlu_personel,
+        Inventory.bagli_envanter_no,
+        Inventory.kullanim_alani,
+        Inventory.ifs_no,
+        Inventory.tarih,
+        Inventory.islem_yapan,
+        Inventory.durum,
+        Inventory.not_,
+    ).order_by(Inventory.id.asc())
+
+    return workbook_response(
+        [("Envanter", headers, iter_rows(query))], "inventory.xlsx"
     )
 
 
@@ -111,16 +92,19 @@ async def import_inventory(file: UploadFile = File(...)):
 
 @router.get("", name="inventory.list")
 def list_items(
-    request: Request, db: Session = Depends(get_db), user=Depends(current_user)
+    request: Request, db: Session = Depends(get_read_db), user=Depends(current_user)
 ):
-    items = (
-        db.query(Inventory)
-        .filter(or_(Inventory.durum.is_(None), Inventory.durum != "hurda"))
-        .order_by(Inventory.id.desc())
-        .all()
-    )
+    # Yalnızca ilk sayfa; filtreler ve sonraki sayfalar /api/lookup/table'dan.
+    spec = TABLE_SPECS["inventory"]
+    page = table_page(db, spec)
     return templates.TemplateResponse(
-        "inventory_list.html", {"request": request, "items": items}
+        "inventory_list.html",
+        {
+            "request": request,
+            "items": page.rows,
+            "next_cursor": page.next_cursor,
+            "sortable": spec.sortable,
+        },
     )
 
 
@@ -226,6 +210,7 @@ async def new_post(
 def detail(
     request: Request,
     item_id: int,
+    arsiv: bool = False,
     db: Session = Depends(get_db),
     user=Depends(current_user),
 ):
@@ -239,6 +224,8 @@ def detail(
         .order_by(InventoryLog.created_at.desc())
         .all()
     )
+    if arsiv:
+        logs += archived_history(InventoryLog, item_id)
     lisanslar = (
         db.query(License)
         .filter(
@@ -253,6 +240,8 @@ def detail(
             "inv": item,
             "logs": logs,
             "lisanslar": lisanslar,
+            "arsiv": arsiv,
+            "archive_available": archive_available(),
         },
     )
 
@@ -558,217 +547,33 @@ def scrap(
 @router.get("/hurdalar", name="inventory.hurdalar")
 def hurdalar_listesi(
     request: Request,
-    tur: str = "envanter",
-    db: Session = Depends(get_db),
+    tur: str = "all",
+    q: str = "",
+    sort: str = "tarih",
+    yon: str = "desc",
+    page: int = 1,
+    per_page: int = SCRAP_PAGE_SIZE,
+    db: Session = Depends(get_read_db),
     user=Depends(current_user),
 ):
-    def to_datetime(value):
-        if isinstance(value, datetime):
-            return value
-        if isinstance(value, date):
-            return datetime.combine(value, datetime.min.time())
-        return None
-
-    def format_display_date(value):
-        if isinstance(value, datetime):
-            return value.strftime("%d.%m.%Y %H:%M")
-        if isinstance(value, date):
-            return value.strftime("%d.%m.%Y")
-        return "-"
-
-    hurdalar = db.query(Inventory).filter(Inventory.durum == "hurda").all()
-    logs_map = {
-        item.id: (
-            db.query(InventoryLog)
-            .filter(InventoryLog.inventory_id == item.id)
-            .order_by(InventoryLog.created_at.desc())
-            .all()
-        )
-        for item in hurdalar
-    }
-
-    license_scraps = db.query(License).filter(License.durum == "hurda").all()
-    printer_scraps = (
-        db.query(ScrapPrinter).order_by(ScrapPrinter.created_at.desc()).all()
-    )
-
-    combined_scraps = []
-
-    for item in hurdalar:
-        display_title = " ".join(filter(None, [item.marka, item.model])).strip() or "-"
-        details = [
-            {"label": "Envanter No", "value": item.no or "-"},
-            {"label": "Seri No", "value": item.seri_no or "-"},
-            {
-                "label": "Departman",
-                "value": item.departman or item.fabrika or "-",
-            },
-            {"label": "Sorumlu", "value": item.sorumlu_personel or "-"},
-            {"label": "Bağlı Envanter", "value": item.bagli_envanter_no or "-"},
-            {
-                "label": "Kullanım Alanı",
-                "value": item.kullanim_alani or "-",
-            },
-        ]
-
-        if item.not_:
-            details.append({"label": "Not", "value": item.not_})
-
-        search_text = " ".join(
-            filter(
-                None,
-                [
-                    "envanter",
-                    item.no,
-                    item.marka,
-                    item.model,
-                    item.seri_no,
-                    item.departman,
-                    item.sorumlu_personel,
-                    item.bagli_envanter_no,
-                    item.kullanim_alani,
-                    item.not_,
-                ],
-            )
-        ).lower()
-
-        combined_scraps.append(
-            {
-                "type": "envanter",
-                "type_label": "Envanter",
-                "title": display_title,
-                "subtitle": f"Envanter No: {item.no}",
-                "details": details,
-                "logs": logs_map[item.id],
-                "display_date": format_display_date(item.tarih),
-                "sort_date": to_datetime(item.tarih),
-                "detail_url": f"/scrap/inventory/{item.id}",
-                "search": search_text,
-            }
-        )
-
-    for row in license_scraps:
-        details = [
-            {"label": "Lisans ID", "value": row.id},
-            {"label": "Lisans Key", "value": row.lisans_key or "-"},
-            {"label": "Sorumlu", "value": row.sorumlu_personel or "-"},
-            {"label": "Bağlı Envanter", "value": row.bagli_envanter_no or "-"},
-            {"label": "IFS No", "value": row.ifs_no or "-"},
-        ]
-
-        if row.notlar:
-            details.append({"label": "Not", "value": row.notlar})
-
-        title = row.lisans_adi or f"Lisans #{row.id}"
-        subtitle = f"Lisans ID: {row.id}"
-
-        search_text = " ".join(
-            filter(
-                None,
-                [
-                    "lisans",
-                    str(row.id),
-                    row.lisans_adi,
-                    row.lisans_key,
-                    row.sorumlu_personel,
-                    row.bagli_envanter_no,
-                    row.ifs_no,
-                    row.notlar,
-                ],
-            )
-        ).lower()
-
-        combined_scraps.append(
-            {
-                "type": "lisans",
-                "type_label": "Lisans",
-                "title": title,
-                "subtitle": subtitle,
-                "details": details,
-                "logs": [],
-                "display_date": format_display_date(row.tarih),
-                "sort_date": to_datetime(row.tarih),
-                "detail_url": f"/lisans/detail/{row.id}",
-                "search": search_text,
-            }
-        )
-
-    for scrap in printer_scraps:
-        snapshot = scrap.snapshot or {}
-        marka = snapshot.get("marka")
-        model = snapshot.get("model")
-        seri = snapshot.get("seri_no")
-        title = " ".join(filter(None, [marka, model])).strip()
-        if not title:
-            title = f"Yazıcı #{scrap.printer_id}"
-
-        subtitle = f"Seri No: {seri or '-'}"
-
-        details = [
-            {"label": "Yazıcı ID", "value": f"#{scrap.printer_id}"},
-            {"label": "Seri No", "value": seri or "-"},
-            {"label": "Fabrika", "value": snapshot.get("fabrika") or "-"},
-            {
-                "label": "Kullanım Alanı",
-                "value": snapshot.get("kullanim_alani") or "-",
-            },
-            {
-                "label": "Sorumlu",
-                "value": snapshot.get("sorumlu_personel") or "-",
-            },
-            {
-                "label": "Bağlı Envanter",
-                "value": snapshot.get("bagli_envanter_no") or "-",
-            },
-        ]
-
-        reason = scrap.reason or snapshot.get("notlar") or snapshot.get("not")
-        if reason:
-            details.append({"label": "Sebep", "value": reason})
-
-        search_text = " ".join(
-            filter(
-                None,
-                [
-                    "yazici",
-                    str(scrap.printer_id),
-                    marka,
-                    model,
-                    seri,
-                    snapshot.get("fabrika"),
-                    snapshot.get("kullanim_alani"),
-                    snapshot.get("sorumlu_personel"),
-                    snapshot.get("bagli_envanter_no"),
-                    reason,
-                ],
-            )
-        ).lower()
-
-        combined_scraps.append(
-            {
-                "type": "yazici",
-                "type_label": "Yazıcı",
-                "title": title,
-                "subtitle": subtitle,
-                "details": details,
-                "logs": [],
-                "display_date": format_display_date(scrap.created_at),
-                "sort_date": to_datetime(scrap.created_at),
-                "detail_url": f"/printers/{scrap.printer_id}",
-                "search": search_text,
-            }
-        )
-
-    combined_scraps.sort(
-        key=lambda item: item["sort_date"] or datetime.min,
-        reverse=True,
+    result = scrap_page(
+        db,
+        tur=tur,
+        q=q,
+        sort=sort,
+        desc=yon != "asc",
+        page=page,
+        per_page=per_page,
     )
-
     return templates.TemplateResponse(
         "hurdalar.html",
         {
             "request": request,
-            "combined_scraps": combined_scraps,
+            "combined_scraps": result.items,
+            "scrap_page": result,
             "tur": tur,
+            "q": q,
+            "sort": sort,
+            "yon": "asc" if yon == "asc" else "desc",
         },
     )
@@ -5,33 +5,29 @@ from fastapi.responses import (
     HTMLResponse,
     PlainTextResponse,
     RedirectResponse,
-    StreamingResponse,
 )
-from fastapi.templating import Jinja2Templates
-from sqlalchemy import or_, text
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from starlette import status
 
-from database import get_db
+from database import get_db, get_read_db
 from models import Inventory, License, LicenseLog, LicenseName, StockTotal
+from routers.lookup import TABLE_SPECS
 from security import current_user
+from utils.excel_export import iter_rows, workbook_response
 from utils.faults import FAULT_STATUS_SCRAP, resolve_fault
 from utils.http import get_request_user_name
+from utils.log_archive import archive_available, archived_history
 from utils.stock_log import create_stock_log
+from utils.table_query import table_page
+from utils.templating import templates
 
 router = APIRouter(prefix="/lisans", tags=["Lisans"])
-templates = Jinja2Templates(directory="templates")
 
 
 @router.get("/export")
-async def export_licenses(db: Session = Depends(get_db)):
+async def export_licenses(db: Session = Depends(get_read_db)):
     """Export all license records as an Excel file."""
-    from io import BytesIO
-
-    from openpyxl import Workbook
-
-    wb = Workbook()
-    ws = wb.active
     headers = [
         "ID",
         "Lisans Adı",
@@ -45,35 +41,22 @@ async def export_licenses(db: Session = Depends(get_db)):
         "Durum",
         "Notlar",
     ]
-    ws.append(headers)
-
-    rows = db.query(License).order_by(License.id.asc()).all()
-    for r in rows:
-        ws.append(
-            [
-                r.id,
-                r.lisans_adi,
-                r.lisans_anahtari,
-                r.sorumlu_personel,
-                r.bagli_envanter_no,
-                r.ifs_no,
-                r.mail_adresi,
-                r.tarih,
-                r.islem_yapan,
-                r.durum,
-                r.notlar,
-            ]
-        )
-
-    stream = BytesIO()
-    wb.save(stream)
-    stream.seek(0)
-
-    headers = {"Content-Disposition": "attachment; filename=licenses.xlsx"}
-    return StreamingResponse(
-        stream,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers=headers,
+    query = db.query(
+        License.id,
+        License.lisans_adi,
+        License.lisans_anahtari,
+        License.sorumlu_personel,
+        License.bagli_envanter_no,
+        License.ifs_no,
+        License.mail_adresi,
+        License.tarih,
+        License.islem_yapan,
+        License.durum,
+        License.notlar,
+    ).order_by(License.id.asc())
+
+    return workbook_response(
+        [("Lisanslar", headers, iter_rows(query))], "licenses.xlsx"
     )
 
 
@@ -419,12 +402,12 @@ def edit_quick_license(
 
 @router.get("", name="license_list")
 def license_list(
-    request: Request, db: Session = Depends(get_db), current_user=Depends(current_user)
+    request: Request,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(current_user),
 ):
-    active_licenses = or_(
-        License.durum.is_(None), ~License.durum.in_(["hurda", "stok"])
-    )
-    items = db.query(License).filter(active_licenses).all()
+    # Yalnızca ilk sayfa; filtreler ve sonraki sayfalar /api/lookup/table'dan.
+    page = table_page(db, TABLE_SPECS["license"])
     users = [
         r[0]
         for r in db.execute(
@@ -437,7 +420,9 @@ def license_list(
         "license_list.html",
         {
             "request": request,
-            "items": items,
+            "items": page.rows,
+            "next_cursor": page.next_cursor,
+            "sortable": TABLE_SPECS["license"].sortable,
             "users": users,
             "envanterler": envanterler,
             "license_names": license_names,
@@ -447,7 +432,7 @@ def license_list(
 
 
 @router.get("/hurdalar", name="license_scrap_list")
-def license_scrap_list(request: Request, db: Session = Depends(get_db)):
+def license_scrap_list(request: Request, db: Session = Depends(get_read_db)):
     items = db.query(License).filter(License.durum == "hurda").all()
     return templates.TemplateResponse(
         "license_scrap_list.html", {"request": request, "items": items}
@@ -469,10 +454,19 @@ def license_detail_partial(
 
 
 @router.get("/{lic_id}", name="license_detail")
-def license_detail(lic_id: int, request: Request, db: Session = Depends(get_db)):
+def license_detail(
+    lic_id: int, request: Request, arsiv: bool = False, db: Session = Depends(get_db)
+):
     lic = db.get(License, lic_id)
     if not lic:
         raise HTTPException(status_code=404, detail="Lisans bulunamadı")
     return templates.TemplateResponse(
-        "license_detail.html", {"request": request, "item": lic}
+        "license_detail.html",
+        {
+            "request": request,
+            "item": lic,
+            "arsiv": arsiv,
+            "archived_logs": archived_history(LicenseLog, lic.id) if arsiv else [],
+            "archive_available": archive_available(),
+        },
     )
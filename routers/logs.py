@@ -1,36 +1,197 @@
 # routers/logs.py
-from fastapi import APIRouter, Depends, Request
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from database import get_db
+from database import get_read_db
 from models import Inventory, InventoryLog, User
+from utils.log_archive import archive_table, archived_rows
+from utils.pagination import after_cursor, encode_cursor
+from utils.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
+LOG_PAGE_SIZE = 50
+LOG_PAGE_MAX = 200
+# inventory_log'a yazılan işlemler; filtre listesi tabloyu taramadan buradan gelir.
+INVENTORY_LOG_ACTIONS = (
+    "assign",
+    "create",
+    "edit",
+    "fault",
+    "fault_close",
+    "repair",
+    "scrap",
+    "stock",
+)
 
-@router.get("/", response_class=HTMLResponse, name="logs_page")
-def logs_home(request: Request, tab: str = "kullanici", db: Session = Depends(get_db)):
-    logs = (
-        db.query(InventoryLog, Inventory.no.label("inv_no"))
-        .join(Inventory, Inventory.id == InventoryLog.inventory_id)
-        .order_by(InventoryLog.created_at.desc())
-        .all()
+
+def _like_prefix(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+def _log_criteria(
+    table,
+    *,
+    cursor: Optional[str],
+    actor: Optional[str],
+    inventory_ids: Optional[list[int]],
+    action: Optional[str],
+    baslangic: Optional[date],
+    bitis: Optional[date],
+) -> list:
+    criteria = []
+    if actor:
+        criteria.append(table.c.actor == actor)
+    if inventory_ids is not None:
+        criteria.append(table.c.inventory_id.in_(inventory_ids))
+    if action:
+        criteria.append(table.c.action == action)
+    if baslangic:
+        criteria.append(table.c.created_at >= datetime.combine(baslangic, time.min))
+    if bitis:
+        criteria.append(
+            table.c.created_at < datetime.combine(bitis + timedelta(days=1), time.min)
+        )
+    if cursor:
+        criteria.append(after_cursor(table.c.created_at, table.c.id, cursor))
+    return criteria
+
+
+def _inventory_logs_page(
+    db: Session,
+    *,
+    limit: int = LOG_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    actor: Optional[str] = None,
+    inventory_no: Optional[str] = None,
+    action: Optional[str] = None,
+    baslangic: Optional[date] = None,
+    bitis: Optional[date] = None,
+) -> dict:
+    """Envanter kayıtlarını ``(created_at, id)`` sırasına göre sayfa sayfa döndür.
+
+    Filtreler sunucuda uygulanır ve sayfalama son satırın ``(created_at, id)``
+    değerini taşıyan imleçle yapılır; böylece sayfa tüm kayıt tablosunu
+    yüklemeden açılır ve her sayfa indeksten okunur.  Canlı kayıtlar
+    bittiğinde sayfa arşivdeki daha eski kayıtlarla tamamlanır.
+    """
+
+    limit = max(1, min(limit, LOG_PAGE_MAX))
+    inventory_ids = None
+    if inventory_no:
+        inventory_ids = list(
+            db.execute(
+                select(Inventory.id).where(
+                    Inventory.no.like(_like_prefix(inventory_no.strip()), escape="\\")
+                )
+            ).scalars()
+        )
+        if not inventory_ids:
+            return {"items": [], "next_cursor": None}
+    filters = dict(
+        cursor=cursor,
+        actor=actor,
+        inventory_ids=inventory_ids,
+        action=action,
+        baslangic=baslangic,
+        bitis=bitis,
     )
-    users = [u[0] for u in db.query(User.username).order_by(User.username).all()]
-    inventory_numbers = [
-        i[0] for i in db.query(Inventory.no).order_by(Inventory.no).all()
+
+    table = InventoryLog.__table__
+    rows = db.execute(
+        select(
+            table.c.id,
+            table.c.inventory_id,
+            table.c.action,
+            table.c.before_json,
+            table.c.after_json,
+            table.c.actor,
+            table.c.created_at,
+        )
+        .where(*_log_criteria(table, **filters))
+        .order_by(table.c.created_at.desc(), table.c.id.desc())
+        .limit(limit + 1)
+    ).all()
+    if len(rows) <= limit:
+        # Arşivdeki kayıtların hepsi canlı kayıtlardan eskidir.
+        rows += archived_rows(
+            InventoryLog,
+            *_log_criteria(archive_table(InventoryLog), **filters),
+            limit=limit + 1 - len(rows),
+        )
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    numbers = dict(
+        db.execute(
+            select(Inventory.id, Inventory.no).where(
+                Inventory.id.in_({row.inventory_id for row in rows})
+            )
+        ).all()
+    )
+    items = [
+        {
+            "id": row.id,
+            "inventory_no": numbers.get(row.inventory_id),
+            "action": row.action,
+            "actor": row.actor,
+            "created_at": row.created_at,
+            "before": row.before_json or {},
+            "after": row.after_json or {},
+        }
+        for row in rows
     ]
+    next_cursor = (
+        encode_cursor(rows[-1].created_at, rows[-1].id) if has_more and rows else None
+    )
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/", response_class=HTMLResponse, name="logs_page")
+def logs_home(
+    request: Request, tab: str = "kullanici", db: Session = Depends(get_read_db)
+):
+    page = _inventory_logs_page(db)
+    users = list(db.execute(select(User.username).order_by(User.username)).scalars())
     return templates.TemplateResponse(
         "logs/index.html",
         {
             "request": request,
-            "user_logs": logs,
-            "inventory_logs": logs,
+            "logs": page["items"],
+            "next_cursor": page["next_cursor"],
             "users": users,
-            "inventory_numbers": inventory_numbers,
+            "actions": INVENTORY_LOG_ACTIONS,
             "tab": tab,
         },
     )
+
+
+@router.get("/api", name="logs_api")
+def logs_api(
+    limit: int = Query(LOG_PAGE_SIZE, ge=1, le=LOG_PAGE_MAX),
+    cursor: Optional[str] = None,
+    actor: Optional[str] = None,
+    inventory_no: Optional[str] = None,
+    action: Optional[str] = None,
+    baslangic: Optional[date] = None,
+    bitis: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+):
+    """Envanter kayıtlarının bir sayfasını ve sonraki sayfanın imlecini döndür."""
+
+    return _inventory_logs_page(
+        db,
+        limit=limit,
+        cursor=cursor,
+        actor=actor,
+        inventory_no=inventory_no,
+        action=action,
+        baslangic=baslangic,
+        bitis=bitis,
+    )
@@ -1,10 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import text
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse
+from sqlalchemy import func, or_, text
 from sqlalchemy.orm import Session
 
-from database import get_db  # projedeki mevcut get_db
-from models import BilgiKategori, Brand, HardwareType, Lookup
+from database import get_read_db  # salt okunur uçlar
+from models import BilgiKategori, Brand, HardwareType, Inventory, License, Lookup
 from models import Model as ModelTbl
+from models import Printer
+from utils.normalize import normalize_search, prefix_bounds, prefix_match
+from utils.table_query import (
+    TABLE_PAGE_MAX,
+    TABLE_PAGE_SIZE,
+    TablePage,
+    TableSpec,
+    table_page,
+)
+from utils.templating import templates
 
 router = APIRouter(prefix="/api/lookup", tags=["lookup"])
 
@@ -12,21 +23,21 @@ router = APIRouter(prefix="/api/lookup", tags=["lookup"])
 
 
 @router.get("/donanim_tipi")
-def lookup_donanim_tipi(db: Session = Depends(get_db)):
+def lookup_donanim_tipi(db: Session = Depends(get_read_db)):
     rows = db.query(HardwareType).order_by(HardwareType.name.asc()).all()
     # `adi` yerine tutarlı biçimde `name` anahtarını döndür
     return [{"id": r.id, "name": r.name} for r in rows]
 
 
 @router.get("/marka")
-def lookup_marka(db: Session = Depends(get_db)):
+def lookup_marka(db: Session = Depends(get_read_db)):
     rows = db.query(Brand).order_by(Brand.name.asc()).all()
     # İstemcilerin beklediği alan adı `name` olduğundan bu alanı döndür
     return [{"id": r.id, "name": r.name} for r in rows]
 
 
 @router.get("/bilgi_kategorileri")
-def lookup_bilgi_kategorileri(db: Session = Depends(get_db)):
+def lookup_bilgi_kategorileri(db: Session = Depends(get_read_db)):
     rows = db.query(BilgiKategori).order_by(BilgiKategori.ad.asc()).all()
     return [{"id": r.id, "name": r.ad} for r in rows]
 
@@ -35,7 +46,7 @@ def lookup_bilgi_kategorileri(db: Session = Depends(get_db)):
 def lookup_model(
     marka_id: int | None = None,
     marka: str | None = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Belirli bir markaya ait modelleri döndür.
 
@@ -106,6 +117,8 @@ ENTITY_TABLE = {
     "bilgi-kategori": "bilgi_kategorileri",
     "bilgi_kategorileri": "bilgi_kategorileri",
 }
+# Ad kolonu ``name`` olmayan tablolar; arama anahtarı ``<kolon>_norm``dadır.
+NAME_COLUMN = {"bilgi_kategorileri": "ad"}
 
 # Kolon/lookup bulunmadığında dönecek güvenli değerler
 FALLBACK_LISTS = {
@@ -153,6 +166,135 @@ FILTER_MAP = {
 }
 
 
+def _table_spec(entity: str, model, scope, row_template: str) -> TableSpec:
+    cfg = FILTER_MAP[entity]
+    assert cfg["table"] == model.__tablename__
+    columns = model.__table__.c
+    return TableSpec(
+        entity=entity,
+        model=model,
+        # FILTER_MAP'te olup tabloda bulunmayan kolonlar (ör. lisans "no") atlanır.
+        columns=tuple(name for name in cfg["columns"] if name in columns),
+        scope=scope,
+        row_template=row_template,
+    )
+
+
+# Liste sayfalarının sunucu tarafı tablo sorguları; kapsam listelerle aynıdır.
+TABLE_SPECS = {
+    "inventory": _table_spec(
+        "inventory",
+        Inventory,
+        lambda: or_(Inventory.durum.is_(None), Inventory.durum != "hurda"),
+        "inventory/_row.html",
+    ),
+    "printer": _table_spec(
+        "printer",
+        Printer,
+        lambda: or_(Printer.durum.is_(None), Printer.durum != "hurda"),
+        "printers/_row.html",
+    ),
+    "license": _table_spec(
+        "license",
+        License,
+        lambda: or_(License.durum.is_(None), ~License.durum.in_(["hurda", "stok"])),
+        "licenses/_row.html",
+    ),
+}
+
+
+def render_table_rows(spec: TableSpec, page: TablePage) -> str:
+    """Render the ``<tr>`` fragments of ``page`` with the list's row template."""
+
+    template = templates.get_template(spec.row_template)
+    return "".join(template.render(row=row) for row in page.rows)
+
+
+@router.get("/table/{entity}", name="lookup.table")
+def table_rows(
+    entity: str,
+    request: Request,
+    q: str = "",
+    sort: str | None = None,
+    yon: str = "desc",
+    cursor: str | None = None,
+    limit: int = Query(TABLE_PAGE_SIZE, ge=1, le=TABLE_PAGE_MAX),
+    format: str = "json",
+    db: Session = Depends(get_read_db),
+):
+    """Liste tablolarının bir sayfasını sunucuda filtreleyip sıralayarak döndür.
+
+    Kolon filtreleri ``f.<kolon>=değer`` biçiminde verilir (aynı kolon için
+    birden fazla değer "veya" ile bağlanır).  ``format=html`` satırları liste
+    sayfasındaki ``<tr>`` parçaları olarak, aksi halde JSON olarak döndürür;
+    sonraki sayfa ``next_cursor`` ile istenir.
+    """
+
+    spec = TABLE_SPECS.get(entity)
+    if spec is None:
+        raise HTTPException(404, "Geçersiz entity")
+    filters = {
+        column: request.query_params.getlist(f"f.{column}") for column in spec.columns
+    }
+    page = table_page(
+        db,
+        spec,
+        filters=filters,
+        q=q,
+        sort=sort,
+        desc=yon != "asc",
+        cursor=cursor,
+        limit=limit,
+    )
+    if format == "html":
+        return HTMLResponse(
+            render_table_rows(spec, page),
+            headers={"X-Next-Cursor": page.next_cursor or ""},
+        )
+    return {
+        "items": [
+            {"id": row.id, **{c: getattr(row, c) for c in spec.columns}}
+            for row in page.rows
+        ],
+        "next_cursor": page.next_cursor,
+    }
+
+
+def _select_names(db, table, name_col, where, params, q, limit):
+    """``{id, name}`` rows of ``table`` matching ``q``, Turkish-aware.
+
+    Names starting with ``q`` come first (an index range scan on the
+    ``*_norm`` key); remaining slots are filled with names containing it.
+    """
+
+    def run(conditions, extra, count):
+        where_sql = (" WHERE " + " AND ".join(conditions)) if conditions else ""
+        sql = text(
+            f"SELECT id, {name_col} AS name FROM {table}{where_sql}"
+            f" ORDER BY {name_col} LIMIT :limit"
+        )
+        return list(
+            db.execute(sql, {**params, **extra, "limit": count}).mappings().all()
+        )
+
+    bounds = prefix_bounds(q)
+    if bounds is None:
+        return run(where, {}, limit)
+    key = f"{name_col}_norm"
+    low, high = bounds
+    rows = run(
+        where + [f"{key} >= :q_low AND {key} < :q_high"],
+        {"q_low": low, "q_high": high},
+        limit,
+    )
+    if len(rows) < limit:
+        # Adın ortasında geçenler (önek eşleşmeleri instr = 1 olduğundan hariç).
+        rows += run(
+            where + [f"instr({key}, :q_key) > 1"], {"q_key": low}, limit - len(rows)
+        )
+    return rows
+
+
 @router.get("/{entity}")
 def lookup_list(
     entity: str,
@@ -160,18 +302,16 @@ def lookup_list(
     limit: int = 50,
     marka_id: int | None = None,
     marka: str | None = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     entity = entity.strip().lower()
     table = ENTITY_TABLE.get(entity)
 
     if table:
         # Temel sorgu: id, ad kolonlarını bekliyoruz (modellerde marka_id var)
-        params = {"limit": limit}
+        name_col = NAME_COLUMN.get(table, "name")
+        params = {}
         where = []
-        if q:
-            where.append("LOWER(name) LIKE LOWER(:q)")
-            params["q"] = f"%{q}%"
         if entity == "model":
             if marka_id is None and marka:
                 try:
@@ -192,17 +332,9 @@ def lookup_list(
             else:
                 where.append("brand_id = :brand_id")
                 params["brand_id"] = marka_id
-                where_sql = (" WHERE " + " AND ".join(where)) if where else ""
-                sql = text(
-                    f"SELECT id, name FROM {table}{where_sql} ORDER BY name LIMIT :limit"
-                )
-                rows = db.execute(sql, params).mappings().all()
+                rows = _select_names(db, table, name_col, where, params, q, limit)
         else:
-            where_sql = (" WHERE " + " AND ".join(where)) if where else ""
-            sql = text(
-                f"SELECT id, name FROM {table}{where_sql} ORDER BY name LIMIT :limit"
-            )
-            rows = db.execute(sql, params).mappings().all()
+            rows = _select_names(db, table, name_col, where, params, q, limit)
 
         if rows:
             # API'ler genellikle {id, name} döndürür; "text" gibi farklı anahtarlar
@@ -214,11 +346,23 @@ def lookup_list(
 
     # Kolon bazlı tablo yoksa Lookup.type tablosunu dene
     try:
-        q_expr = db.query(Lookup.value).filter(Lookup.type == entity)
-        if q:
-            q_expr = q_expr.filter(Lookup.value.ilike(f"%{q}%"))
-        q_expr = q_expr.order_by(Lookup.value.asc()).limit(limit)
-        rows = [r[0] for r in q_expr.all() if r and r[0]]
+        base = db.query(Lookup.value).filter(Lookup.type == entity)
+        criterion = prefix_match(Lookup.value_norm, q)
+        if criterion is None:
+            found = base.order_by(Lookup.value.asc()).limit(limit).all()
+        else:
+            found = (
+                base.filter(criterion).order_by(Lookup.value.asc()).limit(limit).all()
+            )
+            if len(found) < limit:
+                inner = func.instr(Lookup.value_norm, normalize_search(q)) > 1
+                found += (
+                    base.filter(inner)
+                    .order_by(Lookup.value.asc())
+                    .limit(limit - len(found))
+                    .all()
+                )
+        rows = [r[0] for r in found if r and r[0]]
         if rows:
             return [{"id": value, "name": value} for value in rows]
     except Exception:
@@ -235,7 +379,7 @@ def lookup_list(
 
 
 @router.get("/distinct/{entity}/{column}", name="lookup.distinct")
-def distinct_values(entity: str, column: str, db: Session = Depends(get_db)):
+def distinct_values(entity: str, column: str, db: Session = Depends(get_read_db)):
     cfg = FILTER_MAP.get(entity)
     if not cfg or column not in cfg["columns"]:
         raise HTTPException(404, "Geçersiz entity/kolon")
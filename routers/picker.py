@@ -19,6 +19,7 @@ from models import (
     UsageArea,
     User,
 )
+from utils.normalize import contains_match
 
 router = APIRouter(prefix="/api/picker", tags=["Picker"])
 
@@ -80,7 +81,12 @@ def picker_users(q: Optional[str] = Query(None), db: Session = Depends(get_db)):
     if q:
         ilikes = []
         for cols in candidates:
-            if len(cols) == 1:
+            if cols == ("full_name",):
+                # Türkçe duyarlı arama anahtarı (İ/ı, Ş, Ç ...)
+                criterion = contains_match(User.full_name_norm, q)
+                if criterion is not None:
+                    ilikes.append(criterion)
+            elif len(cols) == 1:
                 ilikes.append(getattr(User, cols[0]).ilike(f"%{q}%"))
             else:
                 # concat alanlar
@@ -89,7 +95,8 @@ def picker_users(q: Optional[str] = Query(None), db: Session = Depends(get_db)):
                         getattr(User, cols[0]), " ", getattr(User, cols[1])
                     ).ilike(f"%{q}%")
                 )
-        base = base.filter(or_(*ilikes))
+        if ilikes:
+            base = base.filter(or_(*ilikes))
 
     rows = base.order_by(getattr(User, candidates[0][0]).asc()).limit(200).all()
 
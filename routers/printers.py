@@ -7,13 +7,11 @@ from fastapi.responses import (
     JSONResponse,
     PlainTextResponse,
     RedirectResponse,
-    StreamingResponse,
 )
-from fastapi.templating import Jinja2Templates
 from sqlalchemy import or_, text
 from sqlalchemy.orm import Session
 
-from database import get_db
+from database import get_db, get_read_db
 from models import (
     Brand,
     Model,
@@ -23,26 +21,25 @@ from models import (
     StockTotal,
     UsageArea,
 )
+from routers.lookup import TABLE_SPECS
 from security import current_user
+from utils.excel_export import iter_rows, workbook_response
 from utils.faults import FAULT_STATUS_SCRAP, resolve_fault
 from utils.http import get_request_user_name
+from utils.log_archive import archive_available, archived_history
+from utils.normalize import contains_match
 from utils.stock_log import create_stock_log
+from utils.table_query import table_page
+from utils.templating import templates
 
-templates = Jinja2Templates(directory="templates")
 router = APIRouter(prefix="/printers", tags=["Printers"])
 
 USE_SCRAP_TABLE = True
 
 
 @router.get("/export")
-async def export_printers(db: Session = Depends(get_db)):
+async def export_printers(db: Session = Depends(get_read_db)):
     """Export printer records as an Excel file."""
-    from io import BytesIO
-
-    from openpyxl import Workbook
-
-    wb = Workbook()
-    ws = wb.active
     headers = [
         "ID",
         "Envanter No",
@@ -62,41 +59,28 @@ async def export_printers(db: Session = Depends(get_db)):
         "Durum",
         "Notlar",
     ]
-    ws.append(headers)
-
-    rows = db.query(Printer).order_by(Printer.id.asc()).all()
-    for r in rows:
-        ws.append(
-            [
-                r.id,
-                r.envanter_no,
-                r.marka,
-                r.model,
-                r.seri_no,
-                r.fabrika,
-                r.kullanim_alani,
-                r.sorumlu_personel,
-                r.bagli_envanter_no,
-                r.ip_adresi,
-                r.mac,
-                r.hostname,
-                r.ifs_no,
-                r.tarih,
-                r.islem_yapan,
-                r.durum,
-                r.notlar,
-            ]
-        )
-
-    stream = BytesIO()
-    wb.save(stream)
-    stream.seek(0)
-
-    headers = {"Content-Disposition": "attachment; filename=printers.xlsx"}
-    return StreamingResponse(
-        stream,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers=headers,
+    query = db.query(
+        Printer.id,
+        Printer.envanter_no,
+        Printer.marka,
+        Printer.model,
+        Printer.seri_no,
+        Printer.fabrika,
+        Printer.kullanim_alani,
+        Printer.sorumlu_personel,
+        Printer.bagli_envanter_no,
+        Printer.ip_adresi,
+        Printer.mac,
+        Printer.hostname,
+        Printer.ifs_no,
+        Printer.tarih,
+        Printer.islem_yapan,
+        Printer.durum,
+        Printer.notlar,
+    ).order_by(Printer.id.asc())
+
+    return workbook_response(
+        [("Yazıcılar", headers, iter_rows(query))], "printers.xlsx"
     )
 
 
@@ -133,29 +117,37 @@ def snapshot(p: Printer) -> Dict[str, Any]:
 @router.get("", response_class=HTMLResponse)
 def list_printers(
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     q: Optional[str] = None,
     durum: Optional[str] = None,
 ):
-    query = db.query(Printer)
+    next_cursor = None
     if durum:
-        query = query.filter(Printer.durum == durum)
+        query = db.query(Printer).filter(Printer.durum == durum)
+        if q:
+            like = f"%{q}%"
+            filters = [
+                Printer.marka.ilike(like),
+                Printer.model.ilike(like),
+                Printer.bagli_envanter_no.ilike(like),
+                Printer.ip_adresi.ilike(like),
+                Printer.hostname.ilike(like),
+            ]
+            # Kişi ve numara alanları Türkçe duyarlı arama anahtarlarından aranır.
+            for column in (
+                Printer.seri_no_norm,
+                Printer.sorumlu_personel_norm,
+                Printer.envanter_no_norm,
+            ):
+                criterion = contains_match(column, q)
+                if criterion is not None:
+                    filters.append(criterion)
+            query = query.filter(or_(*filters))
+        printers = query.order_by(Printer.id.desc()).all()
     else:
-        query = query.filter(or_(Printer.durum.is_(None), Printer.durum != "hurda"))
-    if q:
-        like = f"%{q}%"
-        query = query.filter(
-            (Printer.marka.ilike(like))
-            | (Printer.model.ilike(like))
-            | (Printer.seri_no.ilike(like))
-            | (Printer.sorumlu_personel.ilike(like))
-            | (Printer.bagli_envanter_no.ilike(like))
-            | (Printer.envanter_no.ilike(like))
-            | (Printer.ip_adresi.ilike(like))
-            | (Printer.hostname.ilike(like))
-        )
-
-    printers = query.order_by(Printer.id.desc()).all()
+        # Yalnızca ilk sayfa; filtreler ve sonraki sayfalar /api/lookup/table'dan.
+        page = table_page(db, TABLE_SPECS["printer"], q=q)
+        printers, next_cursor = page.rows, page.next_cursor
 
     users = [
         r[0]
@@ -185,6 +177,9 @@ def list_printers(
         {
             "request": request,
             "printers": printers,
+            "next_cursor": next_cursor,
+            "sortable": TABLE_SPECS["printer"].sortable,
+            "q": q or "",
             "users": users,
             "inventory_nos": invs,
             "factories": fabr,
@@ -274,7 +269,12 @@ def create_printer_simple(
 
 
 @router.get("/{printer_id}", response_class=HTMLResponse)
-def printer_detail(printer_id: int, request: Request, db: Session = Depends(get_db)):
+def printer_detail(
+    printer_id: int,
+    request: Request,
+    arsiv: bool = False,
+    db: Session = Depends(get_db),
+):
     p = db.get(Printer, printer_id)
     if not p or p.durum == "hurda":
         raise HTTPException(404, "Yazıcı bulunamadı")
@@ -284,8 +284,17 @@ def printer_detail(printer_id: int, request: Request, db: Session = Depends(get_
         .order_by(PrinterHistory.created_at.desc())
         .all()
     )
+    if arsiv:
+        logs += archived_history(PrinterHistory, p.id)
     return templates.TemplateResponse(
-        "printers_detail.html", {"request": request, "p": p, "logs": logs}
+        "printers_detail.html",
+        {
+            "request": request,
+            "p": p,
+            "logs": logs,
+            "arsiv": arsiv,
+            "archive_available": archive_available(),
+        },
     )
 
 
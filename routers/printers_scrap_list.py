@@ -1,11 +1,10 @@
 from fastapi import APIRouter, Depends, Request
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from database import get_db
 from models import Printer, ScrapPrinter
+from utils.templating import templates
 
-templates = Jinja2Templates(directory="templates")
 router = APIRouter(prefix="/printers", tags=["Printers - Scrap"])
 
 USE_SCRAP_TABLE = True
@@ -1,15 +1,14 @@
 # routers/profile.py
 from fastapi import APIRouter, Depends, Form, Request, status
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from database import get_db
 from models import User
-from security import SessionUser, current_user
+from security import SessionUser, current_user, invalidate_session_user
+from utils.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 
 @router.get("/", response_class=HTMLResponse)
@@ -50,6 +49,7 @@ async def update_theme(
         u.animation = animation
         db.add(u)
         db.commit()
+        invalidate_session_user(user.id)
         request.session["user_theme"] = theme
         request.session["user_anim"] = animation
     return RedirectResponse(url="/profile", status_code=status.HTTP_303_SEE_OTHER)
@@ -3,16 +3,16 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, File, Form, Request, UploadFile
 from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy import Integer, cast
 from sqlalchemy.orm import Session
 
 from database import get_db
-from models import Brand, HardwareType, Model, Talep, TalepDurum, TalepTuru
+from models import Talep, TalepDurum, TalepTuru
+from utils.excel_export import iter_rows
+from utils.refdata import get_refdata
 from utils.requests_export import export_requests_workbook
+from utils.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 
 @router.get("/export")
@@ -37,19 +37,20 @@ async def export_requests(db: Session = Depends(get_db)):
         "Tarih",
     ]
 
-    rows = db.query(Talep).all()
+    rows = iter_rows(db.query(Talep).order_by(Talep.id.asc()))
+    refdata = get_refdata(db)
 
     def build_row(talep: Talep):
         return [
             talep.id,
             talep.tur.value,
-            talep.donanim_tipi or "",
+            refdata.hardware.display(talep.donanim_tipi) or "",
             talep.ifs_no or "",
             talep.miktar or "",
             talep.karsilanan_miktar or "",
             talep.kalan_miktar or "",
-            talep.marka or "",
-            talep.model or "",
+            refdata.brands.display(talep.marka) or "",
+            refdata.models.display(talep.model) or "",
             talep.envanter_no or "",
             talep.bagli_envanter_no or "",
             talep.lisans_adi or "",
@@ -68,25 +69,17 @@ async def import_requests(file: UploadFile = File(...)):
 
 
 def _list_by_status(db: Session, durum: TalepDurum):
-    q = (
-        db.query(
-            Talep,
-            HardwareType.name.label("donanim_tipi_name"),
-            Brand.name.label("marka_name"),
-            Model.name.label("model_name"),
-        )
-        .outerjoin(HardwareType, HardwareType.id == cast(Talep.donanim_tipi, Integer))
-        .outerjoin(Brand, Brand.id == cast(Talep.marka, Integer))
-        .outerjoin(Model, Model.id == cast(Talep.model, Integer))
+    refdata = get_refdata(db)
+    rows = (
+        db.query(Talep)
         .filter(Talep.durum == durum)
         .order_by(Talep.ifs_no.asc(), Talep.id.asc())
+        .all()
     )
-    rows = []
-    for t, dt_name, marka_name, model_name in q.all():
-        t.donanim_tipi = dt_name or t.donanim_tipi
-        t.marka = marka_name or t.marka
-        t.model = model_name or t.model
-        rows.append(t)
+    for t in rows:
+        t.donanim_tipi = refdata.hardware.display(t.donanim_tipi)
+        t.marka = refdata.brands.display(t.marka)
+        t.model = refdata.models.display(t.model)
     return rows
 
 
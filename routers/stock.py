@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 from typing import Literal, Optional
 
 from fastapi import (
@@ -6,6 +6,7 @@ from fastapi import (
     Body,
     Depends,
     File,
+    Form,
     HTTPException,
     Query,
     Request,
@@ -14,68 +15,64 @@ from fastapi import (
 from fastapi.responses import (
     HTMLResponse,
     JSONResponse,
-    PlainTextResponse,
-    StreamingResponse,
 )
-from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, Field, validator
-from sqlalchemy import select, text
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from database import get_db
 from models import (
-    Brand,
-    HardwareType,
     Inventory,
     InventoryLog,
     License,
     LicenseLog,
-    LicenseName,
-    Model,
     Printer,
     PrinterHistory,
     StockAssignment,
     StockLog,
     StockTotal,
     SystemRoomItem,
-    UsageArea,
 )
 from routers.api import stock_status_detail
 from security import current_user
-from utils.stock_log import create_stock_log, normalize_islem
+from utils.data_version import SYSTEM_ROOM, touch
+from utils.excel_export import workbook_response
+from utils.pagination import after_cursor, encode_cursor
+from utils.refdata import get_refdata
+from utils.stock_balance import REQUIRED_LEDGER_COLUMNS, get_stock_balance
+from utils.stock_cache import cached_snapshot
+from utils.stock_import import StockImportError, import_stock_rows, read_rows
+from utils.stock_log import create_stock_log, get_available_columns, normalize_islem
+from utils.templating import templates
 
 router = APIRouter(prefix="/stock", tags=["Stock"])
 api_router = APIRouter(prefix="/api/stock", tags=["stock"])
-templates = Jinja2Templates(directory="templates")
 
 
 @router.get("/export")
-async def export_stock(db: Session = Depends(get_db)):
-    """Export current stock status (with summary) as an Excel file."""
-    from io import BytesIO
+async def export_stock(
+    db: Session = Depends(get_db), as_of: Optional[datetime] = None
+):
+    """Export current stock status (with summary) as an Excel file.
 
-    from openpyxl import Workbook
+    ``as_of`` exports the stock held at that moment instead.
+    """
 
-    items = stock_status(db)
-    detail = stock_status_detail(db)
+    detail = stock_status_detail(db, as_of)
+    # Geçmiş tarihli durum önbelleğe alınmaz; aynı hesap iki kez yapılmasın.
+    items = stock_status(db) if as_of is None else _stock_status(db, status=detail)
     totals = detail.get("totals") or {}
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Stok Durumu"
-
-    ws.append(
-        [
-            "Donanım Tipi",
-            "Marka",
-            "Model",
-            "IFS No",
-            "Stok",
-            "Son İşlem",
-            "Kaynak Türü",
-            "Kaynak ID",
-        ]
-    )
+    headers = [
+        "Donanım Tipi",
+        "Marka",
+        "Model",
+        "IFS No",
+        "Stok",
+        "Son İşlem",
+        "Kaynak Türü",
+        "Kaynak ID",
+    ]
 
     def format_ts(value):
         if isinstance(value, datetime):
@@ -98,20 +95,20 @@ async def export_stock(db: Session = Depends(get_db)):
         ),
     )
 
-    for row in sorted_items:
-        raw_source = row.get("source_type") or ""
-        source_lower = str(raw_source).lower()
-        if ":" in source_lower:
-            _, base = source_lower.split(":", 1)
-        else:
-            base = source_lower
-        base_label = source_labels.get(base, base.title() if base else "")
-        if source_lower.startswith("talep:"):
-            source_label = f"Talep ({base_label})" if base_label else "Talep"
-        else:
-            source_label = source_labels.get(source_lower, raw_source)
-        ws.append(
-            [
+    def status_rows():
+        for row in sorted_items:
+            raw_source = row.get("source_type") or ""
+            source_lower = str(raw_source).lower()
+            if ":" in source_lower:
+                _, base = source_lower.split(":", 1)
+            else:
+                base = source_lower
+            base_label = source_labels.get(base, base.title() if base else "")
+            if source_lower.startswith("talep:"):
+                source_label = f"Talep ({base_label})" if base_label else "Talep"
+            else:
+                source_label = source_labels.get(source_lower, raw_source)
+            yield [
                 row.get("donanim_tipi") or "",
                 row.get("marka") or "",
                 row.get("model") or "",
@@ -121,10 +118,8 @@ async def export_stock(db: Session = Depends(get_db)):
                 source_label,
                 row.get("source_id") or "",
             ]
-        )
-
-    if not sorted_items:
-        ws.append(["-", "-", "-", "-", 0, "-", "", ""])
+        if not sorted_items:
+            yield ["-", "-", "-", "-", 0, "-", "", ""]
 
     summary_data: dict[str, int] = {}
     for row in items:
@@ -134,59 +129,185 @@ async def export_stock(db: Session = Depends(get_db)):
     if not summary_data and totals:
         summary_data = {str(k): int(v) for k, v in totals.items()}
 
+    sheets = [("Stok Durumu", headers, status_rows())]
     if summary_data:
-        summary_ws = wb.create_sheet(title="Özet")
-        summary_ws.append(["Donanım Tipi", "Toplam Stok"])
-        for name, value in sorted(summary_data.items()):
-            summary_ws.append([name, value])
-
-    stream = BytesIO()
-    wb.save(stream)
-    stream.seek(0)
-
-    headers = {"Content-Disposition": "attachment; filename=stock_status.xlsx"}
-    return StreamingResponse(
-        stream,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers=headers,
+        sheets.append(
+            (
+                "Özet",
+                ["Donanım Tipi", "Toplam Stok"],
+                sorted(summary_data.items()),
+            )
+        )
+
+    filename = "stock_status.xlsx"
+    if as_of is not None:
+        filename = f"stock_status_{as_of:%Y%m%d_%H%M}.xlsx"
+    return workbook_response(sheets, filename)
+
+
+@router.post("/import")
+def import_stock(
+    file: UploadFile = File(...),
+    dry_run: bool = Form(False),
+    db: Session = Depends(get_db),
+    user=Depends(current_user),
+):
+    """Excel/CSV dosyasındaki stok hareketlerini toplu olarak içe aktar.
+
+    Hatalı satırlar atlanır ve satır numarasıyla raporlanır. ``dry_run``
+    seçildiğinde dosya yalnızca doğrulanır, hiçbir kayıt yazılmaz.
+    """
+
+    actor = (
+        getattr(user, "full_name", None) or getattr(user, "username", None) or "Sistem"
     )
+    try:
+        report = import_stock_rows(
+            db,
+            read_rows(file.file, file.filename or ""),
+            actor=actor,
+            dry_run=dry_run,
+        )
+    except StockImportError as exc:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception:
+        db.rollback()
+        raise
 
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+    return report.as_dict()
+
+
+MOVEMENT_PAGE_SIZE = 50
+MOVEMENT_PAGE_MAX = 200
+
+
+def _stock_movements_page(
+    db: Session,
+    *,
+    limit: int = MOVEMENT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    donanim_tipi: Optional[str] = None,
+    islem: Optional[str] = None,
+    actor: Optional[str] = None,
+    ifs_no: Optional[str] = None,
+    baslangic: Optional[date] = None,
+    bitis: Optional[date] = None,
+) -> dict:
+    """Stok hareketlerini ``(tarih, id)`` sırasına göre sayfa sayfa döndür.
+
+    Sayfalama OFFSET yerine son satırın ``(tarih, id)`` değerini taşıyan
+    imleçle yapılır; her sayfa ``ix_stock_logs_tarih_id`` indeksinden okunur
+    ve defter büyüdükçe yavaşlamaz.
+    """
 
-@router.post("/import", response_class=PlainTextResponse)
-async def import_stock(file: UploadFile = File(...)):
-    return f"Received {file.filename}, but import is not implemented."
+    columns = (
+        StockLog.id,
+        StockLog.donanim_tipi,
+        StockLog.miktar,
+        StockLog.ifs_no,
+        StockLog.tarih,
+        StockLog.islem,
+        StockLog.actor,
+    )
+    stmt = select(*columns)
+    refdata = get_refdata(db)
+
+    if donanim_tipi:
+        candidates = {donanim_tipi}
+        for names in (refdata.hardware, refdata.licenses):
+            type_id = names.id_for(donanim_tipi)
+            if type_id:
+                candidates.add(type_id)
+        stmt = stmt.where(StockLog.donanim_tipi.in_(candidates))
+    if islem:
+        islem_value, islem_valid = normalize_islem(islem)
+        if not islem_valid:
+            raise HTTPException(status_code=400, detail="Geçersiz işlem türü.")
+        stmt = stmt.where(StockLog.islem == islem_value)
+    if actor:
+        stmt = stmt.where(StockLog.actor == actor)
+    if ifs_no:
+        stmt = stmt.where(StockLog.ifs_no == ifs_no)
+    if baslangic:
+        stmt = stmt.where(StockLog.tarih >= datetime.combine(baslangic, time.min))
+    if bitis:
+        stmt = stmt.where(
+            StockLog.tarih < datetime.combine(bitis + timedelta(days=1), time.min)
+        )
+
+    if cursor:
+        stmt = stmt.where(after_cursor(StockLog.tarih, StockLog.id, cursor))
+
+    limit = max(1, min(limit, MOVEMENT_PAGE_MAX))
+    rows = db.execute(
+        stmt.order_by(StockLog.tarih.desc(), StockLog.id.desc()).limit(limit + 1)
+    ).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = [
+        {
+            "id": row.id,
+            "donanim_tipi": refdata.type_name(row.donanim_tipi) or row.donanim_tipi,
+            "miktar": row.miktar,
+            "ifs_no": row.ifs_no,
+            "tarih": row.tarih,
+            "islem": row.islem,
+            "actor": row.actor,
+        }
+        for row in rows
+    ]
+    next_cursor = (
+        encode_cursor(rows[-1].tarih, rows[-1].id) if has_more and rows else None
+    )
+    return {"items": items, "next_cursor": next_cursor}
 
 
 @router.get("", response_class=HTMLResponse)
 def stock_list(request: Request, db: Session = Depends(get_db)):
-    logs = db.query(StockLog).order_by(StockLog.tarih.desc(), StockLog.id.desc()).all()
-    hardware_types = db.query(HardwareType).order_by(HardwareType.name).all()
-    license_names = db.query(LicenseName).order_by(LicenseName.name).all()
-    hardware_map = {str(h.id): h.name for h in hardware_types}
-    license_map = {
-        str(license_name.id): license_name.name for license_name in license_names
-    }
-    users = [
-        r[0]
-        for r in db.execute(
-            text("SELECT full_name FROM users ORDER BY full_name")
-        ).fetchall()
-    ]
-    usage_areas = db.query(UsageArea).order_by(UsageArea.name).all()
+    page = _stock_movements_page(db)
     return templates.TemplateResponse(
         "stock_list.html",
         {
             "request": request,
-            "logs": logs,
-            "hardware_types": hardware_types,
-            "hardware_map": hardware_map,
-            "license_map": license_map,
-            "users": users,
-            "usage_areas": usage_areas,
+            "logs": page["items"],
+            "next_cursor": page["next_cursor"],
         },
     )
 
 
+@api_router.get("/movements")
+def stock_movements(
+    limit: int = Query(MOVEMENT_PAGE_SIZE, ge=1, le=MOVEMENT_PAGE_MAX),
+    cursor: Optional[str] = None,
+    donanim_tipi: Optional[str] = None,
+    islem: Optional[str] = None,
+    actor: Optional[str] = None,
+    ifs_no: Optional[str] = None,
+    baslangic: Optional[date] = None,
+    bitis: Optional[date] = None,
+    db: Session = Depends(get_db),
+):
+    """Stok hareketlerinin bir sayfasını ve sonraki sayfanın imlecini döndür."""
+
+    return _stock_movements_page(
+        db,
+        limit=limit,
+        cursor=cursor,
+        donanim_tipi=donanim_tipi,
+        islem=islem,
+        actor=actor,
+        ifs_no=ifs_no,
+        baslangic=baslangic,
+        bitis=bitis,
+    )
+
+
 @router.get("/durum", response_class=HTMLResponse)
 def stock_status_page(request: Request):
     """Stok durumunu HTML olarak göster."""
@@ -202,7 +323,7 @@ def stock_status_json(db: Session = Depends(get_db)):
 
 
 @api_router.get("/status")
-def stock_status(db: Session = Depends(get_db)):
+def stock_status(db: Session = Depends(get_db), as_of: Optional[datetime] = None):
     """Stok durumunu detaylı biçimde döndür.
 
     Her satır donanım tipi, marka, model ve opsiyonel IFS numarasına göre
@@ -210,19 +331,27 @@ def stock_status(db: Session = Depends(get_db)):
     işlemlerinin toplamından "cikti", "hurda" ve "atama" işlemlerinin
     toplamının çıkarılmasıyla hesaplanır. Son işlem zaman damgası
     ``son_islem_ts`` alanında döner.
+
+    Sonuç stok, sistem odası veya referans verisi değişene kadar önbellekte
+    tutulur; dönen liste salt okunur kabul edilmelidir. ``as_of`` verildiğinde
+    o andaki stok, en yakın kontrol noktasından hesaplanarak döner.
     """
 
-    status = stock_status_detail(db)
-    hardware_map = {str(h.id): h.name for h in db.query(HardwareType).all()}
-    license_map = {
-        str(license_name.id): license_name.name
-        for license_name in db.query(LicenseName).all()
-    }
-    brand_map = {str(b.id): b.name for b in db.query(Brand).all()}
-    model_map = {str(m.id): m.name for m in db.query(Model).all()}
+    if as_of is not None:
+        return _stock_status(db, as_of)
+    return cached_snapshot(db, "stock_status", lambda: _stock_status(db))
+
 
+def _stock_status(
+    db: Session,
+    as_of: Optional[datetime] = None,
+    status: Optional[dict] = None,
+) -> list[dict]:
+    if status is None:
+        status = stock_status_detail(db, as_of)
+    refdata = get_refdata(db)
     license_value_candidates = {
-        (name or "").strip().lower() for name in license_map.values() if name
+        name.strip().lower() for name in refdata.licenses.names()
     }
 
     items = []
@@ -230,10 +359,12 @@ def stock_status(db: Session = Depends(get_db)):
         donanim = r["donanim_tipi"]
         item_type = (r.get("item_type") or "envanter").strip().lower()
 
-        if donanim in hardware_map:
-            donanim = hardware_map[donanim]
-        elif donanim in license_map:
-            donanim = license_map[donanim]
+        hardware_name = refdata.hardware.by_id.get(donanim)
+        license_name = refdata.licenses.by_id.get(donanim)
+        if hardware_name is not None:
+            donanim = hardware_name
+        elif license_name is not None:
+            donanim = license_name
             if item_type not in {"lisans", "yazici"}:
                 item_type = "lisans"
 
@@ -245,12 +376,12 @@ def stock_status(db: Session = Depends(get_db)):
             item_type = "lisans"
 
         marka = r.get("marka") or None
-        if marka and marka in brand_map:
-            marka = brand_map[marka]
+        if marka:
+            marka = refdata.brands.by_id.get(marka, marka)
 
         model = r.get("model") or None
-        if model and model in model_map:
-            model = model_map[model]
+        if model:
+            model = refdata.models.by_id.get(model, model)
 
         items.append(
             {
@@ -284,29 +415,20 @@ def stock_add(payload: dict = Body(...), db: Session = Depends(get_db)):
         donanim_tipi_raw = ""
     donanim_tipi = str(donanim_tipi_raw).strip()
 
+    refdata = get_refdata(db)
     if donanim_tipi and donanim_tipi.isdigit():
-        ht = db.get(HardwareType, int(donanim_tipi))
-        if ht:
-            donanim_tipi = ht.name
-        else:
-            ln = db.get(LicenseName, int(donanim_tipi))
-            if ln:
-                donanim_tipi = ln.name
+        donanim_tipi = refdata.type_name(donanim_tipi) or donanim_tipi
 
     if not donanim_tipi:
         return {"ok": False, "error": "Donanım tipi seçiniz"}
 
     marka = None if is_license else payload.get("marka")
     if marka and marka.isdigit():
-        b = db.get(Brand, int(marka))
-        if b:
-            marka = b.name
+        marka = refdata.brands.display(marka)
 
     model = None if is_license else payload.get("model")
     if model and model.isdigit():
-        m = db.get(Model, int(model))
-        if m:
-            model = m.name
+        model = refdata.models.display(model)
 
     if is_license:
         miktar = 1
@@ -567,6 +689,9 @@ def system_room_remove(
                 query = query.filter(column == value)
         removed += query.delete(synchronize_session=False)
 
+    if removed:
+        # Toplu silme ORM olaylarını tetiklemez; önbellek sürümünü elle artır.
+        touch(db, SYSTEM_ROOM)
     db.commit()
     return {"ok": True, "removed": removed}
 
@@ -634,6 +759,64 @@ def stock_assign_source_detail(
     return {"type": source_type, "data": data}
 
 
+class _StockKeyIndex:
+    """Kanonik ``(tip, marka, model, ifs)`` anahtarından stok satırına eşleme."""
+
+    def __init__(self, db: Session):
+        self.refdata = get_refdata(db)
+        self.items: dict[tuple[str, str, str, str], dict] = {}
+        for row in stock_status_detail(db)["items"]:
+            key = self.key(
+                row["donanim_tipi"],
+                row.get("marka"),
+                row.get("model"),
+                row.get("ifs_no"),
+            )
+            self.items.setdefault(key, row)
+
+    def key(self, donanim_tipi, marka, model, ifs_no) -> tuple[str, str, str, str]:
+        return (
+            self.refdata.types.canon(donanim_tipi),
+            self.refdata.brands.canon(marka),
+            self.refdata.models.canon(model),
+            str(ifs_no or "").strip().casefold(),
+        )
+
+
+def _find_stock_item(
+    db: Session, stock_id: str, donanim_tipi, marka, model, ifs_no
+) -> Optional[dict]:
+    """``stock_id`` ile eşleşen stok satırını bul.
+
+    ``/stock/options`` kimlikleri ``stock_balances.stock_key`` ile birebir
+    aynıdır; bu durumda tekil indeks üzerinden tek satır okunur.  Kimlik
+    farklı yazılmışsa (ID yerine ad, büyük/küçük harf) önbellekteki kanonik
+    anahtar indeksine bakılır.
+    """
+
+    if REQUIRED_LEDGER_COLUMNS <= get_available_columns(db):
+        balance = get_stock_balance(db, stock_id)
+        if balance is not None and balance["qty"] > 0:
+            return {**balance, "net": balance["qty"]}
+
+    index = cached_snapshot(db, "stock_key_index", lambda: _StockKeyIndex(db))
+    return index.items.get(index.key(donanim_tipi, marka, model, ifs_no))
+
+
+def _last_stock_log(db: Session, donanim_tipi, marka, model, ifs_no):
+    log_query = db.query(StockLog).filter(StockLog.donanim_tipi == donanim_tipi)
+    for column, value in (
+        (StockLog.marka, marka),
+        (StockLog.model, model),
+        (StockLog.ifs_no, ifs_no),
+    ):
+        if value:
+            log_query = log_query.filter(column == value)
+        else:
+            log_query = log_query.filter(column.is_(None))
+    return log_query.order_by(StockLog.tarih.desc(), StockLog.id.desc()).first()
+
+
 @router.post("/assign")
 def stock_assign(
     payload: AssignPayload,
@@ -657,69 +840,9 @@ def stock_assign(
     model_key = model_key or None
     ifs_no = ifs_no or None
 
-    def _build_lookup(model_cls):
-        lookup: dict[str, str] = {}
-        for row in db.query(model_cls).all():
-            name = getattr(row, "name", None)
-            if not name:
-                continue
-            lookup[str(row.id)] = str(name)
-        return lookup
-
-    def _build_reverse(mapping: dict[str, str]) -> dict[str, str]:
-        return {
-            str(value).strip().casefold(): key
-            for key, value in mapping.items()
-            if value
-        }
-
-    type_lookup = _build_lookup(HardwareType)
-    # Lisans adları da stok loglarında saklanabildiği için aynı sözlüğe ekle.
-    type_lookup.update(_build_lookup(LicenseName))
-    type_reverse = _build_reverse(type_lookup)
-    brand_lookup = _build_lookup(Brand)
-    brand_reverse = _build_reverse(brand_lookup)
-    model_lookup = _build_lookup(Model)
-    model_reverse = _build_reverse(model_lookup)
-
-    def _canon(
-        value,
-        lookup: Optional[dict[str, str]] = None,
-        reverse: Optional[dict[str, str]] = None,
-    ) -> str:
-        if value is None:
-            return ""
-        value_str = str(value).strip()
-        if not value_str:
-            return ""
-        if lookup:
-            mapped = lookup.get(value_str)
-            if mapped:
-                return str(mapped).strip().casefold()
-            if reverse:
-                alt_key = reverse.get(value_str.casefold())
-                if alt_key:
-                    mapped_alt = lookup.get(alt_key)
-                    if mapped_alt:
-                        return str(mapped_alt).strip().casefold()
-        return value_str.casefold()
-
-    target_type = _canon(donanim_tipi, type_lookup, type_reverse)
-    target_brand = _canon(marka_key, brand_lookup, brand_reverse)
-    target_model = _canon(model_key, model_lookup, model_reverse)
-    target_ifs = _canon(ifs_no)
-
-    status = stock_status_detail(db)
-    item = None
-    for r in status["items"]:
-        if (
-            _canon(r["donanim_tipi"], type_lookup, type_reverse) == target_type
-            and _canon(r.get("marka"), brand_lookup, brand_reverse) == target_brand
-            and _canon(r.get("model"), model_lookup, model_reverse) == target_model
-            and _canon(r.get("ifs_no")) == target_ifs
-        ):
-            item = r
-            break
+    item = _find_stock_item(
+        db, payload.stock_id, donanim_tipi, marka_key, model_key, ifs_no
+    )
 
     if not item:
         raise HTTPException(status_code=404, detail="Stok kaydı bulunamadı.")
@@ -754,20 +877,13 @@ def stock_assign(
             return value.isoformat()
         return value
 
-    log_query = db.query(StockLog).filter(StockLog.donanim_tipi == donanim_tipi)
-    if marka_key:
-        log_query = log_query.filter(StockLog.marka == marka_key)
-    else:
-        log_query = log_query.filter(StockLog.marka.is_(None))
-    if model_key:
-        log_query = log_query.filter(StockLog.model == model_key)
-    else:
-        log_query = log_query.filter(StockLog.model.is_(None))
-    if ifs_no:
-        log_query = log_query.filter(StockLog.ifs_no == ifs_no)
-    else:
-        log_query = log_query.filter(StockLog.ifs_no.is_(None))
-    last_log = log_query.order_by(StockLog.tarih.desc(), StockLog.id.desc()).first()
+    refdata = get_refdata(db)
+
+    last_log = None
+    if item.get("last_log_id"):
+        last_log = db.get(StockLog, item["last_log_id"])
+    if last_log is None:
+        last_log = _last_stock_log(db, donanim_tipi, marka_key, model_key, ifs_no)
 
     created_id: Optional[int] = None
     assignment_target: Optional[str] = None
@@ -801,17 +917,11 @@ def stock_assign(
             )
 
             if donanim_value and donanim_value.isdigit():
-                hw = db.get(HardwareType, int(donanim_value))
-                if hw:
-                    donanim_value = hw.name
+                donanim_value = refdata.hardware.display(donanim_value)
             if marka_value and marka_value.isdigit():
-                brand_obj = db.get(Brand, int(marka_value))
-                if brand_obj:
-                    marka_value = brand_obj.name
+                marka_value = refdata.brands.display(marka_value)
             if model_value and model_value.isdigit():
-                model_obj = db.get(Model, int(model_value))
-                if model_obj:
-                    model_value = model_obj.name
+                model_value = refdata.models.display(model_value)
 
             inv = Inventory(
                 no=form.envanter_no,
@@ -863,9 +973,7 @@ def stock_assign(
                 raise HTTPException(status_code=422, detail="Lisans bilgileri eksik.")
             lisans_adi = form.lisans_adi or donanim_tipi
             if lisans_adi and lisans_adi.isdigit():
-                lic_name = db.get(LicenseName, int(lisans_adi))
-                if lic_name:
-                    lisans_adi = lic_name.name
+                lisans_adi = refdata.licenses.display(lisans_adi)
 
             env = None
             if form.bagli_envanter_no:
@@ -923,13 +1031,9 @@ def stock_assign(
                 or (last_log.model if last_log else None)
             )
             if marka_value and marka_value.isdigit():
-                brand_obj = db.get(Brand, int(marka_value))
-                if brand_obj:
-                    marka_value = brand_obj.name
+                marka_value = refdata.brands.display(marka_value)
             if model_value and model_value.isdigit():
-                model_obj = db.get(Model, int(model_value))
-                if model_obj:
-                    model_value = model_obj.name
+                model_value = refdata.models.display(model_value)
 
             printer = Printer(
                 envanter_no=form.envanter_no,
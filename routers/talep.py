@@ -2,11 +2,11 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, conint
-from sqlalchemy import Integer, cast
 from sqlalchemy.orm import Session
 
 from database import get_db
-from models import Brand, HardwareType, Model, Talep, TalepTuru
+from models import Talep, TalepTuru
+from utils.refdata import get_refdata
 
 router = APIRouter(prefix="/api/talep", tags=["Talep"])
 
@@ -63,27 +63,16 @@ def talep_ekle(item: TalepIn, db: Session = Depends(get_db)):
 
 @router.get("/liste")
 def talep_liste(db: Session = Depends(get_db)):
-    q = (
-        db.query(
-            Talep,
-            HardwareType.name.label("donanim_tipi_name"),
-            Brand.name.label("marka_name"),
-            Model.name.label("model_name"),
-        )
-        .outerjoin(HardwareType, HardwareType.id == cast(Talep.donanim_tipi, Integer))
-        .outerjoin(Brand, Brand.id == cast(Talep.marka, Integer))
-        .outerjoin(Model, Model.id == cast(Talep.model, Integer))
-        .order_by(Talep.id.desc())
-    )
+    refdata = get_refdata(db)
     rows = []
-    for t, dt_name, marka_name, model_name in q.all():
+    for t in db.query(Talep).order_by(Talep.id.desc()).all():
         rows.append(
             {
                 "id": t.id,
                 "ifs_no": t.ifs_no,
-                "donanim_tipi": dt_name or t.donanim_tipi,
-                "marka": marka_name or t.marka,
-                "model": model_name or t.model,
+                "donanim_tipi": refdata.hardware.display(t.donanim_tipi),
+                "marka": refdata.brands.display(t.marka),
+                "model": refdata.models.display(t.model),
                 "miktar": t.miktar,
                 "karsilanan": t.karsilanan_miktar,
                 "kalan": t.kalan_miktar,
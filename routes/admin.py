@@ -1,6 +1,5 @@
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
@@ -8,10 +7,11 @@ import models
 from auth import hash_password
 from database import get_db
 from models import Connection, Lookup, Setting, User
-from security import SessionUser, current_user
+from security import SessionUser, current_user, invalidate_session_user
+from utils.normalize import contains_match
+from utils.templating import templates
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
-templates = Jinja2Templates(directory="templates")
 
 
 @router.get("", response_class=HTMLResponse, name="admin_index")
@@ -25,8 +25,9 @@ def admin_index(
     if q:
         like = f"%{q}%"
         filters = [User.username.ilike(like)]
-        if hasattr(User, "full_name"):
-            filters.append(User.full_name.ilike(like))
+        full_name = contains_match(User.full_name_norm, q)
+        if full_name is not None:
+            filters.append(full_name)
         if hasattr(User, "first_name"):
             filters.append(User.first_name.ilike(like))
         if hasattr(User, "last_name"):
@@ -213,6 +214,7 @@ def user_edit_post(
         u.password_hash = hash_password(password)
     db.add(u)
     db.commit()
+    invalidate_session_user(uid)
     return RedirectResponse(url="/admin#users", status_code=303)
 
 
@@ -231,6 +233,7 @@ def user_delete(
         raise HTTPException(403, "Adminler birbirini silemez")
     db.delete(target)
     db.commit()
+    invalidate_session_user(uid)
     return RedirectResponse(url="/admin#users", status_code=303)
 
 
@@ -2,17 +2,17 @@ from datetime import datetime
 from typing import Literal, Optional
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
-from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy import Integer, cast
+from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session
 
 from database import get_db
-from models import Brand, HardwareType, Model, Talep, TalepDurum, TalepTuru
+from models import Talep, TalepDurum, TalepTuru
+from utils.excel_export import iter_rows
 from utils.http import get_or_404, validate_adet
+from utils.refdata import get_refdata
 from utils.requests_export import export_requests_workbook
+from utils.templating import templates
 
-templates = Jinja2Templates(directory="templates")
 router = APIRouter(prefix="/talepler", tags=["Talepler"])
 
 
@@ -52,26 +52,17 @@ def liste(request: Request, durum: str = "acik", db: Session = Depends(get_db)):
         "iptal": TalepDurum.IPTAL,
     }
     selected = durum_map.get(durum, TalepDurum.ACIK)
-    q = (
-        db.query(
-            Talep,
-            HardwareType.name.label("dt_name"),
-            Brand.name.label("marka_name"),
-            Model.name.label("model_name"),
-        )
-        .outerjoin(HardwareType, HardwareType.id == cast(Talep.donanim_tipi, Integer))
-        .outerjoin(Brand, Brand.id == cast(Talep.marka, Integer))
-        .outerjoin(Model, Model.id == cast(Talep.model, Integer))
+    refdata = get_refdata(db)
+    rows = (
+        db.query(Talep)
         .filter(Talep.durum == selected)
         .order_by(Talep.ifs_no.asc(), Talep.id.asc())
+        .all()
     )
-
-    rows = []
-    for t, dt_name, marka_name, model_name in q.all():
-        t.donanim_tipi = dt_name or t.donanim_tipi
-        t.marka = marka_name or t.marka
-        t.model = model_name or t.model
-        rows.append(t)
+    for t in rows:
+        t.donanim_tipi = refdata.hardware.display(t.donanim_tipi)
+        t.marka = refdata.brands.display(t.marka)
+        t.model = refdata.models.display(t.model)
 
     return templates.TemplateResponse(
         "talepler.html",
@@ -248,7 +239,8 @@ def convert_request(
 
 @router.get("/export.xlsx", name="talep_export_excel")
 def export_excel(db: Session = Depends(get_db)):
-    rows = db.query(Talep).order_by(Talep.id.asc()).all()
+    rows = iter_rows(db.query(Talep).order_by(Talep.id.asc()))
+    refdata = get_refdata(db)
 
     headers = [
         "ID",
@@ -272,13 +264,13 @@ def export_excel(db: Session = Depends(get_db)):
         return [
             talep.id,
             str(talep.tur),
-            talep.donanim_tipi,
+            refdata.hardware.display(talep.donanim_tipi),
             talep.ifs_no,
             talep.miktar,
             talep.karsilanan_miktar,
             talep.kalan_miktar,
-            talep.marka,
-            talep.model,
+            refdata.brands.display(talep.marka),
+            refdata.models.display(talep.model),
             talep.envanter_no or talep.bagli_envanter_no,
             talep.lisans_adi,
             talep.sorumlu_personel,
@@ -288,3 +280,13 @@ def export_excel(db: Session = Depends(get_db)):
         ]
 
     return export_requests_workbook(rows, headers, build_row)
+
+
+@router.get("/{talep_id}", name="talep_detail")
+def detail(talep_id: int, db: Session = Depends(get_db)):
+    """Talebi, durumunun listesinde kendi satırında aç."""
+
+    talep = get_or_404(db, Talep, talep_id)
+    return RedirectResponse(
+        url=f"/talepler?durum={talep.durum.value}#talep-{talep.id}", status_code=303
+    )
@@ -0,0 +1,36 @@
+# scripts/archive_logs.py
+# Belirli bir yaştan eski envanter, lisans ve yazıcı kayıtlarını arşiv
+# veritabanına taşır. Zamanlanmış görev olarak çalıştırılabilir.
+# python -m scripts.archive_logs [--days 365]
+
+import argparse
+
+from database import SessionLocal
+from models import init_db
+from utils.log_archive import LOG_ARCHIVE_AFTER_DAYS, archive_old_logs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Eski envanter, lisans ve yazıcı kayıtlarını arşive taşı"
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=LOG_ARCHIVE_AFTER_DAYS,
+        help="bu kadar günden eski kayıtları taşı",
+    )
+    args = parser.parse_args(argv)
+
+    init_db()
+    db = SessionLocal()
+    try:
+        moved = archive_old_logs(db, older_than_days=args.days)
+    finally:
+        db.close()
+    for table, count in moved.items():
+        print(f"[✓] {table}: {count} kayıt arşivlendi")
+
+
+if __name__ == "__main__":
+    main()
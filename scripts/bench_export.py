@@ -0,0 +1,132 @@
+# scripts/bench_export.py
+# Excel dışa aktarımının büyük tablolarda süre/bellek ölçümü.
+# python -m scripts.bench_export [satir_sayisi]
+#
+# Geçici bir SQLite dosyasına sentetik yazıcı kayıtları yazar ve şu
+# yöntemleri karşılaştırır:
+#   eski     : tüm ORM nesnelerini .all() ile yükleyip normal openpyxl
+#              Workbook'a yazma, BytesIO'ya kaydetme
+#   akis     : utils.excel_export (yield_per + write-only + spool dosyası)
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from io import BytesIO
+
+from openpyxl import Workbook
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import models
+from utils.excel_export import iter_rows, write_workbook
+
+FIELDS = (
+    "id",
+    "envanter_no",
+    "marka",
+    "model",
+    "seri_no",
+    "fabrika",
+    "kullanim_alani",
+    "sorumlu_personel",
+    "ip_adresi",
+    "hostname",
+    "ifs_no",
+    "tarih",
+    "durum",
+)
+
+
+def _seed(engine, rows: int) -> None:
+    start = datetime(2020, 1, 1)
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        cur.executemany(
+            "INSERT INTO printers (envanter_no, marka, model, seri_no, fabrika,"
+            " kullanim_alani, sorumlu_personel, ip_adresi, hostname, ifs_no,"
+            " tarih, durum) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    f"ENV-{n:07d}",
+                    f"marka-{n % 25}",
+                    f"model-{n % 300}",
+                    f"SN{n:010d}",
+                    f"fabrika-{n % 8}",
+                    f"alan-{n % 40}",
+                    f"Personel {n % 900}",
+                    f"10.0.{n % 250}.{n % 200}",
+                    f"PRN-{n:07d}",
+                    f"IFS-{n % 5000}",
+                    (start + timedelta(minutes=n)).date(),
+                    "aktif",
+                )
+                for n in range(rows)
+            ),
+        )
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def _legacy(db) -> int:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(list(FIELDS))
+    for r in db.query(models.Printer).order_by(models.Printer.id.asc()).all():
+        ws.append([getattr(r, name) for name in FIELDS])
+    stream = BytesIO()
+    wb.save(stream)
+    return stream.tell()
+
+
+def _streaming(db) -> int:
+    query = db.query(*(getattr(models.Printer, name) for name in FIELDS)).order_by(
+        models.Printer.id.asc()
+    )
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+        write_workbook([("Yazıcılar", FIELDS, iter_rows(query))], spool)
+        return spool.tell()
+
+
+def _measure(label: str, fn) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<8} {elapsed:8.1f} s {peak / 1024 / 1024:10.1f} MiB"
+        f" {size / 1024 / 1024:8.1f} MiB dosya"
+    )
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    url = f"sqlite:///{path}"
+    engine = create_engine(url, **models.engine_kwargs_for_url(url))
+    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    try:
+        models.Base.metadata.create_all(engine)
+        print(f"[…] {rows} yazıcı kaydı yazılıyor")
+        _seed(engine, rows)
+
+        print(f"{'yöntem':<8} {'süre':>10} {'tepe bellek':>14} {'boyut':>13}")
+        with Session() as db:
+            _measure("eski", lambda: _legacy(db))
+        with Session() as db:
+            _measure("akis", lambda: _streaming(db))
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# scripts/bench_login_burst.py
+# Toplu giriş (vardiya değişimi) sırasında diğer isteklerin gecikmesi.
+# python -m scripts.bench_login_burst [--logins N] [--rounds R] [--probes P]
+#
+# Uygulama geçici bir SQLite dosyasıyla süreç içinde (tek worker, tek olay
+# döngüsü) çalıştırılır.  N kullanıcı aynı anda giriş yaparken ayrı bir
+# istemci sürekli "/" adresine istek atar; bu isteklerin gecikme dağılımı
+# iki şekilde ölçülür:
+#   bloklayan : bcrypt doğrulaması olay döngüsünde (eski davranış)
+#   havuz     : app.core.security'deki sınırlı parola havuzunda
+
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import tempfile
+import time
+
+_CSRF = re.compile(r'name="csrf_token" value="([^"]+)"')
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def _login(client, username: str) -> int:
+    page = await client.get("/login")
+    token = _CSRF.search(page.text).group(1)
+    response = await client.post(
+        "/login",
+        data={"username": username, "password": "parola", "csrf_token": token},
+    )
+    return response.status_code
+
+
+async def _burst(app, logins: int, probes: int) -> tuple[list[float], float, int]:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    clients = [
+        httpx.AsyncClient(transport=transport, base_url="http://bench")
+        for _ in range(logins)
+    ]
+    latencies: list[float] = []
+    done = asyncio.Event()
+
+    async def probe():
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+            while not done.is_set() or len(latencies) < probes:
+                started = time.perf_counter()
+                await c.get("/")
+                latencies.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.005)
+
+    started = time.perf_counter()
+    prober = asyncio.create_task(probe())
+    codes = await asyncio.gather(
+        *(_login(client, f"user{n}") for n, client in enumerate(clients))
+    )
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+    for client in clients:
+        await client.aclose()
+    return latencies, elapsed, sum(1 for code in codes if code == 303)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="toplu giriş gecikme kıyaslaması")
+    parser.add_argument("--logins", type=int, default=40, help="eşzamanlı giriş")
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt maliyeti")
+    parser.add_argument("--probes", type=int, default=50, help="en az ölçüm")
+    args = parser.parse_args(argv)
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+
+    import models
+    from app.core import security
+    from app.db.init import bootstrap_schema, init_db
+    from app.main import app
+    from app.web import router as web_router
+
+    async def blocking(plain, stored):
+        return security.pwd_context.verify_and_update(plain, stored)
+
+    try:
+        bootstrap_schema()
+        init_db()
+        stored = security.hash_password("parola")
+        with models.SessionLocal() as db:
+            db.add_all(
+                models.User(username=f"user{n}", password_hash=stored)
+                for n in range(args.logins)
+            )
+            db.commit()
+
+        print(
+            f"{'mod':<10} {'giriş':>6} {'süre sn':>8} {'p50 ms':>8} {'p99 ms':>8}"
+            f" {'maks ms':>8}"
+        )
+        for label, verify in (
+            ("bloklayan", blocking),
+            ("havuz", security.verify_and_update_password),
+        ):
+            web_router.verify_and_update_password = verify
+            latencies, elapsed, ok = asyncio.run(
+                _burst(app, args.logins, args.probes)
+            )
+            print(
+                f"{label:<10} {ok:>6} {elapsed:8.2f}"
+                f" {statistics.median(latencies):8.1f}"
+                f" {_percentile(latencies, 99):8.1f} {max(latencies):8.1f}"
+            )
+    finally:
+        models.engine.dispose()
+        models.read_engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# scripts/bench_read_pool.py
+# Eşzamanlı okuma/yazma yükünde tek motor ile ayrı okuma motorunun karşılaştırması.
+# python -m scripts.bench_read_pool [--rows N] [--seconds S] [--readers R] [--writers W]
+#
+# Her senaryo için geçici bir SQLite dosyası hazırlanır; okuyucu iş
+# parçacıkları envanter tablosunun tamamını (dışa aktarma/rapor gibi)
+# okurken yazıcılar tek tek envanter ekler.  Karşılaştırılanlar:
+#   tek     : varsayılan ayarlı tek motor (rollback journal), herkes aynı havuzda
+#   ayri    : models.create_app_engine ile WAL'lı yazma motoru + salt okunur
+#             okuma motoru (busy_timeout, mmap_size, query_only)
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+import models
+
+
+def _seed(engine, rows: int) -> None:
+    models.Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(models.Inventory.__table__),
+            [
+                {
+                    "no": f"BENCH-{n}",
+                    "fabrika": f"Fabrika {n % 7}",
+                    "departman": f"Departman {n % 13}",
+                    "marka": f"Marka {n % 25}",
+                    "model": f"Model {n % 300}",
+                    "sorumlu_personel": f"Personel {n % 500}",
+                    "durum": "aktif",
+                }
+                for n in range(rows)
+            ],
+        )
+
+
+def _worker(stop, counts, key, fn) -> None:
+    while not stop.is_set():
+        try:
+            fn()
+            counts[key] += 1
+        except OperationalError:
+            counts["hata"] += 1
+
+
+def _scenario(label, write_engine, read_engine, args) -> None:
+    WriteSession = sessionmaker(bind=write_engine, autoflush=False)
+    ReadSession = sessionmaker(bind=read_engine, autoflush=False)
+    table = models.Inventory.__table__
+    sequence = iter(range(10**9))
+
+    def read():
+        with ReadSession() as db:
+            db.execute(select(table)).all()
+
+    def write():
+        with WriteSession() as db:
+            db.execute(insert(table).values(no=f"W-{next(sequence)}", durum="aktif"))
+            db.commit()
+
+    counts = {"okuma": 0, "yazma": 0, "hata": 0}
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=_worker, args=(stop, counts, "okuma", read))
+        for _ in range(args.readers)
+    ] + [
+        threading.Thread(target=_worker, args=(stop, counts, "yazma", write))
+        for _ in range(args.writers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    reads = counts["okuma"] / args.seconds
+    writes = counts["yazma"] / args.seconds
+    print(f"{label:<6} {reads:10.1f} {writes:10.1f} {counts['hata']:8d}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="okuma motoru kıyaslaması")
+    parser.add_argument("--rows", type=int, default=50_000, help="envanter satırı")
+    parser.add_argument("--seconds", type=float, default=10.0, help="senaryo süresi")
+    parser.add_argument("--readers", type=int, default=4, help="okuyucu sayısı")
+    parser.add_argument("--writers", type=int, default=2, help="yazıcı sayısı")
+    args = parser.parse_args(argv)
+
+    print(f"{'motor':<6} {'okuma/sn':>10} {'yazma/sn':>10} {'hata':>8}")
+    for label in ("tek", "ayri"):
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        url = f"sqlite:///{path}"
+        if label == "tek":
+            write_engine = create_engine(url, **models.engine_kwargs_for_url(url))
+            read_engine = write_engine
+        else:
+            write_engine = models.create_app_engine(url)
+            read_engine = models.create_app_engine(url, read_only=True)
+        try:
+            _seed(write_engine, args.rows)
+            _scenario(label, write_engine, read_engine, args)
+        finally:
+            write_engine.dispose()
+            read_engine.dispose()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# scripts/bench_startup.py
+# Büyük bir veritabanında uygulama açılışının şema taramasına harcadığı süre.
+# python -m scripts.bench_startup [--rows N] [--runs R]
+#
+# Geçici bir SQLite dosyası stok hareketleri ve envanterle doldurulur, şema
+# bir kez kurulur ve ardından açılıştaki bootstrap_schema + init_db çağrıları
+# iki şekilde ölçülür:
+#   tarama : init_db(force=True) ile tüm tabloların incelenip göç/backfill
+#            adımlarının yeniden çalıştırılması (parmak izi öncesi davranış)
+#   hizli  : kayıtlı şema parmak izi eşleştiği için taramanın atlanması
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def _seed(models, rows: int) -> None:
+    from sqlalchemy import insert
+
+    models.Base.metadata.create_all(models.engine)
+    start = datetime(2020, 1, 1)
+    with models.engine.begin() as conn:
+        conn.execute(
+            insert(models.Inventory.__table__),
+            [
+                {
+                    "no": f"BENCH-{n}",
+                    "fabrika": f"Fabrika {n % 7}",
+                    "departman": f"Departman {n % 13}",
+                    "marka": f"Marka {n % 25}",
+                    "durum": "aktif",
+                }
+                for n in range(rows // 10)
+            ],
+        )
+        conn.execute(
+            insert(models.StockLog.__table__),
+            [
+                {
+                    "donanim_tipi": f"Tip {n % 40}",
+                    "marka": f"Marka {n % 25}",
+                    "miktar": 1 + n % 5,
+                    "islem": "girdi" if n % 3 else "cikti",
+                    "tarih": start + timedelta(minutes=n),
+                }
+                for n in range(rows)
+            ],
+        )
+
+
+def _measure(fn, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="açılış şema taraması kıyaslaması")
+    parser.add_argument("--rows", type=int, default=200_000, help="stok hareketi")
+    parser.add_argument("--runs", type=int, default=5, help="ölçüm tekrarı")
+    args = parser.parse_args(argv)
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    import models
+    from app.db.init import bootstrap_schema, init_db
+
+    try:
+        _seed(models, args.rows)
+        bootstrap_schema()
+        init_db()
+
+        def sweep():
+            bootstrap_schema()
+            init_db(force=True)
+
+        def fast():
+            bootstrap_schema()
+            init_db()
+
+        print(f"{'açılış':<8} {'medyan ms':>10}")
+        print(f"{'tarama':<8} {_measure(sweep, args.runs):10.1f}")
+        print(f"{'hizli':<8} {_measure(fast, args.runs):10.1f}")
+    finally:
+        models.engine.dispose()
+        models.read_engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
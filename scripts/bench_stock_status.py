@@ -0,0 +1,150 @@
+# scripts/bench_stock_status.py
+# Stok durumu hesaplamasının büyük defterlerde süre/bellek ölçümü.
+# python -m scripts.bench_stock_status [satir_sayisi] [kalem_sayisi]
+#
+# Geçici bir SQLite dosyasına sentetik stock_logs satırları yazar ve şu
+# yöntemleri karşılaştırır:
+#   eski     : GROUP BY + tüm defteri sıralı okuyup Python sözlüğünde ilk
+#              kaydı tutma (önceki stock_status_detail davranışı)
+#   pencere  : utils.stock_balance.ledger_balances (ROW_NUMBER/SUM OVER)
+#   bakiye   : utils.stock_balance.read_stock_balances (stock_balances)
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+import models
+from utils.stock_balance import (
+    ledger_balances,
+    read_stock_balances,
+    rebuild_stock_balances,
+)
+
+COLUMNS = {col.name for col in models.StockLog.__table__.columns}
+
+
+def _seed(engine, rows: int, items: int) -> None:
+    rnd = random.Random(42)
+    start = datetime(2020, 1, 1)
+    keys = [
+        (f"tip-{i % 40}", f"marka-{i % 25}", f"model-{i}", f"IFS-{i}")
+        for i in range(items)
+    ]
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        batch = []
+        for n in range(rows):
+            donanim, marka, model, ifs = keys[rnd.randrange(items)]
+            islem = "girdi" if rnd.random() < 0.6 else "cikti"
+            batch.append(
+                (
+                    donanim,
+                    marka,
+                    model,
+                    ifs,
+                    rnd.randint(1, 5),
+                    islem,
+                    start + timedelta(seconds=n * 7),
+                    "bench",
+                    rnd.choice(["envanter", "lisans", "talep:yazici", None]),
+                    rnd.randint(1, 10_000),
+                )
+            )
+            if len(batch) >= 50_000:
+                cur.executemany(
+                    "INSERT INTO stock_logs (donanim_tipi, marka, model, ifs_no,"
+                    " miktar, islem, tarih, actor, source_type, source_id)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    batch,
+                )
+                batch.clear()
+        if batch:
+            cur.executemany(
+                "INSERT INTO stock_logs (donanim_tipi, marka, model, ifs_no,"
+                " miktar, islem, tarih, actor, source_type, source_id)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def _legacy(db):
+    log = models.StockLog
+    keys = [log.donanim_tipi, log.marka, log.model, log.ifs_no]
+    totals = (
+        db.query(
+            *keys,
+            func.sum(
+                case((log.islem == "girdi", log.miktar), else_=-log.miktar)
+            ).label("qty"),
+            func.max(log.tarih),
+        )
+        .group_by(*keys)
+        .all()
+    )
+    last_source = {}
+    for r in (
+        db.query(*keys, log.source_type, log.source_id, log.tarih, log.id)
+        .order_by(*keys, log.tarih.desc(), log.id.desc())
+        .all()
+    ):
+        key = (r.donanim_tipi, r.marka, r.model, r.ifs_no)
+        if key not in last_source:
+            last_source[key] = (r.source_type, r.source_id)
+    return [(t, last_source.get(tuple(t[:4]))) for t in totals]
+
+
+def _measure(label: str, fn) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<8} {elapsed * 1000:10.1f} ms {peak / 1024 / 1024:10.1f} MiB"
+        f" {len(result):8d} kalem"
+    )
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    items = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    url = f"sqlite:///{path}"
+    engine = create_engine(url, **models.engine_kwargs_for_url(url))
+    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    try:
+        models.Base.metadata.create_all(engine)
+        print(f"[…] {rows} hareket / {items} kalem yazılıyor")
+        _seed(engine, rows, items)
+        with Session() as db:
+            rebuild_stock_balances(db, COLUMNS)
+            db.commit()
+
+        print(f"{'yöntem':<8} {'süre':>13} {'tepe bellek':>14} {'sonuç':>14}")
+        with Session() as db:
+            _measure("eski", lambda: _legacy(db))
+        with Session() as db:
+            _measure("pencere", lambda: ledger_balances(db, COLUMNS))
+        with Session() as db:
+            _measure("bakiye", lambda: read_stock_balances(db))
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+# scripts/rebuild_search_index.py
+# Tam metin arama dizinini (search_index) tüm kayıtlardan yeniden oluşturur.
+# Toplu içe aktarmalardan veya ORM dışı yazımlardan sonra çalıştırılabilir.
+# python -m scripts.rebuild_search_index
+
+from database import SessionLocal
+from models import init_db
+from utils.search_index import rebuild_search_index
+
+
+def main():
+    init_db()
+    db = SessionLocal()
+    try:
+        counts = rebuild_search_index(db)
+        db.commit()
+    finally:
+        db.close()
+    for entity_type, count in counts.items():
+        print(f"[✓] {entity_type}: {count} kayıt dizinlendi")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+# scripts/rebuild_stock_balances.py
+# stock_balances tablosunu stock_logs defterinden baştan hesaplar.
+# python -m scripts.rebuild_stock_balances
+
+from database import SessionLocal
+from models import init_db
+from utils.stock_balance import rebuild_stock_balances
+from utils.stock_log import get_available_columns
+
+
+def main():
+    init_db()
+    db = SessionLocal()
+    try:
+        count = rebuild_stock_balances(db, get_available_columns(db))
+        db.commit()
+        print(f"[✓] stock_balances yeniden oluşturuldu: {count} kayıt")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
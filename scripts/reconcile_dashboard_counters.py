@@ -0,0 +1,25 @@
+# scripts/reconcile_dashboard_counters.py
+# dashboard_counters tablosunu kaynak tablolardan yeniden sayar.
+# Zamanlanmış görev olarak çalıştırılabilir; sapmaları raporlar.
+# python -m scripts.reconcile_dashboard_counters
+
+from database import SessionLocal
+from models import init_db
+from utils.dashboard_counters import reconcile_counters
+
+
+def main():
+    init_db()
+    db = SessionLocal()
+    try:
+        drift = reconcile_counters(db)
+        db.commit()
+    finally:
+        db.close()
+    for name, (old, new) in sorted(drift.items()):
+        print(f"[!] {name}: {old} -> {new}")
+    print(f"[✓] Dashboard sayaçları güncellendi ({len(drift)} sapma)")
+
+
+if __name__ == "__main__":
+    main()
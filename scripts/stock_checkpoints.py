@@ -0,0 +1,25 @@
+# scripts/stock_checkpoints.py
+# Eksik aylık stok kontrol noktalarını (ay başı bakiyeleri) oluşturur.
+# Zamanlanmış görev olarak çalıştırılabilir; yalnızca eksik ayları hesaplar.
+# python -m scripts.stock_checkpoints
+
+from database import SessionLocal
+from models import init_db
+from utils.stock_checkpoint import ensure_monthly_checkpoints
+
+
+def main():
+    init_db()
+    db = SessionLocal()
+    try:
+        created = ensure_monthly_checkpoints(db)
+        db.commit()
+        for checkpoint in created:
+            print(f"[✓] Kontrol noktası: {checkpoint.taken_at:%Y-%m-%d}")
+        print(f"[✓] {len(created)} yeni kontrol noktası oluşturuldu")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
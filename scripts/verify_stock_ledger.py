@@ -0,0 +1,63 @@
+# scripts/verify_stock_ledger.py
+# stock_totals ve stock_balances tablolarını stock_logs defteriyle karşılaştırır.
+# Farklar bulunursa çıkış kodu 1 olur; --repair ile farklı satırlar düzeltilir.
+# python -m scripts.verify_stock_ledger [--repair]
+
+import argparse
+import sys
+import time
+
+from database import SessionLocal
+from models import init_db
+from utils.stock_integrity import verify_stock_ledger
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Stok tablolarını stock_logs defteriyle doğrula"
+    )
+    parser.add_argument(
+        "--repair", action="store_true", help="farklı satırları defterden düzelt"
+    )
+    args = parser.parse_args(argv)
+
+    init_db()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        report = verify_stock_ledger(db, repair=args.repair)
+        if report.repaired:
+            db.commit()
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+
+    print(
+        f"[i] {report.keys_checked} stok anahtarı, {report.types_checked} donanım"
+        f" tipi {elapsed:.2f} sn'de kontrol edildi"
+    )
+    for issue in report.totals:
+        print(
+            f"[!] stock_totals {issue['donanim_tipi']}: beklenen"
+            f" {issue['beklenen']}, mevcut {issue['mevcut']}"
+        )
+    for issue in report.balances:
+        print(f"[!] stock_balances {issue['stock_key']}: {issue['sorun']}")
+    if report.ok:
+        print("[✓] Stok tabloları defterle uyumlu")
+        return 0
+    if report.repaired:
+        print(
+            f"[✓] {report.total_issues} toplam ve {report.balance_issues} bakiye"
+            " farkı düzeltildi"
+        )
+        return 0
+    print(
+        f"[✗] {report.total_issues} toplam ve {report.balance_issues} bakiye farkı"
+        " bulundu (--repair ile düzeltin)"
+    )
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,16 @@
 # security.py
+import os
+import threading
+import time
 from dataclasses import dataclass, field
 
 from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from auth import get_user_by_id
 from database import get_db
+from models import Base
 
 
 @dataclass
@@ -21,6 +26,42 @@ class SessionUser:
             self.full_name = self.username
 
 
+# current_user neredeyse her router'a bağlı; bir sayfanın AJAX çağrıları aynı
+# kullanıcıyı tekrar tekrar okumasın diye SessionUser kısa süre saklanır.
+# Kullanıcıyı değiştiren yollar invalidate_session_user çağırır; süre ise diğer
+# worker süreçlerindeki değişikliklerin en geç ne zaman görüleceğini belirler.
+# Önbellekteki nesneler istekler arasında paylaşılır, değiştirilmemelidir.
+SESSION_USER_TTL = float(os.getenv("SESSION_USER_TTL", "30"))
+
+_lock = threading.Lock()
+_session_users: dict[int, tuple[float, SessionUser]] = {}
+_stats = {"hits": 0, "misses": 0}
+
+
+def invalidate_session_user(user_id: int | None = None) -> None:
+    """Drop the cached ``SessionUser`` of ``user_id`` (or of every user)."""
+
+    with _lock:
+        if user_id is None:
+            _session_users.clear()
+        else:
+            _session_users.pop(int(user_id), None)
+
+
+@event.listens_for(Base.metadata, "after_create")
+@event.listens_for(Base.metadata, "after_drop")
+def _schema_changed(target, connection, **kw) -> None:
+    # Yeniden oluşturulan tablolarda kullanıcı id'leri baştan başlar.
+    invalidate_session_user()
+
+
+def session_user_stats() -> dict[str, int]:
+    """Return cache hit/miss counters."""
+
+    with _lock:
+        return dict(_stats)
+
+
 def current_user(request: Request, db: Session = Depends(get_db)) -> SessionUser:
     user_id = request.session.get("user_id")
     if not user_id:
@@ -28,18 +69,32 @@ def current_user(request: Request, db: Session = Depends(get_db)) -> SessionUser
         raise HTTPException(
             status_code=status.HTTP_303_SEE_OTHER, detail="redirect:/login"
         )
-    u = get_user_by_id(db, int(user_id))
+    user_id = int(user_id)
+    now = time.monotonic()
+    with _lock:
+        cached = _session_users.get(user_id)
+        if cached is not None and cached[0] > now:
+            _stats["hits"] += 1
+            return cached[1]
+        _stats["misses"] += 1
+
+    u = get_user_by_id(db, user_id)
     if not u:
+        invalidate_session_user(user_id)
         raise HTTPException(
             status_code=status.HTTP_303_SEE_OTHER, detail="redirect:/login"
         )
-    return SessionUser(
+    session_user = SessionUser(
         u.id,
         u.username,
         getattr(u, "role", "admin"),
         u.full_name,
         getattr(u, "email", None),
     )
+    if SESSION_USER_TTL > 0:
+        with _lock:
+            _session_users[user_id] = (now + SESSION_USER_TTL, session_user)
+    return session_user
 
 
 def require_roles(*roles: str):
@@ -1,38 +1,154 @@
-// Simple search & action filtering for logs page
+// Kayıtlar sayfası: sunucu tarafı filtreleme ve imleçli sayfalama
 (function () {
-  function setupFilter(inputId, tableSelector, selectId, dataAttr) {
-    const input = document.getElementById(inputId);
-    const select = document.getElementById(selectId);
-    if (!input && !select) return;
-    const rows = document.querySelectorAll(`${tableSelector} tbody tr`);
-
-    function apply() {
-      const q = input ? input.value.toLowerCase() : "";
-      const selVal = select ? select.value : "";
-      rows.forEach((row) => {
-        const text = row.textContent.toLowerCase();
-        let attrVal = "";
-        if (select && dataAttr) {
-          const cell = row.querySelector(`[${dataAttr}]`);
-          attrVal = cell ? cell.getAttribute(dataAttr) : "";
-        }
-        const matchText = !q || text.includes(q);
-        const matchSelect = !selVal || attrVal === selVal;
-        row.classList.toggle("d-none", !(matchText && matchSelect));
-      });
+  const ISLEM_MAP = {
+    assign: "Atama",
+    edit: "Düzenleme",
+    scrap: "Hurdaya Ayır",
+  };
+  const state = { cursor: "", loading: false, filterTimer: null, seq: 0 };
+
+  function escapeHtml(value) {
+    return String(value ?? "").replace(
+      /[&<>"']/g,
+      (ch) =>
+        ({
+          "&": "&amp;",
+          "<": "&lt;",
+          ">": "&gt;",
+          '"': "&quot;",
+          "'": "&#39;",
+        })[ch],
+    );
+  }
+
+  function formatTimestamp(value) {
+    if (!value) return "";
+    const date = new Date(value);
+    if (Number.isNaN(date.getTime())) return "";
+    return date.toLocaleString("tr-TR", {
+      day: "2-digit",
+      month: "2-digit",
+      year: "numeric",
+      hour: "2-digit",
+      minute: "2-digit",
+      second: "2-digit",
+      hour12: false,
+    });
+  }
+
+  function formatFields(data) {
+    const entries = Object.entries(data || {});
+    if (!entries.length) return "Yok";
+    return entries
+      .map(([key, value]) => {
+        const label = key.replace(/_/g, " ");
+        const title = label.charAt(0).toUpperCase() + label.slice(1).toLowerCase();
+        return `<div><strong>${escapeHtml(title)}:</strong> ${escapeHtml(value)}</div>`;
+      })
+      .join("");
+  }
+
+  function createRow(item, layout) {
+    const action = escapeHtml(ISLEM_MAP[item.action] || item.action);
+    if (layout === "kullanici") {
+      return `<tr>
+        <td>${escapeHtml(item.actor)}</td>
+        <td>${action}</td>
+        <td>${escapeHtml(item.inventory_no)}</td>
+        <td>${formatTimestamp(item.created_at)}</td>
+      </tr>`;
     }
+    return `<tr>
+      <td>${escapeHtml(item.inventory_no)}</td>
+      <td>${action}</td>
+      <td>${formatFields(item.before)}</td>
+      <td>${formatFields(item.after)}</td>
+      <td>${escapeHtml(item.actor)}</td>
+      <td>${formatTimestamp(item.created_at)}</td>
+    </tr>`;
+  }
+
+  function currentFilters() {
+    const params = new URLSearchParams();
+    const form = document.getElementById("logFilters");
+    if (!form) return params;
+    new FormData(form).forEach((value, key) => {
+      const text = String(value || "").trim();
+      if (text) params.set(key, text);
+    });
+    return params;
+  }
+
+  function setStatus(text) {
+    const el = document.getElementById("logsMore");
+    if (el) el.textContent = text;
+  }
 
-    if (input) input.addEventListener("input", apply);
-    if (select) select.addEventListener("change", apply);
+  function sentinelVisible() {
+    const el = document.getElementById("logsMore");
+    if (!el || !el.offsetParent) return false;
+    return el.getBoundingClientRect().top < window.innerHeight;
+  }
+
+  async function loadPage(tbody, { reset = false } = {}) {
+    if (!reset && (state.loading || !state.cursor)) return;
+    // Filtre değişince önceki isteğin yanıtı yok sayılır.
+    const seq = ++state.seq;
+    state.loading = true;
+    setStatus("Yükleniyor…");
+    const params = currentFilters();
+    if (!reset) params.set("cursor", state.cursor);
+    try {
+      const res = await fetch(`${tbody.dataset.url}?${params}`, {
+        credentials: "same-origin",
+        headers: { Accept: "application/json" },
+      });
+      const data = await res.json().catch(() => ({}));
+      if (seq !== state.seq) return;
+      if (!res.ok) throw new Error(data.detail || "Kayıtlar yüklenemedi");
+      const rows = (data.items || [])
+        .map((item) => createRow(item, tbody.dataset.layout))
+        .join("");
+      if (reset) {
+        tbody.innerHTML = rows;
+      } else {
+        tbody.insertAdjacentHTML("beforeend", rows);
+      }
+      state.cursor = data.next_cursor || "";
+      setStatus(tbody.children.length === 0 ? "Kayıt yok" : "");
+    } catch (err) {
+      if (seq !== state.seq) return;
+      console.error("logs load failed", err);
+      setStatus(err.message || "Kayıtlar yüklenemedi");
+      return;
+    } finally {
+      if (seq === state.seq) state.loading = false;
+    }
+    // Sayfa ekranı doldurmadıysa gözlemci yeniden tetiklenmez.
+    if (sentinelVisible()) loadPage(tbody);
   }
 
   document.addEventListener("DOMContentLoaded", () => {
-    setupFilter("searchUserLogs", "#userlogs", "filterUserName", "data-user");
-    setupFilter(
-      "searchInventoryLogs",
-      "#inventorylogs",
-      "filterInventoryNo",
-      "data-inv",
-    );
+    const tbody = document.querySelector("#userlogs tbody, #inventorylogs tbody");
+    if (!tbody) return;
+    state.cursor = tbody.dataset.nextCursor || "";
+
+    const form = document.getElementById("logFilters");
+    form?.addEventListener("input", () => {
+      clearTimeout(state.filterTimer);
+      state.filterTimer = setTimeout(() => loadPage(tbody, { reset: true }), 300);
+    });
+    form?.addEventListener("submit", (event) => {
+      event.preventDefault();
+      clearTimeout(state.filterTimer);
+      loadPage(tbody, { reset: true });
+    });
+
+    const sentinel = document.getElementById("logsMore");
+    if (sentinel && "IntersectionObserver" in window) {
+      new IntersectionObserver((entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) loadPage(tbody);
+      }).observe(sentinel);
+    }
   });
 })();
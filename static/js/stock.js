@@ -1716,6 +1716,202 @@
     };
   })();
 
+  // ---------------------------------------------------------------------------
+  // Stok hareketleri (imleçli sayfalama)
+  // ---------------------------------------------------------------------------
+  const StockMovements = (() => {
+    const MOVEMENTS_URL = `${API_ROOT_META}/stock/movements`;
+    const ISLEM_BADGES = {
+      girdi: '<span class="badge text-bg-success">Girdi</span>',
+      cikti: '<span class="badge text-bg-warning">Çıktı</span>',
+    };
+    const state = { cursor: "", loading: false, seq: 0, filterTimer: null };
+
+    function escapeHtml(value) {
+      return String(value ?? "").replace(
+        /[&<>"']/g,
+        (ch) =>
+          ({
+            "&": "&amp;",
+            "<": "&lt;",
+            ">": "&gt;",
+            '"': "&quot;",
+            "'": "&#39;",
+          })[ch],
+      );
+    }
+
+    function formatTimestamp(value) {
+      if (!value) return "-";
+      const date = new Date(value);
+      if (Number.isNaN(date.getTime())) return "-";
+      return date.toLocaleString("tr-TR", {
+        day: "2-digit",
+        month: "2-digit",
+        year: "numeric",
+        hour: "2-digit",
+        minute: "2-digit",
+        hour12: false,
+      });
+    }
+
+    function createRow(item) {
+      const badge =
+        ISLEM_BADGES[item.islem] ||
+        '<span class="badge text-bg-secondary">Atama</span>';
+      return `<tr>
+        <td>#${escapeHtml(item.id)}</td>
+        <td>${escapeHtml(item.donanim_tipi)}</td>
+        <td>${escapeHtml(item.miktar)}</td>
+        <td>${escapeHtml(item.ifs_no || "-")}</td>
+        <td>${formatTimestamp(item.tarih)}</td>
+        <td>${badge}</td>
+        <td>${escapeHtml(item.actor || "-")}</td>
+      </tr>`;
+    }
+
+    function currentFilters() {
+      const params = new URLSearchParams();
+      const form = dom.one("#stockMovementFilters");
+      if (!form) return params;
+      new FormData(form).forEach((value, key) => {
+        const text = String(value || "").trim();
+        if (text) params.set(key, text);
+      });
+      return params;
+    }
+
+    function setStatus(text) {
+      const el = dom.one("#stockMovementsMore");
+      if (el) el.textContent = text;
+    }
+
+    async function loadPage({ reset = false } = {}) {
+      const tbody = dom.one("#tblStockMovements tbody");
+      if (!tbody) return;
+      if (!reset && (state.loading || !state.cursor)) return;
+      // Filtre değişince önceki isteğin yanıtı yok sayılır.
+      const seq = ++state.seq;
+      state.loading = true;
+      setStatus("Yükleniyor…");
+      const params = currentFilters();
+      if (!reset) params.set("cursor", state.cursor);
+      try {
+        const data = await http.getJson(`${MOVEMENTS_URL}?${params}`, {
+          credentials: "same-origin",
+        });
+        if (seq !== state.seq) return;
+        const rows = (data.items || []).map(createRow).join("");
+        if (reset) {
+          tbody.innerHTML = rows;
+        } else {
+          tbody.insertAdjacentHTML("beforeend", rows);
+        }
+        state.cursor = data.next_cursor || "";
+        setStatus(tbody.children.length === 0 ? "Kayıt bulunamadı" : "");
+      } catch (err) {
+        if (seq !== state.seq) return;
+        console.error("stock movements load failed", err);
+        setStatus(err.message || "Hareketler yüklenemedi");
+        return;
+      } finally {
+        if (seq === state.seq) state.loading = false;
+      }
+      // Sayfa ekranı doldurmadıysa gözlemci yeniden tetiklenmez.
+      if (sentinelVisible()) loadPage();
+    }
+
+    function sentinelVisible() {
+      const el = dom.one("#stockMovementsMore");
+      if (!el || !el.offsetParent) return false;
+      return el.getBoundingClientRect().top < window.innerHeight;
+    }
+
+    function scheduleReload() {
+      clearTimeout(state.filterTimer);
+      state.filterTimer = setTimeout(() => loadPage({ reset: true }), 300);
+    }
+
+    function init() {
+      const tbody = dom.one("#tblStockMovements tbody");
+      if (!tbody) return;
+      state.cursor = tbody.dataset.nextCursor || "";
+
+      const form = dom.one("#stockMovementFilters");
+      form?.addEventListener("input", scheduleReload);
+      form?.addEventListener("submit", (event) => {
+        event.preventDefault();
+        loadPage({ reset: true });
+      });
+
+      const sentinel = dom.one("#stockMovementsMore");
+      if (sentinel && "IntersectionObserver" in window) {
+        new IntersectionObserver((entries) => {
+          if (entries.some((entry) => entry.isIntersecting)) loadPage();
+        }).observe(sentinel);
+      }
+    }
+
+    return { init };
+  })();
+
+  // ---------------------------------------------------------------------------
+  // Toplu içe aktarma (önce deneme, onaydan sonra kayıt)
+  // ---------------------------------------------------------------------------
+  const StockImport = (() => {
+    function summarize(report) {
+      const lines = [
+        `Toplam satır: ${report.toplam}`,
+        `Aktarılabilir: ${report.aktarilan}`,
+        `Hatalı: ${report.hatali}`,
+      ];
+      (report.hatalar || []).slice(0, 10).forEach((err) => {
+        lines.push(`  Satır ${err.satir}: ${err.hata}`);
+      });
+      if (report.hatali > 10) lines.push("  …");
+      return lines.join("\n");
+    }
+
+    async function upload(form, dryRun) {
+      const data = new FormData(form);
+      data.set("dry_run", dryRun ? "true" : "false");
+      return http.requestJson(form.action, {
+        method: "POST",
+        body: data,
+        credentials: "same-origin",
+      });
+    }
+
+    async function handleChange(event) {
+      const input = event.target;
+      const form = input.form;
+      if (!form || !input.files?.length) return;
+      try {
+        const preview = await upload(form, true);
+        if (!preview.aktarilan) {
+          alert(`İçe aktarılacak geçerli satır yok.\n\n${summarize(preview)}`);
+          return;
+        }
+        if (!confirm(`${summarize(preview)}\n\nGeçerli satırlar kaydedilsin mi?`)) {
+          return;
+        }
+        const result = await upload(form, false);
+        alert(`${result.aktarilan} satır içe aktarıldı.`);
+        window.location.reload();
+      } catch (err) {
+        alert(err.message || "İçe aktarma başarısız");
+      } finally {
+        input.value = "";
+      }
+    }
+
+    function init() {
+      dom.one("#stockExcel")?.addEventListener("change", handleChange);
+    }
+
+    return { init };
+  })();
+
   // ---------------------------------------------------------------------------
   // Başlat
   // ---------------------------------------------------------------------------
@@ -1764,6 +1960,8 @@
   document.addEventListener("DOMContentLoaded", () => {
     StockAddForm.init();
     StockAssign.init();
+    StockMovements.init();
+    StockImport.init();
     applyInitialTabSelection();
     StockAssign.refreshStockStatus();
   });
@@ -1,5 +1,6 @@
 (() => {
   const API_DISTINCT_PREFIX = "/api/lookup/distinct/";
+  const SERVER_QUERY_DELAY = 300;
 
   function normaliseValue(value) {
     if (value === null || value === undefined) return "";
@@ -123,10 +124,133 @@
         .filter(Boolean);
 
       this.advancedFilters = [];
+
+      // Tabloda data-table-url varsa filtre, sıralama ve sayfalama sunucuda
+      // yapılır (/api/lookup/table); sayfa yalnızca ilk sayfayı getirir.
+      this.serverUrl = this.table ? this.table.dataset.tableUrl || null : null;
+      this.server = {
+        cursor: this.table ? this.table.dataset.nextCursor || "" : "",
+        sort: null,
+        desc: true,
+        seq: 0,
+        loading: false,
+        timer: null,
+        lastQuery: null,
+      };
+      this.moreEl =
+        this.table && this.table.id
+          ? document.querySelector(`[data-table-more="${this.table.id}"]`)
+          : null;
+
       this._bindEvents();
+      if (this.serverUrl) {
+        this._bindServerEvents();
+        this.server.lastQuery = this._serverParams([]).toString();
+      }
       this.applyFilters();
     }
 
+    _bindServerEvents() {
+      const sortable = new Set(
+        (this.table.dataset.sortable || "").split(",").filter(Boolean),
+      );
+      this.table.querySelectorAll("thead th[data-field]").forEach((th) => {
+        if (!sortable.has(th.dataset.field)) return;
+        th.classList.add("sortable");
+        th.addEventListener("click", () => {
+          const field = th.dataset.field;
+          if (this.server.sort === field) {
+            this.server.desc = !this.server.desc;
+          } else {
+            this.server.sort = field;
+            this.server.desc = false;
+          }
+          this.table.querySelectorAll("thead th[aria-sort]").forEach((el) => {
+            el.removeAttribute("aria-sort");
+          });
+          th.setAttribute(
+            "aria-sort",
+            this.server.desc ? "descending" : "ascending",
+          );
+          this.applyFilters();
+        });
+      });
+
+      if (this.moreEl && "IntersectionObserver" in window) {
+        new IntersectionObserver((entries) => {
+          if (entries.some((entry) => entry.isIntersecting)) {
+            this._loadServerPage({ reset: false });
+          }
+        }).observe(this.moreEl);
+      }
+    }
+
+    _serverParams(activeFilters) {
+      const params = new URLSearchParams();
+      const q = this.searchInput ? normaliseValue(this.searchInput.value) : "";
+      if (q) params.set("q", q);
+      activeFilters.forEach((filter) => {
+        const field = filter.columnField || filter.field;
+        if (field && filter.value) params.append(`f.${field}`, filter.value);
+      });
+      if (this.server.sort) {
+        params.set("sort", this.server.sort);
+        params.set("yon", this.server.desc ? "desc" : "asc");
+      }
+      return params;
+    }
+
+    _scheduleServerQuery(activeFilters) {
+      const params = this._serverParams(activeFilters);
+      const query = params.toString();
+      // Aynı filtrelerle (ör. ilk açılışta) yeniden istek atılmaz.
+      if (query === this.server.lastQuery) return;
+      this.server.lastQuery = query;
+      clearTimeout(this.server.timer);
+      this.server.timer = setTimeout(
+        () => this._loadServerPage({ reset: true }),
+        SERVER_QUERY_DELAY,
+      );
+    }
+
+    _setMoreStatus(text) {
+      if (this.moreEl) this.moreEl.textContent = text;
+    }
+
+    async _loadServerPage({ reset }) {
+      if (!reset && (this.server.loading || !this.server.cursor)) return;
+      const tbody = this.table.querySelector("tbody");
+      if (!tbody) return;
+      // Filtre değişince önceki isteğin yanıtı yok sayılır.
+      const seq = ++this.server.seq;
+      this.server.loading = true;
+      this._setMoreStatus("Yükleniyor…");
+      const params = new URLSearchParams(this.server.lastQuery || "");
+      params.set("format", "html");
+      if (!reset) params.set("cursor", this.server.cursor);
+      try {
+        const response = await fetch(`${this.serverUrl}?${params}`, {
+          credentials: "same-origin",
+        });
+        const html = await response.text();
+        if (seq !== this.server.seq) return;
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        if (reset) {
+          tbody.innerHTML = html;
+        } else {
+          tbody.insertAdjacentHTML("beforeend", html);
+        }
+        this.server.cursor = response.headers.get("X-Next-Cursor") || "";
+        this._setMoreStatus(tbody.children.length === 0 ? "Kayıt yok" : "");
+      } catch (error) {
+        if (seq !== this.server.seq) return;
+        console.warn("UnifiedFilterSystem: table query failed", error);
+        this._setMoreStatus("Kayıtlar yüklenemedi");
+      } finally {
+        if (seq === this.server.seq) this.server.loading = false;
+      }
+    }
+
     _bindEvents() {
       if (this.searchInput) {
         this.searchInput.addEventListener("input", () => this.applyFilters());
@@ -279,7 +403,11 @@
 
       const activeFilters = [...activeSimpleFilters, ...this.advancedFilters];
 
-      this.tbodyRows.forEach((row) => {
+      if (this.serverUrl) {
+        this._scheduleServerQuery(activeFilters);
+      }
+
+      (this.serverUrl ? [] : this.tbodyRows).forEach((row) => {
         const rowText = normaliseForCompare(row.textContent || "");
         let visible = true;
 
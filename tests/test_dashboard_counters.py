@@ -0,0 +1,81 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+from utils.dashboard_counters import count_all, read_counters, reconcile_counters
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def test_counters_follow_orm_writes(db_session):
+    inv = models.Inventory(no="INV-1", durum="aktif")
+    printer = models.Printer(envanter_no="PRN-1", durum="aktif")
+    db_session.add_all([inv, printer, models.License(lisans_adi="Office")])
+    db_session.commit()
+    reconcile_counters(db_session)
+    db_session.commit()
+    assert read_counters(db_session) == {
+        "envanter": 1,
+        "yazici": 1,
+        "lisans": 1,
+        "bos_lisans": 1,
+        "arizali": 0,
+        "acik_talep": 0,
+    }
+
+    lic = db_session.query(models.License).one()
+    lic.inventory_id = inv.id
+    printer.durum = "arızalı"
+    db_session.add(models.Talep(tur=models.TalepTuru.AKSESUAR, miktar=1))
+    db_session.commit()
+
+    # Attributes expired by the commit are changed without being loaded.
+    inv.durum = "hurda"
+    db_session.delete(printer)
+    db_session.commit()
+
+    assert read_counters(db_session) == count_all(db_session)
+    assert read_counters(db_session)["envanter"] == 0
+    assert read_counters(db_session)["acik_talep"] == 1
+
+
+def test_rollback_discards_counter_changes(db_session):
+    reconcile_counters(db_session)
+    db_session.commit()
+
+    db_session.add(models.Inventory(no="INV-1"))
+    db_session.flush()
+    assert read_counters(db_session)["envanter"] == 1
+    db_session.rollback()
+
+    assert read_counters(db_session)["envanter"] == 0
+
+
+def test_reconcile_repairs_bulk_writes(db_session):
+    db_session.add(models.Inventory(no="INV-1"))
+    db_session.commit()
+    reconcile_counters(db_session)
+    db_session.commit()
+
+    db_session.query(models.Inventory).update({"durum": "arızalı"})
+    db_session.commit()
+    assert read_counters(db_session)["arizali"] == 0
+
+    assert reconcile_counters(db_session) == {"arizali": (0, 1)}
+    db_session.commit()
+    assert read_counters(db_session)["arizali"] == 1
@@ -0,0 +1,90 @@
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+from utils.events import backfill_events, decode_payload
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def _events(db):
+    return db.query(models.Event).order_by(models.Event.id).all()
+
+
+def test_log_writes_are_mirrored_into_events(db_session):
+    inv = models.Inventory(no="INV-1")
+    db_session.add(inv)
+    db_session.flush()
+    db_session.add(
+        models.InventoryLog(
+            inventory_id=inv.id,
+            action="edit",
+            actor="ayse",
+            before_json={"durum": "aktif", "sorumlu": "ali"},
+            after_json={"durum": "aktif", "sorumlu": "veli"},
+            note="Zimmet değişti",
+        )
+    )
+    db_session.add(
+        models.StockLog(donanim_tipi="Mouse", miktar=2, islem="girdi", actor="ali")
+    )
+    talep = models.Talep(tur=models.TalepTuru.AKSESUAR, miktar=1)
+    db_session.add(talep)
+    db_session.commit()
+
+    talep.durum = models.TalepDurum.TAMAMLANDI
+    talep.kapanma_tarihi = datetime(2024, 5, 1)
+    db_session.commit()
+
+    events = _events(db_session)
+    assert [(e.entity_type, e.action, e.actor) for e in events] == [
+        ("inventory", "edit", "ayse"),
+        ("stock", "girdi", "ali"),
+        ("talep", "create", None),
+        ("talep", "tamamlandi", None),
+    ]
+    assert decode_payload(events[0].payload) == {
+        "note": "Zimmet değişti",
+        "changes": {"sorumlu": ["ali", "veli"]},
+    }
+    assert decode_payload(events[1].payload) == {"donanim_tipi": "Mouse", "miktar": 2}
+    assert events[3].created_at == datetime(2024, 5, 1)
+    assert all(e.created_at is not None for e in events)
+
+
+def test_backfill_copies_existing_logs_once(db_session):
+    lic = models.License(lisans_adi="Office")
+    db_session.add(lic)
+    db_session.flush()
+    db_session.add(
+        models.LicenseLog(license_id=lic.id, islem="assign", islem_yapan="ayse")
+    )
+    db_session.commit()
+    db_session.query(models.Event).delete()
+    db_session.commit()
+
+    assert backfill_events(db_session) == 1
+    db_session.commit()
+    assert backfill_events(db_session) == 0
+    event = _events(db_session)[0]
+    assert (event.entity_type, event.entity_id, event.action) == (
+        "license",
+        lic.id,
+        "assign",
+    )
@@ -0,0 +1,74 @@
+import asyncio
+import os
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+from routers.printers import export_printers
+from utils.excel_export import workbook_response
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def _read(response):
+    async def collect():
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return load_workbook(BytesIO(asyncio.run(collect())))
+
+
+def test_workbook_response_streams_lazy_rows():
+    consumed = []
+
+    def rows():
+        for n in range(3):
+            consumed.append(n)
+            yield [n, f"satır {n}"]
+
+    sheets = [("Veri", ["No", "Ad"], rows()), ("Özet", ["Toplam"], [[3]])]
+    response = workbook_response(sheets, "veri.xlsx")
+
+    assert response.headers["content-disposition"] == "attachment; filename=veri.xlsx"
+    assert int(response.headers["content-length"]) > 0
+    assert consumed == [0, 1, 2]
+
+    wb = _read(response)
+    assert wb.sheetnames == ["Veri", "Özet"]
+    assert list(wb["Veri"].iter_rows(values_only=True)) == [
+        ("No", "Ad"),
+        (0, "satır 0"),
+        (1, "satır 1"),
+        (2, "satır 2"),
+    ]
+
+
+def test_export_printers_writes_all_rows(db_session):
+    db_session.add_all(
+        [
+            models.Printer(envanter_no=f"PRN-{n}", marka="HP", model="M404")
+            for n in range(3)
+        ]
+    )
+    db_session.commit()
+
+    response = asyncio.run(export_printers(db_session))
+    rows = list(_read(response).active.iter_rows(values_only=True))
+
+    assert rows[0][:4] == ("ID", "Envanter No", "Marka", "Model")
+    assert [r[1] for r in rows[1:]] == ["PRN-0", "PRN-1", "PRN-2"]
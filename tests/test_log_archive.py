@@ -0,0 +1,124 @@
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+from routers.logs import logs_api
+from utils import log_archive
+from utils.log_archive import archive_old_logs, archived_history
+
+NOW = datetime(2025, 1, 1, 12, 0)
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+@pytest.fixture()
+def archive_url(tmp_path, monkeypatch):
+    url = f"sqlite:///{(tmp_path / 'archive.db').as_posix()}"
+    monkeypatch.setattr(log_archive, "LOG_ARCHIVE_URL", url)
+    yield url
+    engine = log_archive._engines.pop(url, None)
+    if engine is not None:
+        engine.dispose()
+
+
+def _seed(db):
+    inv = models.Inventory(no="PC-1")
+    lic = models.License(lisans_adi="Office")
+    prn = models.Printer(envanter_no="YZ-1")
+    db.add_all([inv, lic, prn])
+    db.flush()
+    for days in (400, 200, 10):
+        at = NOW - timedelta(days=days)
+        db.add_all(
+            [
+                models.InventoryLog(
+                    inventory_id=inv.id,
+                    action="edit",
+                    after_json={"gun": days},
+                    created_at=at,
+                ),
+                models.LicenseLog(license_id=lic.id, islem="edit", tarih=at),
+                models.PrinterHistory(
+                    printer_id=prn.id,
+                    action="edit",
+                    changes={"durum": {"old": "a", "new": "b"}},
+                    created_at=at,
+                ),
+            ]
+        )
+    db.commit()
+    return inv, lic, prn
+
+
+def test_old_entries_move_to_the_archive(db_session, archive_url):
+    inv, lic, prn = _seed(db_session)
+
+    moved = archive_old_logs(db_session, older_than_days=365, now=NOW)
+    assert moved == {"inventory_log": 1, "license_logs": 1, "printer_histories": 1}
+    assert db_session.query(models.InventoryLog).count() == 2
+
+    # A second run has nothing left to move.
+    again = archive_old_logs(db_session, older_than_days=365, now=NOW)
+    assert set(again.values()) == {0}
+
+    archive_old_logs(db_session, older_than_days=100, now=NOW)
+    assert db_session.query(models.LicenseLog).count() == 1
+    history = archived_history(models.PrinterHistory, prn.id)
+    assert [h.created_at for h in history] == [
+        NOW - timedelta(days=200),
+        NOW - timedelta(days=400),
+    ]
+    assert history[0].changes == {"durum": {"old": "a", "new": "b"}}
+    assert [h.after_json for h in archived_history(models.InventoryLog, inv.id)] == [
+        {"gun": 200},
+        {"gun": 400},
+    ]
+
+
+def test_without_archive_file_reads_return_nothing(db_session, archive_url):
+    inv, _, _ = _seed(db_session)
+    assert archived_history(models.InventoryLog, inv.id) == []
+    assert not Path(archive_url.removeprefix("sqlite:///")).exists()
+
+
+def test_log_pages_read_through_to_the_archive(db_session, archive_url):
+    _seed(db_session)
+    archive_old_logs(db_session, older_than_days=100, now=NOW)
+
+    params = dict(
+        cursor=None,
+        actor=None,
+        inventory_no=None,
+        action=None,
+        baslangic=None,
+        bitis=None,
+    )
+    seen = []
+    cursor = None
+    while True:
+        page = logs_api(db=db_session, **{**params, "limit": 1, "cursor": cursor})
+        seen.extend(item["after"]["gun"] for item in page["items"])
+        assert all(item["inventory_no"] == "PC-1" for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [10, 200, 400]
+
+    page = logs_api(db=db_session, **{**params, "limit": 50, "inventory_no": "PC"})
+    assert [item["after"]["gun"] for item in page["items"]] == [10, 200, 400]
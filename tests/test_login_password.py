@@ -0,0 +1,106 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import pytest
+from passlib.context import CryptContext
+from starlette.requests import Request
+
+import models
+from app.core import security
+from app.main import app
+from app.web.router import login_submit
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+@pytest.fixture()
+def fast_context(monkeypatch):
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=4)
+    monkeypatch.setattr(security, "pwd_context", context)
+    return context
+
+
+def _login(db, username, password):
+    request = Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "headers": [],
+            "app": app,
+            "router": app.router,
+            "session": {"csrf_token": "t"},
+        }
+    )
+    response = asyncio.run(
+        login_submit(
+            request,
+            username=username,
+            password=password,
+            remember=None,
+            csrf_token="t",
+            db=db,
+        )
+    )
+    return response, request.session
+
+
+def test_verify_and_update_rehashes_on_cost_change(fast_context, monkeypatch):
+    stored = security.hash_password("gizli")
+    assert security.verify_password("gizli", stored)
+    assert asyncio.run(security.verify_and_update_password("gizli", stored)) == (
+        True,
+        None,
+    )
+    assert asyncio.run(security.verify_and_update_password("yanlis", stored)) == (
+        False,
+        None,
+    )
+    assert asyncio.run(security.verify_and_update_password("gizli", "bozuk")) == (
+        False,
+        None,
+    )
+
+    monkeypatch.setattr(
+        security,
+        "pwd_context",
+        CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5),
+    )
+    ok, new_hash = asyncio.run(security.verify_and_update_password("gizli", stored))
+    assert ok and new_hash.startswith("$2b$05$")
+
+
+def test_login_upgrades_stored_hash(db_session, fast_context, monkeypatch):
+    user = models.User(username="ayse", password_hash=security.hash_password("gizli"))
+    db_session.add(user)
+    db_session.commit()
+    user_id = user.id
+
+    response, session = _login(db_session, "ayse", "yanlis")
+    assert response.status_code == 401
+    assert "user_id" not in session
+
+    monkeypatch.setattr(
+        security,
+        "pwd_context",
+        CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5),
+    )
+    response, session = _login(db_session, "ayse", "gizli")
+    assert response.status_code == 303
+    assert session["user_id"] == user_id
+    user = db_session.get(models.User, user_id)
+    assert user.password_hash.startswith("$2b$05$")
+    assert security.verify_password("gizli", user.password_hash)
@@ -0,0 +1,156 @@
+import os
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+from routers.logs import logs_api
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def _logs(db, **filters):
+    params = dict(
+        limit=50,
+        cursor=None,
+        actor=None,
+        inventory_no=None,
+        action=None,
+        baslangic=None,
+        bitis=None,
+    )
+    params.update(filters)
+    return logs_api(db=db, **params)
+
+
+def _inventory(db, no):
+    inv = models.Inventory(no=no)
+    db.add(inv)
+    db.flush()
+    return inv
+
+
+def test_logs_are_paged_by_date_and_id(db_session):
+    inv = _inventory(db_session, "PC-1")
+    same_time = datetime(2024, 5, 1, 12, 0)
+    for n in range(5):
+        db_session.add(
+            models.InventoryLog(
+                inventory_id=inv.id, action="edit", note=str(n), created_at=same_time
+            )
+        )
+    db_session.add(
+        models.InventoryLog(
+            inventory_id=inv.id,
+            action="assign",
+            after_json={"sorumlu_personel": "Ali"},
+            created_at=same_time + timedelta(days=1),
+        )
+    )
+    db_session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        page = _logs(db_session, limit=2, cursor=cursor)
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == [6, 5, 4, 3, 2, 1]
+    first = _logs(db_session, limit=1)["items"][0]
+    assert first["inventory_no"] == "PC-1"
+    assert first["after"] == {"sorumlu_personel": "Ali"}
+    assert first["before"] == {}
+
+
+def test_log_filters(db_session):
+    pc = _inventory(db_session, "PC-10")
+    other = _inventory(db_session, "NB-2")
+    db_session.add_all(
+        [
+            models.InventoryLog(
+                inventory_id=pc.id,
+                action="edit",
+                actor="ayse",
+                created_at=datetime(2024, 5, 1, 9, 0),
+            ),
+            models.InventoryLog(
+                inventory_id=pc.id,
+                action="scrap",
+                actor="mehmet",
+                created_at=datetime(2024, 5, 3, 23, 59),
+            ),
+            models.InventoryLog(
+                inventory_id=other.id,
+                action="edit",
+                actor="ayse",
+                created_at=datetime(2024, 5, 4, 8, 0),
+            ),
+        ]
+    )
+    db_session.commit()
+
+    def actions(**filters):
+        return [
+            (item["inventory_no"], item["action"], item["actor"])
+            for item in _logs(db_session, **filters)["items"]
+        ]
+
+    assert actions(actor="ayse") == [("NB-2", "edit", "ayse"), ("PC-10", "edit", "ayse")]
+    assert actions(inventory_no="PC") == [
+        ("PC-10", "scrap", "mehmet"),
+        ("PC-10", "edit", "ayse"),
+    ]
+    assert actions(inventory_no="PC_") == []
+    assert actions(action="scrap") == [("PC-10", "scrap", "mehmet")]
+    assert actions(baslangic=date(2024, 5, 2), bitis=date(2024, 5, 3)) == [
+        ("PC-10", "scrap", "mehmet")
+    ]
+
+
+def test_invalid_cursor_is_rejected(db_session):
+    with pytest.raises(HTTPException) as exc:
+        _logs(db_session, cursor="bozuk")
+    assert exc.value.status_code == 400
+
+
+def test_action_filter_lists_every_written_action():
+    import ast
+
+    from routers.logs import INVENTORY_LOG_ACTIONS
+
+    root = Path(__file__).resolve().parents[1]
+    written = set()
+    paths = [*root.glob("routers/*.py"), *root.glob("routes/*.py")]
+    for path in paths + list(root.glob("utils/*.py")):
+        for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+            if not (
+                isinstance(node, ast.Call)
+                and getattr(node.func, "id", None) == "InventoryLog"
+            ):
+                continue
+            for keyword in node.keywords:
+                if keyword.arg == "action":
+                    written |= {
+                        n.value
+                        for n in ast.walk(keyword.value)
+                        if isinstance(n, ast.Constant) and isinstance(n.value, str)
+                    }
+    assert written and written <= set(INVENTORY_LOG_ACTIONS)
@@ -0,0 +1,175 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import pytest
+from sqlalchemy import text
+
+import models
+from routers.api import inventory_list, users_list
+from routers.lookup import lookup_list
+from utils.normalize import normalize_search, prefix_bounds
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def _names(rows):
+    return [row["name"] for row in rows]
+
+
+def test_normalize_search_folds_turkish_letters():
+    assert normalize_search("İSTANBUL") == "istanbul"
+    assert normalize_search("Işık") == "isik"
+    assert normalize_search("  ŞUBE   Müdürlüğü ") == "sube mudurlugu"
+    assert normalize_search("Çağrı") == "cagri"
+    assert normalize_search(None) is None
+    assert prefix_bounds("  ") is None
+    assert prefix_bounds("Iş") == ("is", "it")
+
+
+def test_search_keys_follow_name_changes(db_session):
+    db = db_session
+    factory = models.Factory(name="İzmir Fabrika")
+    db.add(factory)
+    db.commit()
+    assert factory.name_norm == "izmir fabrika"
+
+    factory.name = "Şişli Depo"
+    db.commit()
+    stored = db.execute(
+        text("SELECT name_norm FROM factories WHERE id = :id"), {"id": factory.id}
+    ).scalar()
+    assert stored == "sisli depo"
+
+
+def test_lookup_list_matches_turkish_prefixes(db_session):
+    db = db_session
+    db.add_all(
+        [
+            models.UsageArea(name="İstanbul Ofis"),
+            models.UsageArea(name="Işıklar Depo"),
+            models.UsageArea(name="ŞUBE"),
+            models.UsageArea(name="Ankara"),
+        ]
+    )
+    db.commit()
+
+    assert _names(lookup_list("kullanim_alani", q="istanbul", db=db)) == [
+        "İstanbul Ofis"
+    ]
+    assert _names(lookup_list("kullanim_alani", q="ışık", db=db)) == ["Işıklar Depo"]
+    assert _names(lookup_list("kullanim_alani", q="IŞIK", db=db)) == ["Işıklar Depo"]
+    assert _names(lookup_list("kullanim_alani", q="şube", db=db)) == ["ŞUBE"]
+    assert len(lookup_list("kullanim_alani", q="", db=db)) == 4
+
+
+def test_lookup_list_models_and_categories(db_session):
+    db = db_session
+    brand = models.Brand(name="Çelik")
+    db.add_all(
+        [
+            brand,
+            models.Model(name="Güç 500", brand=brand),
+            models.Model(name="Gövde", brand=brand),
+            models.BilgiKategori(ad="Ağ Ayarları"),
+        ]
+    )
+    db.commit()
+
+    assert _names(lookup_list("marka", q="cel", db=db)) == ["Çelik"]
+    assert _names(lookup_list("model", q="guc", marka_id=brand.id, db=db)) == [
+        "Güç 500"
+    ]
+    assert _names(lookup_list("bilgi_kategorileri", q="ag", db=db)) == [
+        "Ağ Ayarları"
+    ]
+
+
+def test_legacy_lookup_values_use_search_key(db_session):
+    db = db_session
+    db.add_all(
+        [
+            models.Lookup(type="renk", value="Gümüş"),
+            models.Lookup(type="renk", value="Siyah"),
+        ]
+    )
+    db.commit()
+
+    assert lookup_list("renk", q="GUM", db=db) == [{"id": "Gümüş", "name": "Gümüş"}]
+
+
+def test_prefix_search_uses_index(db_session):
+    db = db_session
+    plan = db.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT id FROM brands"
+            " WHERE name_norm >= :low AND name_norm < :high"
+        ),
+        {"low": "ab", "high": "ac"},
+    ).all()
+    assert any("ix_brands_name_norm" in row[-1] for row in plan)
+
+
+def test_lookup_list_fills_with_inner_matches(db_session):
+    db = db_session
+    db.add_all(
+        [
+            models.UsageArea(name="Depo Şişli"),
+            models.UsageArea(name="Şişli Ofis"),
+            models.UsageArea(name="Ankara"),
+        ]
+    )
+    db.commit()
+
+    # Önek eşleşmeleri önce, adın içinde geçenler sonra.
+    assert _names(lookup_list("kullanim_alani", q="sisli", db=db)) == [
+        "Şişli Ofis",
+        "Depo Şişli",
+    ]
+    assert _names(lookup_list("kullanim_alani", q="sisli", limit=1, db=db)) == [
+        "Şişli Ofis"
+    ]
+
+
+def test_person_and_number_columns_are_searchable(db_session):
+    db = db_session
+    db.add_all(
+        [
+            models.User(username="ik", password_hash="x", full_name="İlker Işık"),
+            models.User(username="ab", password_hash="x", full_name="Ali Bal"),
+            models.Inventory(no="PC-İZM-01", sorumlu_personel="Şule Çağlar"),
+            models.Inventory(no="PC-ANK-02", seri_no="sn-ğ7"),
+            models.License(lisans_adi="Office", sorumlu_personel="ÖMER"),
+        ]
+    )
+    db.commit()
+
+    lic = db.query(models.License).one()
+    assert (lic.sorumlu_personel_norm, lic.ifs_no_norm) == ("omer", None)
+
+    def users(q):
+        return [u["username"] for u in users_list(q=q, role=None, db=db)["items"]]
+
+    def inventories(q):
+        return [
+            i["no"]
+            for i in inventory_list(q=q, fabrika=None, departman=None, db=db)["items"]
+        ]
+
+    assert users("ışık") == ["ik"]
+    assert users("ILKER") == ["ik"]
+    assert inventories("izm") == ["PC-İZM-01"]
+    assert inventories("sule cag") == ["PC-İZM-01"]
+    assert inventories("SN-Ğ") == ["PC-ANK-02"]
@@ -0,0 +1,72 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+import models
+
+
+@pytest.fixture()
+def engines(tmp_path):
+    url = f"sqlite:///{(tmp_path / 'app.db').as_posix()}"
+    write_engine = models.create_app_engine(url)
+    read_engine = models.create_app_engine(url, read_only=True)
+    try:
+        yield write_engine, read_engine
+    finally:
+        write_engine.dispose()
+        read_engine.dispose()
+
+
+def _pragma(conn, name):
+    return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_file_engines_use_wal_and_tuned_pragmas(engines):
+    write_engine, read_engine = engines
+    with write_engine.connect() as conn:
+        assert _pragma(conn, "journal_mode") == "wal"
+        assert _pragma(conn, "busy_timeout") == models.SQLITE_BUSY_TIMEOUT_MS
+        assert _pragma(conn, "query_only") == 0
+    with read_engine.connect() as conn:
+        assert _pragma(conn, "query_only") == 1
+        assert _pragma(conn, "mmap_size") == models.SQLITE_MMAP_SIZE
+    assert read_engine.pool.size() == models.SQLITE_READ_POOL_SIZE
+
+
+def test_read_engine_sees_commits_and_refuses_writes(engines):
+    write_engine, read_engine = engines
+    with write_engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)"))
+        conn.execute(text("INSERT INTO t (v) VALUES ('a')"))
+
+    with read_engine.connect() as conn:
+        # Okuma açıkken yazıcı beklemeden işlem yapabilir (WAL).
+        conn.execute(text("BEGIN"))
+        assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 1
+        with write_engine.begin() as writer:
+            writer.execute(text("INSERT INTO t (v) VALUES ('b')"))
+        conn.execute(text("COMMIT"))
+        assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 2
+
+        with pytest.raises(OperationalError):
+            conn.execute(text("INSERT INTO t (v) VALUES ('c')"))
+
+
+def test_memory_database_reads_share_the_writer():
+    assert models.read_engine is models.engine
+
+    from database import get_read_db
+
+    gen = get_read_db()
+    db = next(gen)
+    try:
+        assert db.get_bind() is models.engine
+    finally:
+        gen.close()
@@ -0,0 +1,78 @@
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+from utils.activity import recent_activity
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def test_recent_activity_merges_logs_newest_first(db_session):
+    start = datetime(2024, 1, 1)
+    inv = models.Inventory(no="INV-1")
+    lic = models.License(lisans_adi="Office")
+    db_session.add_all(
+        [
+            inv,
+            lic,
+            models.User(
+                username="ayse", password_hash="x", first_name="Ayşe", last_name="Kaya"
+            ),
+        ]
+    )
+    db_session.flush()
+    for n in range(3):
+        db_session.add(
+            models.InventoryLog(
+                inventory_id=inv.id,
+                action="edit",
+                actor="ayse",
+                created_at=start + timedelta(hours=n * 3),
+            )
+        )
+        db_session.add(
+            models.StockLog(
+                donanim_tipi="Mouse",
+                miktar=1,
+                islem="girdi",
+                actor="ali",
+                tarih=start + timedelta(hours=n * 3 + 1),
+            )
+        )
+        db_session.add(
+            models.LicenseLog(
+                license_id=lic.id,
+                islem="assign",
+                islem_yapan="ayse",
+                tarih=start + timedelta(hours=n * 3 + 2),
+            )
+        )
+    db_session.commit()
+
+    rows = recent_activity(db_session, 4)
+
+    assert [(r.action, r.no) for r in rows] == [
+        ("assign", "Office"),
+        ("girdi", "Mouse"),
+        ("edit", "INV-1"),
+        ("assign", "Office"),
+    ]
+    assert rows[0].created_at == start + timedelta(hours=8)
+    assert [r.actor for r in rows] == ["Ayşe Kaya", "ali", "Ayşe Kaya", "Ayşe Kaya"]
+    assert len(recent_activity(db_session, 20)) == 9
@@ -0,0 +1,83 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+from routers.talep import talep_liste
+from utils.refdata import get_refdata
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def test_refdata_lookups(db_session):
+    brand = models.Brand(name="Dell")
+    db_session.add_all([models.HardwareType(name="Laptop"), brand])
+    db_session.commit()
+    db_session.add(models.Model(name="Latitude", brand_id=brand.id))
+    db_session.commit()
+
+    refdata = get_refdata(db_session)
+    hw_id = refdata.hardware.id_for("  laptop ")
+    assert refdata.hardware.name(hw_id) == "Laptop"
+    assert refdata.brands.display(str(brand.id)) == "Dell"
+    assert refdata.brands.display("Lenovo") == "Lenovo"
+    assert refdata.models.canon("LATITUDE") == "latitude"
+    assert refdata.types.canon(hw_id) == "laptop"
+
+
+def test_refdata_is_reused_until_a_reference_table_changes(db_session):
+    db_session.add(models.Brand(name="HP"))
+    db_session.commit()
+
+    first = get_refdata(db_session)
+    assert get_refdata(db_session) is first
+
+    db_session.add(models.Talep(tur=models.TalepTuru.AKSESUAR, miktar=1))
+    db_session.commit()
+    assert get_refdata(db_session) is first
+
+    brand = db_session.query(models.Brand).one()
+    brand.name = "HP Inc."
+    db_session.commit()
+
+    reloaded = get_refdata(db_session)
+    assert reloaded is not first
+    assert reloaded.brands.name(brand.id) == "HP Inc."
+
+
+def test_talep_list_resolves_reference_ids(db_session):
+    hw = models.HardwareType(name="Monitör")
+    brand = models.Brand(name="Dell")
+    db_session.add_all([hw, brand])
+    db_session.commit()
+    db_session.add(
+        models.Talep(
+            tur=models.TalepTuru.AKSESUAR,
+            donanim_tipi=str(hw.id),
+            marka=str(brand.id),
+            model="P2422H",
+            miktar=1,
+            karsilanan_miktar=0,
+            kalan_miktar=1,
+        )
+    )
+    db_session.commit()
+
+    rows = talep_liste(db=db_session)
+    assert rows[0]["donanim_tipi"] == "Monitör"
+    assert rows[0]["marka"] == "Dell"
+    assert rows[0]["model"] == "P2422H"
@@ -0,0 +1,100 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import pytest
+from sqlalchemy import text
+
+import models
+from utils.schema_capabilities import invalidate_capabilities, table_capabilities
+from utils.stock_log import create_stock_log, stock_log_capabilities
+
+LEGACY_STOCK_LOGS = """
+CREATE TABLE stock_logs (
+    id INTEGER PRIMARY KEY,
+    donanim_tipi VARCHAR(150) NOT NULL,
+    miktar INTEGER NOT NULL,
+    ifs_no VARCHAR(100),
+    tarih DATETIME,
+    islem VARCHAR(10) NOT NULL
+)
+"""
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+@pytest.fixture()
+def legacy_db(db_session):
+    db_session.execute(text("DROP TABLE stock_logs"))
+    db_session.execute(text(LEGACY_STOCK_LOGS))
+    db_session.commit()
+    invalidate_capabilities()
+    yield db_session
+    invalidate_capabilities()
+
+
+def test_flags_follow_the_physical_table(legacy_db):
+    caps = stock_log_capabilities(legacy_db)
+    assert caps.has_donanim_tipi and caps.has_ifs_no
+    assert not caps.has_marka
+    assert not caps.has_source_type
+    assert {"marka", "model", "source_type", "source_id"} <= caps.missing
+    assert not caps.has("tarih", "marka")
+    with pytest.raises(AttributeError):
+        caps.marka
+
+    legacy_db.execute(text("ALTER TABLE stock_logs ADD COLUMN marka VARCHAR(150)"))
+    legacy_db.commit()
+    # Sonuç önbellekte kalır; göçler sonrasında açıkça geçersiz kılınır.
+    assert stock_log_capabilities(legacy_db) is caps
+    invalidate_capabilities()
+    assert stock_log_capabilities(legacy_db).has_marka
+
+
+def test_legacy_stock_log_insert_skips_missing_columns(legacy_db):
+    create_stock_log(
+        legacy_db,
+        donanim_tipi="Monitör",
+        miktar=2,
+        islem="girdi",
+        marka="Dell",
+        source_type="stok",
+    )
+    legacy_db.commit()
+    row = legacy_db.execute(
+        text("SELECT donanim_tipi, miktar FROM stock_logs")
+    ).one()
+    assert tuple(row) == ("Monitör", 2)
+
+
+def test_missing_table_is_not_cached(db_session):
+    db_session.execute(text("DROP TABLE stock_logs"))
+    db_session.commit()
+    invalidate_capabilities()
+
+    caps = table_capabilities("stock_logs", db_session)
+    assert caps.has_marka and not caps.missing
+
+    db_session.execute(text(LEGACY_STOCK_LOGS))
+    db_session.commit()
+    assert not table_capabilities("stock_logs", db_session).has_marka
+    invalidate_capabilities()
+
+
+def test_create_all_resets_the_registry(db_session):
+    assert stock_log_capabilities(db_session).has_source_type
+    models.Base.metadata.drop_all(models.engine)
+    models.Base.metadata.create_all(models.engine)
+    assert not stock_log_capabilities().missing
@@ -0,0 +1,128 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+
+
+@pytest.fixture()
+def file_models(tmp_path, monkeypatch):
+    # models yeniden yüklenmez; arama dizini dinleyicileri mevcut modele bağlı.
+    engine = models.create_app_engine(f"sqlite:///{tmp_path / 'fingerprint.db'}")
+    monkeypatch.setattr(models, "engine", engine)
+    monkeypatch.setattr(
+        models, "SessionLocal", sessionmaker(bind=engine, autoflush=False)
+    )
+    try:
+        yield models
+    finally:
+        engine.dispose()
+
+
+def _stored(models):
+    with models.engine.connect() as conn:
+        return conn.execute(
+            text("SELECT fingerprint FROM schema_fingerprints WHERE name = 'app'")
+        ).scalar()
+
+
+def test_init_db_records_fingerprint_and_skips_sweep(file_models, monkeypatch):
+    from app.db import init
+
+    models = file_models
+    models.init_db()
+    assert _stored(models) == init.schema_fingerprint()
+    assert init.schema_is_current(models.engine)
+
+    calls = []
+    monkeypatch.setattr(init, "_migrate", lambda engine: calls.append(engine))
+    init.bootstrap_schema()
+    models.init_db()
+    assert calls == []
+
+    models.init_db(force=True)
+    assert len(calls) == 1
+
+
+def test_changed_fingerprint_runs_sweep_again(file_models, monkeypatch):
+    from app.db import init
+
+    models = file_models
+    models.init_db()
+    with models.engine.begin() as conn:
+        conn.execute(text("UPDATE schema_fingerprints SET fingerprint = 'eski'"))
+        conn.execute(text("DROP INDEX ix_stock_logs_tarih_id"))
+    assert not init.schema_is_current(models.engine)
+
+    models.init_db()
+    assert _stored(models) == init.schema_fingerprint()
+    with models.engine.connect() as conn:
+        indexes = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index'")
+        ).scalars()
+        assert "ix_stock_logs_tarih_id" in set(indexes)
+
+
+def test_data_repairs_run_when_sweep_is_skipped(file_models, monkeypatch):
+    from app.db import init
+
+    models = file_models
+    models.init_db()
+    with models.SessionLocal() as db:
+        db.add(models.Inventory(no="PC-1"))
+        db.commit()
+    # ORM dışından yazılmış satırlar: anahtarsız marka, boş arama dizini.
+    with models.engine.begin() as conn:
+        conn.execute(text("INSERT INTO brands (name) VALUES ('Işık')"))
+        conn.execute(text("DELETE FROM search_index"))
+
+    calls = []
+    monkeypatch.setattr(init, "_migrate", lambda engine: calls.append(engine))
+    models.init_db()
+    assert calls == []
+    with models.engine.connect() as conn:
+        key = conn.execute(
+            text("SELECT name_norm FROM brands WHERE name = 'Işık'")
+        ).scalar()
+        indexed = conn.execute(text("SELECT count(*) FROM search_index")).scalar()
+    assert key is not None
+    assert indexed > 0
+
+
+def test_failed_repair_leaves_fingerprint_unrecorded(file_models, monkeypatch):
+    from app.db import init
+
+    models = file_models
+    build_search_index = init._build_search_index
+    monkeypatch.setattr(init, "_build_search_index", lambda: False)
+    models.init_db()
+    assert _stored(models) is None
+    assert not init.schema_is_current(models.engine)
+
+    monkeypatch.setattr(init, "_build_search_index", build_search_index)
+    models.init_db()
+    assert _stored(models) == init.schema_fingerprint()
+
+
+def test_fingerprint_follows_metadata(file_models):
+    from sqlalchemy import Column, Integer, Table
+
+    from app.db import init
+
+    models = file_models
+    before = init.schema_fingerprint()
+    table = Table(
+        "gecici", models.Base.metadata, Column("id", Integer, primary_key=True)
+    )
+    try:
+        assert init.schema_fingerprint() != before
+    finally:
+        models.Base.metadata.remove(table)
+    assert init.schema_fingerprint() == before
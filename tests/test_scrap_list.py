@@ -0,0 +1,147 @@
+import os
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+from utils.scraps import scrap_page
+
+BASE = datetime(2024, 6, 1, 9, 0)
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def _seed(db, inventories=3):
+    for n in range(inventories):
+        inv = models.Inventory(
+            no=f"PC-{n}",
+            marka="Dell",
+            model=f"M{n}",
+            durum="hurda",
+            tarih=BASE + timedelta(days=n),
+        )
+        db.add(inv)
+        db.flush()
+        for k in range(7):
+            db.add(
+                models.InventoryLog(
+                    inventory_id=inv.id,
+                    action="edit",
+                    note=f"{n}-{k}",
+                    created_at=BASE + timedelta(minutes=k),
+                )
+            )
+    db.add(models.Inventory(no="PC-AKTIF", durum="aktif", tarih=BASE))
+    db.add(
+        models.License(
+            lisans_adi="Office", durum="hurda", tarih=date(2024, 6, 10)
+        )
+    )
+    db.add(
+        models.ScrapPrinter(
+            printer_id=7,
+            snapshot={"marka": "HP", "model": "LaserJet", "seri_no": "SN-1"},
+            reason="Toner ünitesi bozuk",
+            created_at=BASE - timedelta(days=30),
+        )
+    )
+    db.commit()
+
+
+def test_sources_are_merged_sorted_and_paged(db_session):
+    _seed(db_session)
+
+    first = scrap_page(db_session, per_page=2)
+    second = scrap_page(db_session, per_page=2, page=2)
+    third = scrap_page(db_session, per_page=2, page=3)
+    assert first.total == 5 and first.pages == 3
+    titles = [item["title"] for p in (first, second, third) for item in p.items]
+    assert titles == ["Office", "Dell M2", "Dell M1", "Dell M0", "HP LaserJet"]
+
+    by_title = scrap_page(db_session, sort="baslik", desc=False)
+    assert [item["title"] for item in by_title.items] == [
+        "Dell M0",
+        "Dell M1",
+        "Dell M2",
+        "HP LaserJet",
+        "Office",
+    ]
+
+
+def test_type_filter_and_search(db_session):
+    _seed(db_session)
+
+    assert [i["type"] for i in scrap_page(db_session, tur="yazici").items] == [
+        "yazici"
+    ]
+    assert [i["title"] for i in scrap_page(db_session, q="toner").items] == [
+        "HP LaserJet"
+    ]
+    assert [i["subtitle"] for i in scrap_page(db_session, q="pc-1").items] == [
+        "Envanter No: PC-1"
+    ]
+    assert scrap_page(db_session, q="aktif").total == 0
+
+
+def test_latest_logs_are_batch_loaded(db_session):
+    _seed(db_session, inventories=20)
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(models.engine, "before_cursor_execute", count)
+    try:
+        result = scrap_page(db_session, tur="envanter")
+    finally:
+        event.remove(models.engine, "before_cursor_execute", count)
+
+    assert len(result.items) == 20
+    # count + page keys + inventories + logs, independent of the page size
+    assert len(statements) == 4
+    logs = result.items[0]["logs"]
+    assert [log.note for log in logs] == ["19-6", "19-5", "19-4", "19-3", "19-2"]
+
+
+def test_search_folds_turkish_letters(db_session):
+    db_session.add(
+        models.Inventory(
+            no="PC-9",
+            marka="Dell",
+            sorumlu_personel="ŞUBE Çalışan",
+            departman="İDARİ İŞLER",
+            durum="hurda",
+            tarih=BASE,
+        )
+    )
+    db_session.add(
+        models.ScrapPrinter(
+            printer_id=8, snapshot={"marka": "HP", "fabrika": "ÇORLU"}, created_at=BASE
+        )
+    )
+    db_session.commit()
+
+    for q in ("şube", "çalış", "calis", "idari isler", "İdari"):
+        assert [i["subtitle"] for i in scrap_page(db_session, q=q).items] == [
+            "Envanter No: PC-9"
+        ], q
+    assert [i["title"] for i in scrap_page(db_session, q="çorlu").items] == ["HP"]
+    # % ve _ joker karakter değil.
+    assert scrap_page(db_session, q="%").total == 0
+    assert scrap_page(db_session, q="PC_9").total == 0
@@ -0,0 +1,147 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, text
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+from routers.api import global_search
+from utils.search_index import rebuild_search_index, search
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def _seed(db):
+    user = models.User(username="ayse", password_hash="x")
+    hw = models.HardwareType(name="Monitör")
+    db.add_all([user, hw])
+    db.flush()
+    db.add_all(
+        [
+            models.Inventory(no="PC-100", marka="Dell", sorumlu_personel="Işık Demir"),
+            models.Printer(envanter_no="YZ-7", marka="HP", hostname="muhasebe-prn"),
+            models.License(lisans_adi="Office 365", lisans_anahtari="GIZLI-ANAHTAR"),
+            models.Talep(
+                tur=models.TalepTuru.ENVANTER,
+                donanim_tipi=str(hw.id),
+                miktar=2,
+                aciklama="Muhasebe için",
+            ),
+            models.Bilgi(
+                baslik="VPN kurulumu",
+                icerik="Dell dizüstülerde VPN istemcisi kurulur.",
+                kullanici_id=user.id,
+            ),
+        ]
+    )
+    db.commit()
+
+
+def _hits(db, q, **kwargs):
+    return [(hit["type"], hit["title"]) for hit in search(db, q, **kwargs)]
+
+
+def test_writes_keep_the_index_current(db_session):
+    _seed(db_session)
+
+    assert ("inventory", "PC-100 Dell") in _hits(db_session, "isik")
+    assert _hits(db_session, "monit") == [("talep", "Monitör")]
+    assert _hits(db_session, "gizli") == []
+
+    inv = db_session.query(models.Inventory).one()
+    inv.marka = "Lenovo"
+    db_session.commit()
+    assert _hits(db_session, "pc-100") == [("inventory", "PC-100 Lenovo")]
+
+    db_session.delete(inv)
+    db_session.commit()
+    assert _hits(db_session, "pc") == []
+
+
+def test_hits_are_ranked_typed_and_snippeted(db_session):
+    _seed(db_session)
+
+    hits = search(db_session, "dell")
+    # The title match outranks the body match.
+    assert [hit["type"] for hit in hits] == ["inventory", "bilgi"]
+    assert hits[0]["url"] == f"/inventory/{hits[0]['id']}/detail"
+    assert "<mark>Dell</mark>" in hits[1]["snippet"]
+    assert _hits(db_session, "muhasebe", types=["printer"]) == [("printer", "YZ-7 HP")]
+
+
+def test_talep_hits_open_the_request(db_session):
+    from routes.talepler import detail
+
+    _seed(db_session)
+    talep = db_session.query(models.Talep).one()
+    talep.durum = models.TalepDurum.TAMAMLANDI
+    db_session.commit()
+
+    (hit,) = search(db_session, "monit")
+    assert hit["url"] == f"/talepler/{talep.id}"
+    response = detail(talep.id, db=db_session)
+    assert response.headers["location"] == (
+        f"/talepler?durum=tamamlandi#talep-{talep.id}"
+    )
+
+
+def test_rebuild_and_api(db_session):
+    _seed(db_session)
+    db_session.execute(text("DELETE FROM search_index"))
+    assert search(db_session, "vpn") == []
+
+    counts = rebuild_search_index(db_session)
+    db_session.commit()
+    assert counts == {
+        "inventory": 1,
+        "printer": 1,
+        "license": 1,
+        "talep": 1,
+        "bilgi": 1,
+    }
+
+    result = global_search(q="vpn kur", tur="bilgi", limit=10, db=db_session)
+    assert [hit["title"] for hit in result["items"]] == ["VPN kurulumu"]
+    assert global_search(q="  ", tur=None, limit=10, db=db_session)["items"] == []
+    with pytest.raises(HTTPException) as exc:
+        global_search(q="vpn", tur="bilinmeyen", limit=10, db=db_session)
+    assert exc.value.status_code == 400
+
+
+def test_rebuild_resolves_type_ids_without_per_row_queries(db_session):
+    types = [models.HardwareType(name=f"Tip {n}") for n in range(5)]
+    db_session.add_all(types)
+    db_session.flush()
+    db_session.add_all(
+        models.Talep(tur=models.TalepTuru.ENVANTER, donanim_tipi=str(t.id), miktar=1)
+        for t in types
+    )
+    db_session.commit()
+
+    statements = []
+
+    def _count(conn, cursor, statement, *args):
+        if "hardware_types" in statement or "license_names" in statement:
+            statements.append(statement)
+
+    event.listen(models.engine, "before_cursor_execute", _count)
+    try:
+        rebuild_search_index(db_session)
+    finally:
+        event.remove(models.engine, "before_cursor_execute", _count)
+    assert len(statements) == 2
+    assert [hit["title"] for hit in search(db_session, "tip 3")] == ["Tip 3"]
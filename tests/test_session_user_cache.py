@@ -0,0 +1,101 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import models
+import security
+from routes.admin import user_delete, user_edit_post
+from security import SessionUser, current_user, session_user_stats
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def add_user(db, username, role="user"):
+    u = models.User(username=username, password_hash="x", role=role)
+    db.add(u)
+    db.commit()
+    db.refresh(u)
+    return u
+
+
+def _request(user_id):
+    return Request({"type": "http", "session": {"user_id": user_id}})
+
+
+def _counting_queries(monkeypatch):
+    calls = []
+    original = security.get_user_by_id
+
+    def tracking(db, user_id):
+        calls.append(user_id)
+        return original(db, user_id)
+
+    monkeypatch.setattr(security, "get_user_by_id", tracking)
+    return calls
+
+
+def test_repeated_requests_hit_the_cache(db_session, monkeypatch):
+    u = add_user(db_session, "ayse")
+    calls = _counting_queries(monkeypatch)
+    before = session_user_stats()
+
+    users = [current_user(_request(u.id), db_session) for _ in range(10)]
+
+    assert calls == [u.id]
+    assert all(item is users[0] for item in users)
+    after = session_user_stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 9
+
+
+def test_entries_expire(db_session, monkeypatch):
+    u = add_user(db_session, "ayse")
+    calls = _counting_queries(monkeypatch)
+    monkeypatch.setattr(security, "SESSION_USER_TTL", 0.0)
+
+    current_user(_request(u.id), db_session)
+    current_user(_request(u.id), db_session)
+    assert calls == [u.id, u.id]
+
+
+def test_admin_edit_and_delete_invalidate(db_session):
+    admin = add_user(db_session, "admin", role="admin")
+    u = add_user(db_session, "ayse")
+    acting = SessionUser(admin.id, admin.username, admin.role)
+    assert current_user(_request(u.id), db_session).role == "user"
+
+    user_edit_post(
+        u.id,
+        username="ayse",
+        first_name="Ayşe",
+        last_name="Yılmaz",
+        email="",
+        password="",
+        is_admin=True,
+        user=acting,
+        db=db_session,
+    )
+    cached = current_user(_request(u.id), db_session)
+    assert cached.role == "admin"
+    assert cached.full_name == "Ayşe Yılmaz"
+
+    user_delete(u.id, user=acting, db=db_session)
+    with pytest.raises(HTTPException) as exc:
+        current_user(_request(u.id), db_session)
+    assert exc.value.detail == "redirect:/login"
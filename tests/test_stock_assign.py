@@ -208,3 +208,31 @@ def test_stock_assign_matches_lookup_display_values(db_session):
         db.query(models.StockAssignment).filter_by(hedef_envanter_no="INV300").one()
     )
     assert assign.donanim_tipi == str(hw.id)
+
+
+def test_stock_assign_resolves_exact_key_without_status_scan(
+    db_session, monkeypatch
+):
+    import routers.stock as stock_module
+
+    db = db_session
+    _setup_stock(db, "Monitor", toplam=2, marka="Dell", model="P2422H")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("stock status should not be scanned")
+
+    monkeypatch.setattr(stock_module, "stock_status_detail", fail)
+
+    payload = AssignPayload(
+        stock_id="Monitor|Dell|P2422H|",
+        atama_turu="envanter",
+        miktar=1,
+        envanter_form={"envanter_no": "INV400"},
+    )
+
+    result = stock_assign(payload, db=db, user=_make_user())
+
+    assert result["kalan_miktar"] == 1
+    inv = db.query(models.Inventory).filter_by(no="INV400").one()
+    assert inv.marka == "Dell"
+    assert inv.model == "P2422H"
@@ -0,0 +1,152 @@
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+from routers.api import stock_status_detail
+from routers.stock import stock_add
+from utils.data_version import STOCK, touch
+from utils.stock_balance import ledger_balances, rebuild_stock_balances, stock_key
+from utils.stock_log import get_available_columns
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def _balance(db, *key):
+    return (
+        db.query(models.StockBalance)
+        .filter(models.StockBalance.stock_key == stock_key(*key))
+        .one_or_none()
+    )
+
+
+def test_stock_add_updates_balance_in_same_transaction(db_session):
+    payload = {
+        "donanim_tipi": "Laptop",
+        "marka": "Dell",
+        "model": "X",
+        "ifs_no": "IFS-1",
+        "miktar": 3,
+        "islem_yapan": "tester",
+    }
+    assert stock_add(payload, db_session)["ok"] is True
+    assert stock_add({**payload, "miktar": 1, "islem": "cikti"}, db_session)["ok"]
+
+    balance = _balance(db_session, "Laptop", "Dell", "X", "IFS-1")
+    assert balance.miktar == 2
+    last_log = (
+        db_session.query(models.StockLog).order_by(models.StockLog.id.desc()).first()
+    )
+    assert balance.last_log_id == last_log.id
+
+
+def test_balance_tracks_latest_movement_source(db_session):
+    now = datetime.utcnow()
+    db_session.add_all(
+        [
+            models.StockLog(
+                donanim_tipi="printer",
+                miktar=2,
+                islem="girdi",
+                tarih=now,
+                source_type="talep:yazici",
+                source_id=7,
+            ),
+            models.StockLog(
+                donanim_tipi="printer",
+                miktar=1,
+                islem="girdi",
+                tarih=now - timedelta(days=1),
+                source_type="envanter",
+                source_id=3,
+            ),
+        ]
+    )
+    db_session.commit()
+
+    balance = _balance(db_session, "printer")
+    assert balance.miktar == 3
+    assert balance.source_type == "talep:yazici"
+    assert balance.source_id == 7
+
+
+def test_rebuild_matches_ledger(db_session):
+    db_session.add_all(
+        [
+            models.StockLog(donanim_tipi="mouse", miktar=5, islem="girdi"),
+            models.StockLog(donanim_tipi="mouse", miktar=2, islem="hurda"),
+            models.StockLog(donanim_tipi="kbd", marka="Logi", miktar=1, islem="girdi"),
+        ]
+    )
+    db_session.commit()
+    before = stock_status_detail(db_session)["items"]
+
+    db_session.query(models.StockBalance).delete()
+    # Bulk deletes bypass the ORM hooks that invalidate cached snapshots.
+    touch(db_session, STOCK)
+    db_session.commit()
+    assert stock_status_detail(db_session)["items"] == []
+
+    written = rebuild_stock_balances(db_session, get_available_columns(db_session))
+    db_session.commit()
+
+    assert written == 2
+    assert _balance(db_session, "mouse").miktar == 3
+    assert stock_status_detail(db_session)["items"] == before
+
+
+def test_ledger_balances_returns_one_row_per_key(db_session):
+    now = datetime.utcnow()
+    db_session.add_all(
+        [
+            models.StockLog(
+                donanim_tipi="monitor",
+                marka="Dell",
+                miktar=4,
+                islem="girdi",
+                tarih=now - timedelta(hours=2),
+                source_type="envanter",
+                source_id=1,
+            ),
+            models.StockLog(
+                donanim_tipi="monitor",
+                marka="Dell",
+                miktar=1,
+                islem="cikti",
+                tarih=now,
+                source_type="yazici",
+                source_id=2,
+            ),
+            models.StockLog(
+                donanim_tipi="monitor",
+                marka="HP",
+                miktar=2,
+                islem="girdi",
+                tarih=now,
+            ),
+        ]
+    )
+    db_session.commit()
+
+    rows = ledger_balances(db_session, get_available_columns(db_session))
+
+    assert [(r["marka"], r["qty"]) for r in rows] == [("Dell", 3), ("HP", 2)]
+    dell = rows[0]
+    assert dell["source_type"] == "yazici"
+    assert dell["source_id"] == 2
+    assert dell["last_tarih"] == now
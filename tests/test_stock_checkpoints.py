@@ -0,0 +1,87 @@
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+from routers.stock import stock_status
+from utils.stock_checkpoint import (
+    ensure_monthly_checkpoints,
+    nearest_checkpoint,
+    stock_balances_as_of,
+)
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def _log(db, tarih, miktar, islem="girdi", donanim="Mouse", marka="Logitech"):
+    db.add(
+        models.StockLog(
+            donanim_tipi=donanim, marka=marka, miktar=miktar, islem=islem, tarih=tarih
+        )
+    )
+    db.commit()
+
+
+def _qty(db, as_of):
+    return {
+        row["donanim_tipi"]: row["qty"] for row in stock_balances_as_of(db, as_of)
+    }
+
+
+def test_monthly_checkpoints_answer_historical_queries(db_session):
+    _log(db_session, datetime(2024, 1, 10), 10)
+    _log(db_session, datetime(2024, 1, 20), 3, "cikti")
+    _log(db_session, datetime(2024, 2, 5), 4, donanim="Klavye", marka=None)
+    _log(db_session, datetime(2024, 3, 2), 2, "atama")
+
+    created = ensure_monthly_checkpoints(db_session, until=datetime(2024, 3, 15))
+    db_session.commit()
+    assert [c.taken_at for c in created] == [datetime(2024, 2, 1), datetime(2024, 3, 1)]
+    assert ensure_monthly_checkpoints(db_session, until=datetime(2024, 3, 15)) == []
+
+    as_of = datetime(2024, 2, 20)
+    assert nearest_checkpoint(db_session, as_of).taken_at == datetime(2024, 2, 1)
+    assert _qty(db_session, datetime(2024, 1, 15)) == {"Mouse": 10}
+    assert _qty(db_session, as_of) == {"Klavye": 4, "Mouse": 7}
+    assert _qty(db_session, datetime(2024, 3, 31)) == {"Klavye": 4, "Mouse": 5}
+
+
+def test_backdated_movements_are_applied_to_existing_checkpoints(db_session):
+    _log(db_session, datetime(2024, 1, 10), 10)
+    ensure_monthly_checkpoints(db_session, until=datetime(2024, 3, 1))
+    db_session.commit()
+
+    _log(db_session, datetime(2024, 1, 25), 6, "hurda")
+
+    assert _qty(db_session, datetime(2024, 2, 10)) == {"Mouse": 4}
+    created = ensure_monthly_checkpoints(db_session, until=datetime(2024, 4, 1))
+    db_session.commit()
+    assert [c.taken_at for c in created] == [datetime(2024, 4, 1)]
+    assert _qty(db_session, datetime(2024, 4, 2)) == {"Mouse": 4}
+
+
+def test_stock_status_as_of(db_session):
+    _log(db_session, datetime(2024, 1, 10), 5)
+    _log(db_session, datetime(2024, 2, 10), 5, "cikti")
+    ensure_monthly_checkpoints(db_session, until=datetime(2024, 3, 1))
+    db_session.commit()
+
+    assert stock_status(db_session) == []
+    rows = stock_status(db_session, as_of=datetime(2024, 1, 31, 23, 59))
+    assert [(r["donanim_tipi"], r["net_miktar"]) for r in rows] == [("Mouse", 5)]
+    assert rows[0]["son_islem_ts"] == datetime(2024, 1, 10)
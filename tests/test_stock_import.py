@@ -0,0 +1,134 @@
+import os
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+from utils.stock_import import StockImportError, import_stock_rows, read_rows
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    db.add_all([models.HardwareType(name="Mouse"), models.Brand(name="Logitech")])
+    db.commit()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def _csv(text):
+    return read_rows(BytesIO(text.encode("utf-8")), "stok.csv")
+
+
+def _import(db, rows, **kwargs):
+    kwargs.setdefault("actor", "ayse")
+    report = import_stock_rows(db, rows, **kwargs)
+    db.commit()
+    return report.as_dict()
+
+
+def test_xlsx_import_writes_logs_totals_and_balances(db_session):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Donanım Tipi", "Marka", "Miktar", "İşlem", "IFS No"])
+    ws.append(["mouse", "Logitech", 5, "Girdi", "IFS-1"])
+    ws.append(["Mouse", "Logitech", 2, "Çıktı", "IFS-1"])
+    buf = BytesIO()
+    wb.save(buf)
+    buf.seek(0)
+
+    report = _import(db_session, read_rows(buf, "stok.xlsx"), batch_size=1)
+
+    assert report["ok"] and report["aktarilan"] == 2
+    assert report["stok_degisimi"] == {"Mouse": 3}
+    logs = db_session.query(models.StockLog).order_by(models.StockLog.id).all()
+    assert [(l.islem, l.miktar, l.actor) for l in logs] == [
+        ("girdi", 5, "ayse"),
+        ("cikti", 2, "ayse"),
+    ]
+    assert db_session.get(models.StockTotal, "Mouse").toplam == 3
+    balance = db_session.query(models.StockBalance).one()
+    assert (balance.marka, balance.ifs_no, balance.miktar) == ("Logitech", "IFS-1", 3)
+
+
+def test_invalid_rows_are_reported_and_skipped(db_session):
+    report = _import(
+        db_session,
+        _csv(
+            "Donanım Tipi;Miktar;İşlem\n"
+            "Mouse;4;girdi\n"
+            "Tarayıcı;1;girdi\n"
+            "Mouse;abc;girdi\n"
+            "Mouse;1;iade\n"
+            "Mouse;9;hurda\n"
+        ),
+    )
+
+    assert report["aktarilan"] == 1
+    assert [(e["satir"], e["hata"]) for e in report["hatalar"]] == [
+        (3, "Bilinmeyen donanım tipi: Tarayıcı"),
+        (4, "Miktar sayı olmalı"),
+        (5, "Geçersiz işlem türü: iade"),
+        (6, "Yetersiz stok: Mouse"),
+    ]
+    assert db_session.get(models.StockTotal, "Mouse").toplam == 4
+
+
+def test_dry_run_writes_nothing(db_session):
+    report = import_stock_rows(
+        db_session, _csv("Donanım Tipi,Miktar\nMouse,3\n"), actor="ayse", dry_run=True
+    )
+
+    assert report.as_dict()["aktarilan"] == 1
+    assert db_session.query(models.StockLog).count() == 0
+    assert db_session.get(models.StockTotal, "Mouse") is None
+
+
+def test_missing_required_columns_is_rejected(db_session):
+    with pytest.raises(StockImportError):
+        _import(db_session, _csv("Marka,Model\nLogitech,M185\n"))
+
+
+def test_batch_ids_follow_row_order(db_session):
+    db_session.add(models.Brand(name="HP"))
+    db_session.commit()
+    _import(
+        db_session,
+        _csv(
+            "Donanım Tipi;Marka;Miktar;İşlem\n"
+            "Mouse;Logitech;1;girdi\n"
+            "Mouse;HP;2;girdi\n"
+            "Mouse;Logitech;3;girdi\n"
+        ),
+    )
+
+    last_ids = {}
+    for log in db_session.query(models.StockLog).order_by(models.StockLog.id):
+        last_ids[log.marka] = log.id
+    balances = {b.marka: b.last_log_id for b in db_session.query(models.StockBalance)}
+    assert balances == last_ids
+
+
+def test_imported_rows_write_events(db_session):
+    _import(
+        db_session,
+        _csv("Donanım Tipi;Miktar;İşlem\nMouse;4;girdi\nMouse;1;cikti\n"),
+        batch_size=1,
+    )
+
+    events = db_session.query(models.Event).order_by(models.Event.id).all()
+    log_ids = [log.id for log in db_session.query(models.StockLog)]
+    assert [(e.entity_type, e.entity_id, e.action) for e in events] == [
+        ("stock", log_ids[0], "girdi"),
+        ("stock", log_ids[1], "cikti"),
+    ]
@@ -0,0 +1,97 @@
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+from utils.stock_integrity import verify_stock_ledger
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def _seed(db):
+    db.add_all(
+        [
+            models.StockLog(
+                donanim_tipi="Mouse",
+                marka="Logitech",
+                miktar=5,
+                islem="girdi",
+                tarih=datetime(2024, 1, 1),
+            ),
+            models.StockLog(
+                donanim_tipi="Mouse",
+                marka="Logitech",
+                miktar=2,
+                islem="cikti",
+                tarih=datetime(2024, 1, 2),
+            ),
+            models.StockLog(
+                donanim_tipi="Klavye", miktar=3, islem="girdi", tarih=datetime(2024, 1, 3)
+            ),
+            models.StockTotal(donanim_tipi="Mouse", toplam=3),
+            models.StockTotal(donanim_tipi="Klavye", toplam=3),
+        ]
+    )
+    db.commit()
+
+
+def test_consistent_tables_pass(db_session):
+    _seed(db_session)
+
+    report = verify_stock_ledger(db_session)
+
+    assert report.ok
+    assert (report.keys_checked, report.types_checked) == (2, 2)
+
+
+def test_drift_is_reported_and_repaired(db_session):
+    _seed(db_session)
+    db_session.query(models.StockTotal).filter_by(donanim_tipi="Mouse").update(
+        {"toplam": 9}
+    )
+    db_session.query(models.StockTotal).filter_by(donanim_tipi="Klavye").delete()
+    db_session.add(models.StockTotal(donanim_tipi="Tarayıcı", toplam=1))
+    db_session.query(models.StockBalance).filter_by(donanim_tipi="Klavye").delete()
+    db_session.query(models.StockBalance).filter_by(donanim_tipi="Mouse").update(
+        {"miktar": 1}
+    )
+    db_session.add(
+        models.StockBalance(stock_key="Ekran|||", donanim_tipi="Ekran", miktar=2)
+    )
+    db_session.commit()
+
+    report = verify_stock_ledger(db_session)
+    assert not report.ok and not report.repaired
+    assert {(t["donanim_tipi"], t["beklenen"], t["mevcut"]) for t in report.totals} == {
+        ("Klavye", 3, None),
+        ("Mouse", 3, 9),
+        ("Tarayıcı", 0, 1),
+    }
+    assert {(b["stock_key"], b["sorun"]) for b in report.balances} == {
+        ("Ekran|||", "fazla"),
+        ("Klavye|||", "eksik"),
+        ("Mouse|Logitech||", "farkli"),
+    }
+
+    repaired = verify_stock_ledger(db_session, repair=True)
+    db_session.commit()
+    assert repaired.repaired
+
+    assert verify_stock_ledger(db_session).ok
+    totals = {t.donanim_tipi: t.toplam for t in db_session.query(models.StockTotal)}
+    assert totals == {"Mouse": 3, "Klavye": 3, "Tarayıcı": 0}
@@ -0,0 +1,125 @@
+import os
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+from routers.stock import stock_movements
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def _movements(db, **filters):
+    params = dict(
+        limit=50,
+        cursor=None,
+        donanim_tipi=None,
+        islem=None,
+        actor=None,
+        ifs_no=None,
+        baslangic=None,
+        bitis=None,
+    )
+    params.update(filters)
+    return stock_movements(db=db, **params)
+
+
+def test_movements_are_paged_by_date_and_id(db_session):
+    same_time = datetime(2024, 5, 1, 12, 0)
+    for n in range(5):
+        db_session.add(
+            models.StockLog(
+                donanim_tipi="mouse", miktar=n + 1, islem="girdi", tarih=same_time
+            )
+        )
+    db_session.add(
+        models.StockLog(
+            donanim_tipi="mouse",
+            miktar=9,
+            islem="cikti",
+            tarih=same_time + timedelta(days=1),
+        )
+    )
+    db_session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        page = _movements(db_session, limit=2, cursor=cursor)
+        seen.extend(item["miktar"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == [9, 5, 4, 3, 2, 1]
+
+
+def test_movement_filters(db_session):
+    hw = models.HardwareType(name="Monitör")
+    db_session.add(hw)
+    db_session.commit()
+    db_session.add_all(
+        [
+            models.StockLog(
+                donanim_tipi=str(hw.id),
+                miktar=1,
+                islem="girdi",
+                actor="ayse",
+                ifs_no="IFS-1",
+                tarih=datetime(2024, 1, 10, 9, 0),
+            ),
+            models.StockLog(
+                donanim_tipi="Monitör",
+                miktar=2,
+                islem="cikti",
+                actor="ali",
+                tarih=datetime(2024, 2, 10, 9, 0),
+            ),
+            models.StockLog(
+                donanim_tipi="Klavye",
+                miktar=3,
+                islem="girdi",
+                actor="ayse",
+                tarih=datetime(2024, 2, 11, 9, 0),
+            ),
+        ]
+    )
+    db_session.commit()
+
+    by_type = _movements(db_session, donanim_tipi="Monitör")["items"]
+    assert [i["miktar"] for i in by_type] == [2, 1]
+    assert {i["donanim_tipi"] for i in by_type} == {"Monitör"}
+
+    assert [i["miktar"] for i in _movements(db_session, islem="Çıktı")["items"]] == [2]
+    assert [i["miktar"] for i in _movements(db_session, actor="ayse")["items"]] == [
+        3,
+        1,
+    ]
+    assert [i["miktar"] for i in _movements(db_session, ifs_no="IFS-1")["items"]] == [
+        1
+    ]
+    february = _movements(
+        db_session, baslangic=date(2024, 2, 1), bitis=date(2024, 2, 10)
+    )["items"]
+    assert [i["miktar"] for i in february] == [2]
+
+
+def test_movements_reject_invalid_cursor(db_session):
+    with pytest.raises(HTTPException) as exc:
+        _movements(db_session, cursor="not-a-cursor")
+    assert exc.value.status_code == 400
@@ -153,6 +153,40 @@ def test_export_stock_uses_status_rows(db_session):
     assert isinstance(rows[1][5], str) and rows[1][5]
 
 
+def test_export_as_of_computes_the_detail_once(db_session, monkeypatch):
+    import routers.stock as stock_router
+
+    db_session.add(
+        StockLog(
+            donanim_tipi="laptop",
+            marka="asus",
+            model="a110",
+            ifs_no="ifs",
+            miktar=2,
+            islem="girdi",
+            tarih=datetime(2024, 1, 1),
+        )
+    )
+    db_session.commit()
+
+    calls = []
+    detail = stock_router.stock_status_detail
+
+    def counted(db, as_of=None):
+        calls.append(as_of)
+        return detail(db, as_of)
+
+    monkeypatch.setattr(stock_router, "stock_status_detail", counted)
+
+    async def run_export():
+        response = await export_stock(db_session, as_of=datetime(2024, 6, 1))
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    rows = list(load_workbook(BytesIO(asyncio.run(run_export()))).active.values)
+    assert rows[1][0:5] == ("laptop", "asus", "a110", "ifs", 2)
+    assert calls == [datetime(2024, 6, 1)]
+
+
 def test_stock_status_handles_missing_optional_columns(db_session):
     # simulate an older schema where extended columns do not exist
     db_session.execute(text("DROP TABLE stock_logs"))
@@ -249,7 +283,7 @@ def test_stock_status_maps_license_id_to_type(db_session):
 
 def test_stock_status_detail_reflection_is_cached(monkeypatch, db_session):
     import routers.api as api_module
-    import utils.stock_log as stock_log_utils
+    import utils.schema_capabilities as capabilities
 
     db_session.add(
         StockLog(
@@ -264,30 +298,23 @@ def test_stock_status_detail_reflection_is_cached(monkeypatch, db_session):
     )
     db_session.commit()
 
-    original_cache = stock_log_utils._AVAILABLE_COLUMNS
-    original_verified = getattr(stock_log_utils, "_CACHE_VERIFIED", False)
-    stock_log_utils._AVAILABLE_COLUMNS = None
-    stock_log_utils._CACHE_VERIFIED = False
+    capabilities.invalidate_capabilities()
 
     inspect_calls = 0
-    original_inspect = stock_log_utils.inspect
+    original_inspect = capabilities.inspect
 
     def tracking_inspect(bind):
         nonlocal inspect_calls
         inspect_calls += 1
         return original_inspect(bind)
 
-    monkeypatch.setattr(stock_log_utils, "inspect", tracking_inspect)
+    monkeypatch.setattr(capabilities, "inspect", tracking_inspect)
 
-    try:
-        api_module.stock_status_detail(db_session)
-        first_call = inspect_calls
-        api_module.stock_status_detail(db_session)
-        assert inspect_calls == first_call
-        assert inspect_calls <= 1
-    finally:
-        stock_log_utils._AVAILABLE_COLUMNS = original_cache
-        stock_log_utils._CACHE_VERIFIED = original_verified
+    api_module.stock_status_detail(db_session)
+    first_call = inspect_calls
+    api_module.stock_status_detail(db_session)
+    assert inspect_calls == first_call
+    assert inspect_calls <= 1
 
 
 def test_system_room_add_and_remove_updates_status(db_session):
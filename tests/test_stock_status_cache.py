@@ -0,0 +1,125 @@
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import models
+from models import DataVersion, HardwareType, StockLog
+from routers.stock import (
+    SystemRoomBulkPayload,
+    SystemRoomItemKey,
+    stock_status,
+    system_room_add,
+    system_room_remove,
+)
+from utils import stock_cache
+from utils.data_version import REFDATA, STOCK, SYSTEM_ROOM
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def _log(**overrides):
+    data = dict(
+        donanim_tipi="monitor",
+        marka="Dell",
+        model="P2422H",
+        ifs_no="IFS-1",
+        miktar=2,
+        islem="girdi",
+        tarih=datetime.utcnow(),
+    )
+    data.update(overrides)
+    return StockLog(**data)
+
+
+def _version(db, name):
+    row = db.get(DataVersion, name)
+    return row.version if row else 0
+
+
+def test_stock_status_snapshot_is_reused_until_ledger_changes(db_session):
+    db_session.add(_log())
+    db_session.commit()
+
+    first = stock_status(db_session)
+    hits = stock_cache.stats()["hits"]
+    second = stock_status(db_session)
+    assert second is first
+    assert stock_cache.stats()["hits"] > hits
+
+    db_session.add(_log(miktar=1, islem="cikti"))
+    db_session.commit()
+
+    third = stock_status(db_session)
+    assert third is not first
+    assert third[0]["net_miktar"] == 1
+    assert _version(db_session, STOCK) >= 2
+
+
+def test_uncommitted_writes_bypass_snapshot(db_session):
+    db_session.add(_log())
+    db_session.commit()
+    cached = stock_status(db_session)
+
+    db_session.add(_log(miktar=3))
+    db_session.flush()
+    pending = stock_status(db_session)
+    assert pending[0]["net_miktar"] == 5
+
+    db_session.rollback()
+    assert stock_status(db_session)[0]["net_miktar"] == cached[0]["net_miktar"]
+
+
+def test_system_room_bulk_remove_bumps_version(db_session):
+    db_session.add(_log())
+    db_session.commit()
+    payload = SystemRoomBulkPayload(
+        items=[
+            SystemRoomItemKey(
+                item_type="envanter",
+                donanim_tipi="monitor",
+                marka="Dell",
+                model="P2422H",
+                ifs_no="IFS-1",
+            )
+        ]
+    )
+
+    system_room_add(payload, db=db_session, user=SimpleNamespace(full_name="T"))
+    assert stock_status(db_session)[0]["system_room"] is True
+    added_version = _version(db_session, SYSTEM_ROOM)
+
+    system_room_remove(payload, db=db_session)
+    assert _version(db_session, SYSTEM_ROOM) == added_version + 1
+    assert stock_status(db_session)[0]["system_room"] is False
+
+
+def test_refdata_rename_invalidates_snapshot(db_session):
+    hardware = HardwareType(name="Monitör")
+    db_session.add(hardware)
+    db_session.commit()
+    db_session.add(_log(donanim_tipi=str(hardware.id)))
+    db_session.commit()
+
+    assert stock_status(db_session)[0]["donanim_tipi"] == "Monitör"
+
+    hardware.name = "Ekran"
+    db_session.commit()
+
+    assert stock_status(db_session)[0]["donanim_tipi"] == "Ekran"
+    assert _version(db_session, REFDATA) >= 2
@@ -0,0 +1,151 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import models
+from routers.lookup import TABLE_SPECS, table_rows
+from utils.table_query import table_page
+
+
+@pytest.fixture()
+def db_session():
+    models.Base.metadata.create_all(models.engine)
+    db = models.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        models.Base.metadata.drop_all(models.engine)
+
+
+def _seed(db):
+    rows = [
+        ("PC-1", "Bursa", "IT", "Dell", None),
+        ("PC-2", "Bursa", "Muhasebe", "HP", None),
+        ("PC-3", "İzmir", "IT", "Lenovo", "aktif"),
+        ("PC-4", None, "IT", "Dell", "arızalı"),
+        ("PC-5", "Bursa", "IT", "Dell", "hurda"),
+    ]
+    for no, fabrika, departman, marka, durum in rows:
+        db.add(
+            models.Inventory(
+                no=no, fabrika=fabrika, departman=departman, marka=marka, durum=durum
+            )
+        )
+    db.commit()
+
+
+def _request(query: str = "") -> Request:
+    return Request(
+        {"type": "http", "method": "GET", "query_string": query.encode(), "headers": []}
+    )
+
+
+def _numbers(page):
+    return [row.no for row in page.rows]
+
+
+def test_scope_filters_and_default_order(db_session):
+    _seed(db_session)
+    spec = TABLE_SPECS["inventory"]
+
+    assert _numbers(table_page(db_session, spec)) == ["PC-4", "PC-3", "PC-2", "PC-1"]
+    page = table_page(db_session, spec, filters={"fabrika": ["Bursa"]})
+    assert _numbers(page) == ["PC-2", "PC-1"]
+    page = table_page(
+        db_session, spec, filters={"fabrika": ["Bursa", "İzmir"], "departman": ["IT"]}
+    )
+    assert _numbers(page) == ["PC-3", "PC-1"]
+    # FILTER_MAP dışındaki kolonlar yok sayılır.
+    page = table_page(db_session, spec, filters={"durum": ["hurda"]})
+    assert len(page.rows) == 4
+
+
+def test_keyset_pages_follow_sort(db_session):
+    _seed(db_session)
+    spec = TABLE_SPECS["inventory"]
+
+    seen = []
+    cursor = None
+    while True:
+        page = table_page(
+            db_session, spec, sort="fabrika", desc=False, cursor=cursor, limit=1
+        )
+        seen += _numbers(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    # Boş fabrika önce, aynı fabrikada id sırası.
+    assert seen == ["PC-4", "PC-1", "PC-2", "PC-3"]
+
+    first = table_page(db_session, spec, sort="marka", limit=2)
+    rest = table_page(db_session, spec, sort="marka", cursor=first.next_cursor)
+    assert _numbers(first) + _numbers(rest) == ["PC-3", "PC-2", "PC-4", "PC-1"]
+    assert rest.next_cursor is None
+
+
+def test_search_uses_full_text_index(db_session):
+    _seed(db_session)
+    spec = TABLE_SPECS["inventory"]
+
+    assert _numbers(table_page(db_session, spec, q="lenovo")) == ["PC-3"]
+    assert _numbers(table_page(db_session, spec, q="izmir")) == ["PC-3"]
+    assert _numbers(table_page(db_session, spec, q="  ")) == [
+        "PC-4",
+        "PC-3",
+        "PC-2",
+        "PC-1",
+    ]
+
+
+def test_table_rows_json_and_html(db_session):
+    _seed(db_session)
+
+    data = table_rows(
+        "inventory",
+        _request("f.marka=Dell&f.departman=IT"),
+        limit=1,
+        db=db_session,
+    )
+    assert [item["no"] for item in data["items"]] == ["PC-4"]
+    assert data["next_cursor"]
+
+    response = table_rows(
+        "inventory",
+        _request(),
+        cursor=data["next_cursor"],
+        format="html",
+        db=db_session,
+        sort=None,
+        limit=50,
+    )
+    body = response.body.decode()
+    assert body.count("<tr") == 3
+    assert "PC-4" not in body and "PC-1" in body
+    assert response.headers["X-Next-Cursor"] == ""
+
+
+def test_table_rows_rejects_unknown_entity_and_cursor(db_session):
+    with pytest.raises(HTTPException) as exc:
+        table_rows("users", _request(), db=db_session, limit=10)
+    assert exc.value.status_code == 404
+
+    with pytest.raises(HTTPException) as exc:
+        table_page(db_session, TABLE_SPECS["printer"], cursor="bozuk")
+    assert exc.value.status_code == 400
+
+
+def test_unsortable_headers_fall_back_to_id(db_session):
+    _seed(db_session)
+    # Şablonlar data-sortable ile yalnızca bu alanları sıralanabilir işaretler.
+    assert not {"no", "mail_adresi"} & set(TABLE_SPECS["license"].sortable)
+    assert "durum" not in TABLE_SPECS["printer"].sortable
+    page = table_page(db_session, TABLE_SPECS["inventory"], sort="durum")
+    assert _numbers(page) == ["PC-4", "PC-3", "PC-2", "PC-1"]
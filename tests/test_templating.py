@@ -0,0 +1,62 @@
+import importlib
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+from jinja2 import FileSystemBytecodeCache
+
+import utils.templating as templating
+from app.main import app
+
+ROUTER_MODULES = (
+    "routers.bilgiler",
+    "routers.home",
+    "routers.inventory",
+    "routers.license",
+    "routers.logs",
+    "routers.lookup",
+    "routers.printers",
+    "routers.printers_scrap_list",
+    "routers.profile",
+    "routers.requests",
+    "routers.stock",
+    "routers.trash",
+    "routes.admin",
+    "routes.talepler",
+)
+
+
+def test_routers_share_one_environment():
+    shared = templating.templates
+    assert app.state.templates is shared
+    for name in ROUTER_MODULES:
+        assert importlib.import_module(name).templates is shared, name
+    assert "humanize_log" in shared.env.filters
+    assert "url_for" in shared.env.globals
+    assert isinstance(shared.env.bytecode_cache, FileSystemBytecodeCache)
+
+
+def test_precompile_fills_cache_and_bytecode(tmp_path, monkeypatch):
+    monkeypatch.setattr(templating, "TEMPLATE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(templating, "TEMPLATE_AUTO_RELOAD", False)
+    target = templating.create_templates()
+    assert target.env.auto_reload is False
+
+    failed = templating.precompile_templates(target)
+    compiled = [
+        name
+        for name in target.env.list_templates()
+        if name.endswith(".html") and name not in failed
+    ]
+    assert len(target.env.cache) == len(compiled)
+    assert any(tmp_path.iterdir())
+
+    # Yeni bir worker ayrıştırmadan bayt kodu önbelleğinden yükler.
+    calls = []
+    warm = templating.create_templates()
+    monkeypatch.setattr(warm.env, "compile", lambda *a, **k: calls.append(a))
+    warm.env.get_template("dashboard.html")
+    assert calls == []
@@ -0,0 +1,94 @@
+"""Recent activity feed built on the unified ``events`` stream.
+
+The newest ``n`` events of the inventory, license, printer and stock modules
+are read backwards through the ``(created_at, id)`` index of ``events`` (see
+:mod:`utils.events`), so the cost depends on ``n`` rather than on the size
+of the logs.  Actor names and entity labels are resolved for the returned
+rows only.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Event, Inventory, License, Printer, User
+from utils.events import INVENTORY, LICENSE, PRINTER, STOCK, decode_payload
+
+RECENT_ACTIVITY_LIMIT = 5
+MAX_RECENT_ACTIVITY = 100
+ACTIVITY_ENTITY_TYPES = (INVENTORY, LICENSE, PRINTER, STOCK)
+
+# entity_type -> (model, label column) for the "Nesne" column of the feed.
+_LABELS = {
+    INVENTORY: (Inventory, Inventory.no),
+    LICENSE: (License, License.lisans_adi),
+    PRINTER: (Printer, Printer.envanter_no),
+}
+
+
+def actor_names(db: Session, usernames) -> dict[str, str]:
+    """Map usernames to display names (full name when known)."""
+
+    usernames = {name for name in usernames if name}
+    if not usernames:
+        return {}
+    rows = db.query(
+        User.username, User.first_name, User.last_name, User.full_name
+    ).filter(User.username.in_(usernames))
+    names = {}
+    for u in rows:
+        full_name = u.full_name or f"{u.first_name or ''} {u.last_name or ''}".strip()
+        names[u.username] = full_name or u.username
+    return names
+
+
+def entity_labels(db: Session, events) -> dict[tuple[str, int], str]:
+    """Return display labels for the entities referenced by ``events``."""
+
+    wanted: dict[str, set[int]] = {}
+    for ev in events:
+        if ev.entity_type in _LABELS and ev.entity_id is not None:
+            wanted.setdefault(ev.entity_type, set()).add(ev.entity_id)
+    labels = {}
+    for entity_type, ids in wanted.items():
+        model, column = _LABELS[entity_type]
+        for entity_id, label in db.execute(
+            select(model.id, column).where(model.id.in_(ids))
+        ):
+            labels[(entity_type, entity_id)] = label
+    return labels
+
+
+def recent_activity(
+    db: Session, limit: int = RECENT_ACTIVITY_LIMIT
+) -> list[SimpleNamespace]:
+    """Return the newest ``limit`` events as ``created_at/actor/action/no``."""
+
+    limit = max(1, min(int(limit), MAX_RECENT_ACTIVITY))
+    rows = db.execute(
+        select(Event)
+        .where(Event.entity_type.in_(ACTIVITY_ENTITY_TYPES))
+        .order_by(Event.created_at.desc(), Event.id.desc())
+        .limit(limit)
+    ).scalars().all()
+
+    names = actor_names(db, (row.actor for row in rows))
+    labels = entity_labels(db, rows)
+
+    def label(row) -> str | None:
+        if row.entity_type == STOCK:
+            return decode_payload(row.payload).get("donanim_tipi")
+        return labels.get((row.entity_type, row.entity_id))
+
+    return [
+        SimpleNamespace(
+            created_at=row.created_at,
+            actor=names.get(row.actor, row.actor),
+            action=row.action,
+            no=label(row),
+        )
+        for row in rows
+    ]
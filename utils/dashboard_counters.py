@@ -0,0 +1,228 @@
+"""Incrementally maintained dashboard statistics.
+
+The dashboard shows how many active inventories, printers and licenses,
+free licenses, faulty devices and open requests there are.  Counting those
+on every visit scans the tables with predicates such as ``durum IS NULL OR
+durum != 'hurda'`` that no index can serve, so the numbers are kept in the
+``dashboard_counters`` table instead.
+
+Every ORM flush that inserts, updates or deletes one of the counted models
+adjusts the affected counters in the same transaction: the old values of
+changed rows are captured in ``before_flush`` and the new ones after the
+flush.  Bulk statements bypass these hooks, so :func:`reconcile_counters`
+recomputes everything from the source tables; it runs on start-up and from
+``python -m scripts.reconcile_dashboard_counters``.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable
+
+from sqlalchemy import delete, event, func, insert, inspect, or_, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.base import NO_VALUE
+
+from models import DashboardCounter, Inventory, License, Printer, Talep, TalepDurum
+
+SCRAPPED = "hurda"
+FAULTY = "arızalı"
+INACTIVE_LICENSE = ("hurda", "stok")
+
+# ``Session.info`` key holding the counter deltas of the running flush.
+_FLUSH_DELTAS = "dashboard_counter_deltas"
+_FLUSH_DIRTY = "dashboard_counter_dirty"
+
+
+@dataclass(frozen=True)
+class CounterSpec:
+    """Contribution of ``model`` rows to the counter ``name``.
+
+    ``matches`` decides membership from a row's ``fields`` values, ``where``
+    is the same predicate in SQL for :func:`reconcile_counters`.
+    """
+
+    name: str
+    model: type
+    fields: tuple[str, ...]
+    matches: Callable[[dict[str, Any]], bool]
+    where: Callable[[], Any]
+
+
+def _active_license(values: dict[str, Any]) -> bool:
+    return values["durum"] not in INACTIVE_LICENSE
+
+
+def _active_license_sql():
+    return or_(License.durum.is_(None), ~License.durum.in_(INACTIVE_LICENSE))
+
+
+COUNTERS = (
+    CounterSpec(
+        "envanter",
+        Inventory,
+        ("durum",),
+        lambda v: v["durum"] != SCRAPPED,
+        lambda: or_(Inventory.durum.is_(None), Inventory.durum != SCRAPPED),
+    ),
+    CounterSpec(
+        "yazici",
+        Printer,
+        ("durum",),
+        lambda v: v["durum"] != SCRAPPED,
+        lambda: or_(Printer.durum.is_(None), Printer.durum != SCRAPPED),
+    ),
+    CounterSpec("lisans", License, ("durum",), _active_license, _active_license_sql),
+    CounterSpec(
+        "bos_lisans",
+        License,
+        ("durum", "inventory_id"),
+        lambda v: _active_license(v) and v["inventory_id"] is None,
+        lambda: _active_license_sql() & License.inventory_id.is_(None),
+    ),
+    CounterSpec(
+        "arizali",
+        Inventory,
+        ("durum",),
+        lambda v: v["durum"] == FAULTY,
+        lambda: Inventory.durum == FAULTY,
+    ),
+    CounterSpec(
+        "arizali",
+        Printer,
+        ("durum",),
+        lambda v: v["durum"] == FAULTY,
+        lambda: Printer.durum == FAULTY,
+    ),
+    CounterSpec(
+        "acik_talep",
+        Talep,
+        ("durum",),
+        lambda v: v["durum"] == TalepDurum.ACIK,
+        lambda: Talep.durum == TalepDurum.ACIK,
+    ),
+)
+COUNTER_NAMES = tuple(dict.fromkeys(spec.name for spec in COUNTERS))
+_SPECS_BY_MODEL: dict[type, list[CounterSpec]] = {}
+for _spec in COUNTERS:
+    _SPECS_BY_MODEL.setdefault(_spec.model, []).append(_spec)
+
+
+def count_all(db: Session) -> dict[str, int]:
+    """Count every statistic directly from the source tables."""
+
+    totals = dict.fromkeys(COUNTER_NAMES, 0)
+    for spec in COUNTERS:
+        totals[spec.name] += (
+            db.execute(select(func.count()).select_from(spec.model).where(spec.where()))
+            .scalar()
+            or 0
+        )
+    return totals
+
+
+def reconcile_counters(db: Session) -> dict[str, tuple[int | None, int]]:
+    """Recompute and store all counters; return ``{name: (old, new)}`` for drift.
+
+    The caller owns the transaction and is expected to commit.
+    """
+
+    table = DashboardCounter.__table__
+    stored = dict(db.execute(select(table.c.name, table.c.value)).all())
+    # Clearing the rows first takes the write lock, so no flush can adjust
+    # the counters between the counts below and the insert.
+    db.execute(delete(table))
+    totals = count_all(db)
+    now = datetime.utcnow()
+    db.execute(
+        insert(table),
+        [
+            {"name": name, "value": value, "reconciled_at": now}
+            for name, value in totals.items()
+        ],
+    )
+    return {
+        name: (stored.get(name), value)
+        for name, value in totals.items()
+        if stored.get(name) != value
+    }
+
+
+def read_counters(db: Session) -> dict[str, int]:
+    """Return the dashboard statistics with a single table read.
+
+    Before the first reconcile the statistics are counted directly.
+    """
+
+    table = DashboardCounter.__table__
+    stored = dict(db.execute(select(table.c.name, table.c.value)).all())
+    if not set(COUNTER_NAMES) <= set(stored):
+        return count_all(db)
+    return {name: int(stored[name] or 0) for name in COUNTER_NAMES}
+
+
+def _old_values(session: Session, obj, fields) -> dict[str, Any]:
+    state = inspect(obj)
+    values = {}
+    unknown = []
+    for name in fields:
+        history = state.attrs[name].history
+        if history.deleted:
+            values[name] = history.deleted[0]
+        elif state.committed_state.get(name, None) is NO_VALUE:
+            # Overwritten without being loaded; the row still holds it.
+            unknown.append(name)
+        else:
+            values[name] = getattr(obj, name)
+    if unknown:
+        mapper = state.mapper
+        pk = dict(zip([c.key for c in mapper.primary_key], state.identity))
+        row = session.connection().execute(
+            select(*[mapper.c[name] for name in unknown]).filter_by(**pk)
+        ).first()
+        values.update(zip(unknown, row or [None] * len(unknown)))
+    return values
+
+
+def _new_values(obj, fields) -> dict[str, Any]:
+    return {name: getattr(obj, name) for name in fields}
+
+
+@event.listens_for(Session, "before_flush")
+def _capture_old_values(session, flush_context, instances) -> None:
+    deltas: Counter = Counter()
+    dirty = []
+    for obj in (*session.dirty, *session.deleted):
+        specs = _SPECS_BY_MODEL.get(type(obj))
+        if not specs or not inspect(obj).persistent:
+            continue
+        if obj not in session.deleted:
+            dirty.append(obj)
+        for spec in specs:
+            if spec.matches(_old_values(session, obj, spec.fields)):
+                deltas[spec.name] -= 1
+    session.info[_FLUSH_DELTAS] = deltas
+    session.info[_FLUSH_DIRTY] = dirty
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_deltas(session, flush_context) -> None:
+    deltas: Counter = session.info.pop(_FLUSH_DELTAS, None) or Counter()
+    dirty = session.info.pop(_FLUSH_DIRTY, None) or []
+    for obj in (*session.new, *dirty):
+        for spec in _SPECS_BY_MODEL.get(type(obj), ()):
+            if spec.matches(_new_values(obj, spec.fields)):
+                deltas[spec.name] += 1
+
+    table = DashboardCounter.__table__
+    for name, delta in deltas.items():
+        if delta:
+            # No row yet means the counters were never reconciled; the
+            # first reconcile counts this change anyway.
+            session.connection().execute(
+                update(table)
+                .where(table.c.name == name)
+                .values(value=table.c.value + delta)
+            )
@@ -0,0 +1,160 @@
+"""Change counters used to invalidate in-process caches.
+
+Every ORM insert/update/delete on a watched model bumps a named counter in
+the ``data_versions`` table inside the writer's transaction, and a
+process-local generation number.  Caches compare :func:`current_versions`
+with the versions they were built from; the database counters make writes
+from other worker processes visible, the local generation catches writes in
+this process immediately.
+
+Bulk statements (``query.delete()``, Core ``insert``) bypass the ORM hooks;
+their callers must use :func:`touch` explicitly.
+"""
+
+from __future__ import annotations
+
+import threading
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, object_session
+
+from models import (
+    Base,
+    Brand,
+    DataVersion,
+    HardwareType,
+    LicenseName,
+    Model,
+    StockLog,
+    StockTotal,
+    SystemRoomItem,
+)
+
+STOCK = "stock"
+SYSTEM_ROOM = "system_room"
+REFDATA = "refdata"
+
+WATCHED_MODELS = {
+    StockLog: STOCK,
+    StockTotal: STOCK,
+    SystemRoomItem: SYSTEM_ROOM,
+    HardwareType: REFDATA,
+    LicenseName: REFDATA,
+    Brand: REFDATA,
+    Model: REFDATA,
+}
+
+# ``Session.info`` key holding the names of the counters a session has
+# bumped but not committed yet; cached data must not be read or stored
+# through such a session.
+PENDING_WRITES = "data_version_pending_writes"
+
+_lock = threading.Lock()
+_local: dict[str, int] = {}
+_schema_generation = 0
+
+
+def local_generation() -> int:
+    """Return the number of watched writes seen by this process."""
+
+    return _schema_generation + sum(_local.values())
+
+
+def local_version(name: str) -> int:
+    """Return the number of writes to ``name`` seen by this process."""
+
+    return _schema_generation + _local.get(name, 0)
+
+
+def _bump_local(name: str) -> None:
+    with _lock:
+        _local[name] = _local.get(name, 0) + 1
+
+
+def _mark_pending(db: Session, name: str) -> None:
+    db.info.setdefault(PENDING_WRITES, set()).add(name)
+
+
+def bump(conn: Connection | Session, name: str) -> None:
+    """Increment the ``data_versions`` counter ``name`` on ``conn``."""
+
+    table = DataVersion.__table__
+    result = conn.execute(
+        update(table)
+        .where(table.c.name == name)
+        .values(version=table.c.version + 1)
+    )
+    if not result.rowcount:
+        conn.execute(insert(table).values(name=name, version=1))
+
+
+def touch(db: Session, *names: str) -> None:
+    """Record a bulk write to the watched tables ``names`` made through ``db``."""
+
+    for name in names:
+        bump(db, name)
+        _mark_pending(db, name)
+        _bump_local(name)
+
+
+def has_pending_writes(db: Session, *names: str) -> bool:
+    """Return whether ``db`` holds uncommitted changes to watched tables.
+
+    With ``names`` only the given counters are considered.
+    """
+
+    wanted = set(names) if names else set(WATCHED_MODELS.values())
+    if wanted & db.info.get(PENDING_WRITES, set()):
+        return True
+    return any(
+        WATCHED_MODELS.get(type(obj)) in wanted
+        for obj in (*db.new, *db.dirty, *db.deleted)
+    )
+
+
+def committed_version(db: Session, name: str) -> int:
+    """Return the committed ``data_versions`` counter ``name``."""
+
+    version = db.execute(
+        select(DataVersion.version).where(DataVersion.name == name)
+    ).scalar()
+    return int(version or 0)
+
+
+def current_versions(db: Session) -> tuple[tuple[str, int], ...]:
+    """Return the committed change counters as a hashable tuple."""
+
+    rows = db.execute(select(DataVersion.name, DataVersion.version)).all()
+    return tuple(sorted((name, int(version or 0)) for name, version in rows))
+
+
+def _watch(model, name: str) -> None:
+    def _changed(mapper, connection, target) -> None:
+        bump(connection, name)
+        session = object_session(target)
+        if session is not None:
+            _mark_pending(session, name)
+        _bump_local(name)
+
+    for kind in ("after_insert", "after_update", "after_delete"):
+        event.listen(model, kind, _changed)
+
+
+for _model, _name in WATCHED_MODELS.items():
+    _watch(_model, _name)
+
+
+@event.listens_for(Base.metadata, "after_create")
+@event.listens_for(Base.metadata, "after_drop")
+def _schema_changed(target, connection, **kw) -> None:
+    # Tables recreated from scratch restart their ids and counters.
+    global _schema_generation
+    with _lock:
+        _schema_generation += 1
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_pending(session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(PENDING_WRITES, None)
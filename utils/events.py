@@ -0,0 +1,280 @@
+"""Unified, append-only activity stream (``events`` table).
+
+Audit data lives in several module specific tables (``inventory_log``,
+``license_logs``, ``printer_histories``, ``stock_logs``, ``fault_records``,
+``talepler``) with different column names.  Every insert into those tables
+also writes one :class:`models.Event` row in the same transaction, through
+the ORM hooks registered here, so timelines and audit screens can query a
+single table indexed by ``(created_at, id)``, ``(entity_type, entity_id)``
+and ``actor``.  Fault and request status changes are recorded as events as
+well.
+
+Writes that bypass the ORM (the legacy ``stock_logs`` INSERT) call
+:func:`record_event` explicitly.  :func:`backfill_events` fills the table
+from the existing logs once.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import event, insert, inspect, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from models import (
+    Event,
+    FaultRecord,
+    InventoryLog,
+    LicenseLog,
+    PrinterHistory,
+    StockLog,
+    Talep,
+)
+
+INVENTORY = "inventory"
+LICENSE = "license"
+PRINTER = "printer"
+STOCK = "stock"
+FAULT = "fault"
+TALEP = "talep"
+
+BATCH_SIZE = 1000
+
+
+def _get(row: Any, name: str) -> Any:
+    if isinstance(row, dict):
+        return row.get(name)
+    return getattr(row, name, None)
+
+
+def _compact(data: dict[str, Any] | None) -> str | None:
+    data = {k: v for k, v in (data or {}).items() if v not in (None, "", {}, [])}
+    if not data:
+        return None
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def decode_payload(payload: str | None) -> dict[str, Any]:
+    """Return the ``payload`` of an event as a dict."""
+
+    if not payload:
+        return {}
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _diff(before: Any, after: Any) -> dict[str, list[Any]]:
+    before = before if isinstance(before, dict) else {}
+    after = after if isinstance(after, dict) else {}
+    return {
+        key: [before.get(key), after.get(key)]
+        for key in {**before, **after}
+        if before.get(key) != after.get(key)
+    }
+
+
+def _status(value: Any) -> str:
+    return str(getattr(value, "value", value) or "")
+
+
+def inventory_log_event(row: Any) -> dict[str, Any]:
+    return {
+        "entity_type": INVENTORY,
+        "entity_id": _get(row, "inventory_id"),
+        "action": _get(row, "action") or "",
+        "actor": _get(row, "actor"),
+        "created_at": _get(row, "created_at"),
+        "payload": _compact(
+            {
+                "note": _get(row, "note"),
+                "changes": _diff(_get(row, "before_json"), _get(row, "after_json")),
+            }
+        ),
+    }
+
+
+def license_log_event(row: Any) -> dict[str, Any]:
+    return {
+        "entity_type": LICENSE,
+        "entity_id": _get(row, "license_id"),
+        "action": _get(row, "islem") or "",
+        "actor": _get(row, "islem_yapan"),
+        "created_at": _get(row, "tarih"),
+        "payload": _compact({"detail": _get(row, "detay")}),
+    }
+
+
+def printer_history_event(row: Any) -> dict[str, Any]:
+    return {
+        "entity_type": PRINTER,
+        "entity_id": _get(row, "printer_id"),
+        "action": _get(row, "action") or "",
+        "actor": _get(row, "actor"),
+        "created_at": _get(row, "created_at"),
+        "payload": _compact({"changes": _get(row, "changes")}),
+    }
+
+
+def stock_log_event(row: Any) -> dict[str, Any]:
+    return {
+        "entity_type": STOCK,
+        "entity_id": _get(row, "id"),
+        "action": _get(row, "islem") or "",
+        "actor": _get(row, "actor"),
+        "created_at": _get(row, "tarih"),
+        "payload": _compact(
+            {
+                name: _get(row, name)
+                for name in (
+                    "donanim_tipi",
+                    "marka",
+                    "model",
+                    "ifs_no",
+                    "miktar",
+                    "source_type",
+                    "source_id",
+                    "aciklama",
+                )
+            }
+        ),
+    }
+
+
+def fault_event(row: Any, *, resolved: bool = False) -> dict[str, Any]:
+    return {
+        "entity_type": FAULT,
+        "entity_id": _get(row, "id"),
+        "action": _status(_get(row, "status")),
+        "actor": _get(row, "resolved_by" if resolved else "created_by"),
+        "created_at": _get(row, "resolved_at" if resolved else "created_at"),
+        "payload": _compact(
+            {
+                "entity_type": _get(row, "entity_type"),
+                "entity_id": _get(row, "entity_id"),
+                "device_no": _get(row, "device_no"),
+                "reason": _get(row, "reason"),
+                "note": _get(row, "note") if resolved else None,
+            }
+        ),
+    }
+
+
+def talep_event(row: Any, *, closed: bool = False) -> dict[str, Any]:
+    return {
+        "entity_type": TALEP,
+        "entity_id": _get(row, "id"),
+        "action": _status(_get(row, "durum")) if closed else "create",
+        "actor": None,
+        "created_at": _get(row, "kapanma_tarihi" if closed else "olusturma_tarihi"),
+        "payload": _compact(
+            {
+                "tur": _status(_get(row, "tur")),
+                "donanim_tipi": _get(row, "donanim_tipi"),
+                "miktar": _get(row, "miktar"),
+                "karsilanan_miktar": _get(row, "karsilanan_miktar") if closed else None,
+            }
+        ),
+    }
+
+
+def record_events(conn: Connection | Session, events: Iterable[dict[str, Any]]) -> None:
+    """Insert ``events`` (dicts of :class:`models.Event` columns) in bulk."""
+
+    now = datetime.utcnow()
+    rows = [{**e, "created_at": e.get("created_at") or now} for e in events]
+    if rows:
+        conn.execute(insert(Event.__table__), rows)
+
+
+def record_event(conn: Connection | Session, **fields: Any) -> None:
+    """Insert a single event; ``fields`` are :class:`models.Event` columns."""
+
+    record_events(conn, [fields])
+
+
+# -- ORM hooks -----------------------------------------------------------------
+
+_INSERT_BUILDERS = {
+    InventoryLog: inventory_log_event,
+    LicenseLog: license_log_event,
+    PrinterHistory: printer_history_event,
+    StockLog: stock_log_event,
+    FaultRecord: fault_event,
+    Talep: talep_event,
+}
+
+
+def _watch_inserts(model, builder) -> None:
+    @event.listens_for(model, "after_insert")
+    def _inserted(mapper, connection, target) -> None:
+        record_event(connection, **builder(target))
+
+
+for _model, _builder in _INSERT_BUILDERS.items():
+    _watch_inserts(_model, _builder)
+
+
+@event.listens_for(FaultRecord, "after_update")
+def _fault_updated(mapper, connection, target) -> None:
+    if inspect(target).attrs.status.history.has_changes():
+        data = fault_event(target, resolved=target.resolved_at is not None)
+        if target.resolved_at is None:
+            # Re-opened record: ``created_at`` is the original report.
+            data["created_at"] = target.updated_at
+        record_event(connection, **data)
+
+
+@event.listens_for(Talep, "after_update")
+def _talep_updated(mapper, connection, target) -> None:
+    if inspect(target).attrs.durum.history.has_changes():
+        record_event(connection, **talep_event(target, closed=True))
+
+
+# -- Backfill --------------------------------------------------------------------
+
+
+def _existing_events(db: Session) -> Iterator[dict[str, Any]]:
+    sources = (
+        (InventoryLog, inventory_log_event),
+        (LicenseLog, license_log_event),
+        (PrinterHistory, printer_history_event),
+        (StockLog, stock_log_event),
+    )
+    for model, builder in sources:
+        for row in db.query(model).yield_per(BATCH_SIZE):
+            yield builder(row)
+    for row in db.query(FaultRecord).yield_per(BATCH_SIZE):
+        yield fault_event(row)
+        if row.resolved_at is not None:
+            yield fault_event(row, resolved=True)
+    for row in db.query(Talep).yield_per(BATCH_SIZE):
+        yield talep_event(row)
+        if row.kapanma_tarihi is not None:
+            yield talep_event(row, closed=True)
+
+
+def backfill_events(db: Session) -> int:
+    """Copy the existing logs into an empty ``events`` table.
+
+    Returns the number of events written (0 when the table already has
+    rows).  The caller owns the transaction and is expected to commit.
+    """
+
+    if db.execute(select(Event.id).limit(1)).first() is not None:
+        return 0
+    count = 0
+    batch: list[dict[str, Any]] = []
+    for data in _existing_events(db):
+        batch.append(data)
+        if len(batch) >= BATCH_SIZE:
+            record_events(db, batch)
+            count += len(batch)
+            batch = []
+    record_events(db, batch)
+    return count + len(batch)
@@ -0,0 +1,200 @@
+"""Cold storage for old audit log entries.
+
+``inventory_log``, ``license_logs`` and ``printer_histories`` only grow, and
+almost every read concerns recent history.  :func:`archive_old_logs` moves
+the entries older than ``LOG_ARCHIVE_AFTER_DAYS`` into a separate SQLite
+file (``LOG_ARCHIVE_URL``, by default ``<main db>_archive.db`` next to the
+main database) so the operational database stays small and its page cache
+hot.  ``python -m scripts.archive_logs`` runs it as a scheduled job.
+
+Entries are archived strictly by age, so everything in the archive is older
+than what is left in the main tables.  Readers therefore query the main
+tables first and only read through to the archive when older history is
+asked for: when a paged listing runs past the live entries, or when a detail
+page explicitly requests the archived history.  The archive file is never
+created by readers; without it every lookup returns nothing.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from sqlalchemy import (
+    Column,
+    Index,
+    MetaData,
+    Table,
+    create_engine,
+    delete,
+    insert,
+    select,
+)
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session
+
+from models import DATABASE_URL, InventoryLog, LicenseLog, PrinterHistory
+
+BATCH_SIZE = 1000
+
+
+def _default_archive_url() -> str | None:
+    url = make_url(DATABASE_URL)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    path = Path(url.database)
+    return f"sqlite:///{path.with_name(f'{path.stem}_archive.db').as_posix()}"
+
+
+LOG_ARCHIVE_URL = os.getenv("LOG_ARCHIVE_URL") or _default_archive_url()
+LOG_ARCHIVE_AFTER_DAYS = int(os.getenv("LOG_ARCHIVE_AFTER_DAYS", "365"))
+
+
+@dataclass(frozen=True)
+class ArchiveSpec:
+    """How the entries of ``model`` are aged (``timestamp``) and owned."""
+
+    model: type
+    timestamp: str
+    owner: str
+
+
+ARCHIVED_LOGS = (
+    ArchiveSpec(InventoryLog, "created_at", "inventory_id"),
+    ArchiveSpec(LicenseLog, "tarih", "license_id"),
+    ArchiveSpec(PrinterHistory, "created_at", "printer_id"),
+)
+_SPECS = {spec.model: spec for spec in ARCHIVED_LOGS}
+
+archive_metadata = MetaData()
+
+
+def _archive_table(spec: ArchiveSpec) -> Table:
+    # Same columns as the live table, without the foreign keys: the owners
+    # stay in the main database and may be deleted later.
+    source = spec.model.__table__
+    return Table(
+        source.name,
+        archive_metadata,
+        *(Column(c.name, c.type, primary_key=c.primary_key) for c in source.columns),
+        Index(f"ix_{source.name}_owner", spec.owner, spec.timestamp),
+        Index(f"ix_{source.name}_{spec.timestamp}", spec.timestamp, "id"),
+    )
+
+
+ARCHIVE_TABLES = {spec.model: _archive_table(spec) for spec in ARCHIVED_LOGS}
+
+_engines: dict[str, Engine] = {}
+
+
+def get_archive_engine(create: bool = False) -> Engine | None:
+    """Return the engine of the archive database.
+
+    Returns ``None`` when no archive is configured or, unless ``create`` is
+    set, when the archive file does not exist yet.
+    """
+
+    url = LOG_ARCHIVE_URL
+    if not url:
+        return None
+    if url not in _engines:
+        database = make_url(url).database
+        if database and not create and not Path(database).exists():
+            return None
+        if database:
+            Path(database).parent.mkdir(parents=True, exist_ok=True)
+        engine = create_engine(url)
+        archive_metadata.create_all(engine)
+        _engines[url] = engine
+    return _engines[url]
+
+
+def archive_table(model) -> Table:
+    """Return the archive counterpart of ``model``'s table."""
+
+    return ARCHIVE_TABLES[model]
+
+
+def archive_old_logs(
+    db: Session,
+    *,
+    older_than_days: int | None = None,
+    now: datetime | None = None,
+    engine: Engine | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> dict[str, int]:
+    """Move log entries older than ``older_than_days`` into the archive.
+
+    Each batch is first committed to the archive and then deleted from the
+    main database, which is committed as well; an interrupted run leaves
+    entries in both places and the next run finishes moving them.  Returns
+    the number of entries moved per table.
+    """
+
+    days = LOG_ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    cutoff = (now or datetime.utcnow()) - timedelta(days=days)
+    engine = engine or get_archive_engine(create=True)
+    if engine is None:
+        raise ValueError("Arşiv veritabanı yapılandırılmamış (LOG_ARCHIVE_URL)")
+    archive_metadata.create_all(engine)
+
+    moved = {}
+    for spec in ARCHIVED_LOGS:
+        source = spec.model.__table__
+        target = ARCHIVE_TABLES[spec.model]
+        stmt = (
+            select(source)
+            .where(source.c[spec.timestamp] < cutoff)
+            .order_by(source.c.id)
+            .limit(batch_size)
+        )
+        count = 0
+        while True:
+            rows = [dict(row) for row in db.execute(stmt).mappings()]
+            if not rows:
+                break
+            with engine.begin() as conn:
+                conn.execute(insert(target).prefix_with("OR IGNORE"), rows)
+            db.execute(
+                delete(source).where(source.c.id.in_([row["id"] for row in rows]))
+            )
+            db.commit()
+            count += len(rows)
+        moved[source.name] = count
+    return moved
+
+
+def archived_rows(model, *criteria, limit: int | None = None) -> list[Any]:
+    """Return archived entries of ``model`` matching ``criteria``, newest first.
+
+    ``criteria`` are expressed on :func:`archive_table` columns.  Rows are
+    returned as namespaces with the attributes of the live model.
+    """
+
+    engine = get_archive_engine()
+    if engine is None:
+        return []
+    table = ARCHIVE_TABLES[model]
+    timestamp = table.c[_SPECS[model].timestamp]
+    stmt = select(table).where(*criteria).order_by(timestamp.desc(), table.c.id.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    with engine.connect() as conn:
+        return [SimpleNamespace(**row) for row in conn.execute(stmt).mappings()]
+
+
+def archived_history(model, owner_id: int) -> list[Any]:
+    """Return the archived history of one inventory, license or printer."""
+
+    table = ARCHIVE_TABLES[model]
+    return archived_rows(model, table.c[_SPECS[model].owner] == owner_id)
+
+
+def archive_available() -> bool:
+    """Whether an archive exists that older history can be read from."""
+
+    return get_archive_engine() is not None
@@ -0,0 +1,107 @@
+"""Turkish-aware search keys for name lookups.
+
+SQLite's ``LOWER``/``LIKE`` only fold ASCII, so "İstanbul", "ışık" or
+"ŞUBE" never match a lower-case query, and ``LOWER(name) LIKE '%q%'``
+cannot use an index either.  Reference tables, and the person and number
+columns of users, inventories, printers and licenses, therefore keep a
+persisted ``*_norm`` shadow column holding :func:`normalize_search` of the
+value; it is filled on write by the models and indexed, so a prefix search
+becomes an index range scan (:func:`prefix_bounds`).  Substring searches
+(:func:`contains_match`) still scan, but match Turkish letters correctly.
+Columns without a key column are folded in SQL by :func:`normalized`.
+
+This module must not import :mod:`models`.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from typing import Any
+
+from sqlalchemy import func
+
+# ``str.lower`` turns "I" into "i" and "İ" into "i̇"; in Turkish they are
+# "ı" and "i".  Both end up as "i" once ``ı`` is folded below.
+_TURKISH_UPPER = str.maketrans({"I": "ı", "İ": "i"})
+_TURKISH_FOLD = str.maketrans({"ı": "i"})
+# Harfler ``LOWER`` öncesi/sonrası ASCII karşılığına çevrilir (bkz. normalized).
+_SQL_FOLD = (
+    ("İ", "i"),
+    ("I", "i"),
+    ("ı", "i"),
+    ("Ç", "c"),
+    ("ç", "c"),
+    ("Ğ", "g"),
+    ("ğ", "g"),
+    ("Ö", "o"),
+    ("ö", "o"),
+    ("Ş", "s"),
+    ("ş", "s"),
+    ("Ü", "u"),
+    ("ü", "u"),
+    ("Â", "a"),
+    ("â", "a"),
+    ("Î", "i"),
+    ("î", "i"),
+    ("Û", "u"),
+    ("û", "u"),
+)
+
+
+def normalize_search(value: Any) -> str | None:
+    """Return the search key of ``value``.
+
+    Turkish-aware lower-casing, diacritics removed (ç→c, ğ→g, ı→i, ö→o,
+    ş→s, ü→u, â→a …) and whitespace collapsed.  ``None`` stays ``None``.
+    """
+
+    if value is None:
+        return None
+    text = " ".join(str(value).split())
+    text = text.translate(_TURKISH_UPPER).lower().translate(_TURKISH_FOLD)
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def prefix_bounds(value: Any) -> tuple[str, str] | None:
+    """Return ``(low, high)`` so that ``low <= key < high`` means "starts with".
+
+    ``None`` when ``value`` normalizes to an empty key.
+    """
+
+    prefix = normalize_search(value)
+    if not prefix:
+        return None
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def prefix_match(column, value: Any):
+    """SQL criterion: the normalized ``column`` starts with ``value``."""
+
+    bounds = prefix_bounds(value)
+    if bounds is None:
+        return None
+    low, high = bounds
+    return (column >= low) & (column < high)
+
+
+def normalized(column):
+    """SQL expression folding ``column`` like :func:`normalize_search`.
+
+    Covers the Turkish letters and circumflexes on top of ``LOWER``; meant
+    for columns without a persisted ``*_norm`` key.
+    """
+
+    expr = column
+    for letter, folded in _SQL_FOLD:
+        expr = func.replace(expr, letter, folded)
+    return func.lower(expr)
+
+
+def contains_match(column, value: Any):
+    """SQL criterion: the normalized ``column`` contains ``value``."""
+
+    key = normalize_search(value)
+    if not key:
+        return None
+    return func.instr(column, key) > 0
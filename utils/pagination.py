@@ -0,0 +1,81 @@
+"""Keyset pagination helpers for ``(timestamp, id)`` and ``(key, id)`` lists.
+
+Pages are requested with an opaque cursor that carries the sort key of the
+last row already shown, so the next page is read straight from a
+``(timestamp, id)`` index instead of skipping rows with ``OFFSET``.
+:func:`encode_key_cursor`/:func:`after_key` do the same for lists sorted by
+any other (non-null) key in either direction.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(timestamp: Optional[datetime], row_id: int) -> str:
+    """Return the cursor pointing after the row ``(timestamp, row_id)``."""
+
+    return f"{timestamp.isoformat() if timestamp else ''}|{row_id}"
+
+
+def decode_cursor(cursor: str) -> tuple[Optional[datetime], int]:
+    """Parse a cursor made by :func:`encode_cursor`; 400 when malformed."""
+
+    try:
+        timestamp_raw, id_raw = cursor.rsplit("|", 1)
+        timestamp = datetime.fromisoformat(timestamp_raw) if timestamp_raw else None
+        return timestamp, int(id_raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Geçersiz sayfa imleci.")
+
+
+def after_cursor(timestamp_col, id_col, cursor: str):
+    """Criterion selecting the rows after ``cursor`` in descending order.
+
+    Rows without a timestamp sort last, as SQLite orders ``NULL`` lowest.
+    """
+
+    last_ts, last_id = decode_cursor(cursor)
+    if last_ts is None:
+        return and_(timestamp_col.is_(None), id_col < last_id)
+    return or_(
+        timestamp_col < last_ts,
+        and_(timestamp_col == last_ts, id_col < last_id),
+        timestamp_col.is_(None),
+    )
+
+
+def encode_key_cursor(key: Any, row_id: int) -> str:
+    """Return the cursor pointing after the row ``(key, row_id)``."""
+
+    raw = json.dumps([key, row_id], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_key_cursor(cursor: str) -> tuple[Any, int]:
+    """Parse a cursor made by :func:`encode_key_cursor`; 400 when malformed."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return key, int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Geçersiz sayfa imleci.")
+
+
+def after_key(key_col, id_col, cursor: str, *, descending: bool = True):
+    """Criterion selecting the rows after ``cursor`` in ``(key, id)`` order.
+
+    ``key_col`` must not be ``NULL``; wrap nullable columns in ``coalesce``.
+    """
+
+    last_key, last_id = decode_key_cursor(cursor)
+    if descending:
+        return or_(key_col < last_key, and_(key_col == last_key, id_col < last_id))
+    return or_(key_col > last_key, and_(key_col == last_key, id_col > last_id))
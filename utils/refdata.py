@@ -0,0 +1,124 @@
+"""In-process resolver for reference data (hardware types, licence names,
+brands and models).
+
+Stock and request records store these values either as the reference row
+id (``"3"``) or as the display name.  Screens used to rebuild id→name maps
+with full table scans (or ``CAST`` joins) on every request; this module
+loads the four tables once per process and answers id/name/casefold lookups
+from memory.  The snapshot is reloaded only when the ``refdata`` counter of
+:mod:`utils.data_version` moves, which every ORM write to these tables
+(refdata, catalog and picker screens) bumps.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Hashable
+
+from sqlalchemy.orm import Session
+
+from models import Brand, HardwareType, LicenseName, Model
+from utils.data_version import (
+    REFDATA,
+    committed_version,
+    has_pending_writes,
+    local_version,
+)
+
+
+class NameMap:
+    """Two-way ``id ↔ name`` lookup for a single reference table."""
+
+    def __init__(self, pairs: list[tuple[Any, Any]]):
+        self.by_id: dict[str, str] = {}
+        for row_id, name in pairs:
+            if name:
+                self.by_id[str(row_id)] = str(name)
+        self.by_name: dict[str, str] = {
+            name.strip().casefold(): row_id for row_id, name in self.by_id.items()
+        }
+
+    def name(self, value: Any) -> str | None:
+        """Return the name for an id value, ``None`` if ``value`` is no id."""
+
+        if value is None:
+            return None
+        return self.by_id.get(str(value).strip())
+
+    def display(self, value: Any) -> Any:
+        """Return the name for an id value, otherwise ``value`` unchanged."""
+
+        return self.name(value) or value
+
+    def id_for(self, name: Any) -> str | None:
+        """Return the id of the row named ``name`` (case-insensitive)."""
+
+        if name is None:
+            return None
+        return self.by_name.get(str(name).strip().casefold())
+
+    def canon(self, value: Any) -> str:
+        """Return a casefolded comparison key for an id or a name."""
+
+        if value is None:
+            return ""
+        text = str(value).strip()
+        if not text:
+            return ""
+        mapped = self.by_id.get(text)
+        if mapped is None:
+            alt = self.by_name.get(text.casefold())
+            mapped = self.by_id.get(alt) if alt else None
+        return (mapped or text).strip().casefold()
+
+    def names(self) -> list[str]:
+        return list(self.by_id.values())
+
+
+class RefData:
+    """Immutable snapshot of the reference tables."""
+
+    def __init__(self, db: Session):
+        self.hardware = NameMap(db.query(HardwareType.id, HardwareType.name).all())
+        self.licenses = NameMap(db.query(LicenseName.id, LicenseName.name).all())
+        self.brands = NameMap(db.query(Brand.id, Brand.name).all())
+        self.models = NameMap(db.query(Model.id, Model.name).all())
+        # Stock rows may carry either a hardware type or a licence name in
+        # ``donanim_tipi``; licence ids win on collisions as they always did
+        # in stock assignment.
+        self.types = NameMap(
+            [*self.hardware.by_id.items(), *self.licenses.by_id.items()]
+        )
+
+    def type_name(self, value: Any) -> str | None:
+        """Resolve a ``donanim_tipi`` id, preferring hardware types."""
+
+        return self.hardware.name(value) or self.licenses.name(value)
+
+
+_lock = threading.Lock()
+_cached: tuple[Hashable, RefData] | None = None
+
+
+def get_refdata(db: Session) -> RefData:
+    """Return the reference-data snapshot, reloading it when it changed."""
+
+    global _cached
+
+    if has_pending_writes(db, REFDATA):
+        return RefData(db)
+
+    key = (
+        id(db.get_bind()),
+        local_version(REFDATA),
+        committed_version(db, REFDATA),
+    )
+    with _lock:
+        cached = _cached
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    refdata = RefData(db)
+    with _lock:
+        _cached = (key, refdata)
+    return refdata
@@ -1,11 +1,11 @@
 """Utilities for exporting request data to Excel workbooks."""
 from __future__ import annotations
 
-from io import BytesIO
 from typing import Any, Callable, Iterable, Sequence
 
 from fastapi.responses import StreamingResponse
-from openpyxl import Workbook
+
+from utils.excel_export import workbook_response
 
 RowBuilder = Callable[[Any], Sequence[Any]]
 
@@ -20,7 +20,8 @@ def export_requests_workbook(
 
     Args:
         rows: Iterable of database rows that will be exported. Each row is passed to
-            ``row_builder`` to create the Excel row content.
+            ``row_builder`` to create the Excel row content. Rows are consumed
+            lazily, so a ``yield_per`` query iterator keeps memory bounded.
         headers: Column titles to be written as the first row of the workbook.
         row_builder: Callable that receives each row and returns a sequence of values
             representing a single Excel row.
@@ -30,22 +31,6 @@ def export_requests_workbook(
         A ``StreamingResponse`` containing the generated workbook.
     """
 
-    wb = Workbook()
-    ws = wb.active
-    ws.append(list(headers))
-
-    for row in rows:
-        ws.append(list(row_builder(row)))
-
-    stream = BytesIO()
-    wb.save(stream)
-    stream.seek(0)
-
-    headers_dict = {
-        "Content-Disposition": f"attachment; filename={filename}",
-    }
-    return StreamingResponse(
-        stream,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers=headers_dict,
+    return workbook_response(
+        [("Talepler", headers, (row_builder(row) for row in rows))], filename
     )
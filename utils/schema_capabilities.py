@@ -0,0 +1,103 @@
+"""Process-wide registry of the columns the database tables really have.
+
+Old deployments are migrated in place at start-up (:mod:`app.db.init`), so a
+table may lack columns its ORM model declares until then, or for good when
+the database is managed by another tool.  Code that tolerates such schemas
+asks :func:`table_capabilities` instead of reflecting on every call: the
+columns of a table are read once per process and kept until
+:func:`invalidate_capabilities` runs, which the start-up migrations and
+``create_all``/``drop_all`` do.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+import models
+from models import Base
+
+_lock = threading.Lock()
+_registry: dict[str, "TableCapabilities"] = {}
+
+
+@dataclass(frozen=True)
+class TableCapabilities:
+    """The physical columns of one table.
+
+    ``has_<column>`` attributes are boolean flags (``caps.has_marka``);
+    ``missing`` holds the model columns the table lacks.
+    """
+
+    table: str
+    columns: frozenset[str]
+    missing: frozenset[str]
+
+    def __getattr__(self, name: str) -> bool:
+        if name.startswith("has_"):
+            return name[4:] in self.columns
+        raise AttributeError(name)
+
+    def has(self, *names: str) -> bool:
+        return all(name in self.columns for name in names)
+
+
+def _model_columns(table: str) -> frozenset[str]:
+    model_table = Base.metadata.tables.get(table)
+    if model_table is None:
+        return frozenset()
+    return frozenset(col.name for col in model_table.columns)
+
+
+def _reflect(table: str, db: Session | None) -> frozenset[str]:
+    try:
+        if db is not None:
+            columns = inspect(db.connection()).get_columns(table)
+        else:
+            with models.engine.connect() as conn:
+                columns = inspect(conn).get_columns(table)
+    except SQLAlchemyError:  # pragma: no cover - reflection failures
+        return frozenset()
+    return frozenset(col["name"] for col in columns)
+
+
+def table_capabilities(table: str, db: Session | None = None) -> TableCapabilities:
+    """Return the capabilities of ``table``, reflecting it on first use.
+
+    ``db`` is preferred for the reflection so it runs inside the caller's
+    transaction.  A table that does not exist (yet) reports the model
+    columns and is not cached, so it is reflected again once created.
+    """
+
+    caps = _registry.get(table)
+    if caps is not None:
+        return caps
+
+    with _lock:
+        caps = _registry.get(table)
+        if caps is not None:
+            return caps
+        declared = _model_columns(table)
+        columns = _reflect(table, db)
+        if not columns:
+            return TableCapabilities(table, declared, frozenset())
+        caps = TableCapabilities(table, columns, declared - columns)
+        _registry[table] = caps
+        return caps
+
+
+def invalidate_capabilities() -> None:
+    """Forget every reflected table; call after the schema has changed."""
+
+    with _lock:
+        _registry.clear()
+
+
+@event.listens_for(Base.metadata, "after_create")
+@event.listens_for(Base.metadata, "after_drop")
+def _schema_changed(target, connection, **kw) -> None:
+    invalidate_capabilities()
@@ -0,0 +1,314 @@
+"""Paged listing of scrapped inventories, licenses and printers.
+
+The scrap page merges three sources: inventories and licenses with
+``durum = 'hurda'`` and the printer snapshots in ``scrap_printers``.  A
+``UNION ALL`` of their ``(tip, id, tarih, baslik)`` keys is filtered, sorted
+and paged in SQL, then only the rows of the requested page are loaded: one
+query per source plus a single window query for the latest inventory logs.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import String, cast, func, literal, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from models import Inventory, InventoryLog, License, ScrapPrinter
+from utils.normalize import contains_match, normalize_search, normalized
+
+SCRAPPED = "hurda"
+SCRAP_TYPES = ("envanter", "lisans", "yazici")
+SCRAP_PAGE_SIZE = 50
+SCRAP_PAGE_MAX = 200
+# Latest log entries shown under each scrapped inventory.
+SCRAP_LOG_LIMIT = 5
+SORT_FIELDS = ("tarih", "baslik", "tip")
+
+
+@dataclass
+class ScrapPage:
+    items: list[dict[str, Any]]
+    total: int
+    page: int
+    per_page: int
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.total // self.per_page))
+
+
+def _json_field(column, name: str):
+    return func.coalesce(func.json_extract(column, f"$.{name}"), "")
+
+
+def _title(*parts):
+    expr = parts[0]
+    for part in parts[1:]:
+        expr = expr + " " + part
+    return func.trim(expr)
+
+
+def _matches(term: str, *columns, keys=()):
+    """``term`` occurs in one of ``keys`` (``*_norm`` columns) or ``columns``.
+
+    ``instr`` compares literally, so ``%`` and ``_`` in the term need no
+    escaping.
+    """
+
+    return or_(
+        *(contains_match(key, term) for key in keys),
+        *(contains_match(normalized(column), term) for column in columns),
+    )
+
+
+def _sources(term: str | None):
+    printer_fields = {
+        name: _json_field(ScrapPrinter.snapshot, name)
+        for name in (
+            "marka",
+            "model",
+            "seri_no",
+            "fabrika",
+            "kullanim_alani",
+            "sorumlu_personel",
+            "bagli_envanter_no",
+        )
+    }
+    inventory = select(
+        literal("envanter").label("tip"),
+        Inventory.id.label("id"),
+        Inventory.tarih.label("tarih"),
+        _title(
+            func.coalesce(Inventory.marka, ""), func.coalesce(Inventory.model, "")
+        ).label("baslik"),
+    ).where(Inventory.durum == SCRAPPED)
+    license_ = select(
+        literal("lisans").label("tip"),
+        License.id.label("id"),
+        License.tarih.label("tarih"),
+        func.coalesce(License.lisans_adi, "").label("baslik"),
+    ).where(License.durum == SCRAPPED)
+    printer = select(
+        literal("yazici").label("tip"),
+        ScrapPrinter.id.label("id"),
+        ScrapPrinter.created_at.label("tarih"),
+        _title(printer_fields["marka"], printer_fields["model"]).label("baslik"),
+    )
+    if term:
+        inventory = inventory.where(
+            _matches(
+                term,
+                Inventory.marka,
+                Inventory.model,
+                Inventory.departman,
+                Inventory.bagli_envanter_no,
+                Inventory.kullanim_alani,
+                Inventory.not_,
+                keys=(
+                    Inventory.no_norm,
+                    Inventory.seri_no_norm,
+                    Inventory.sorumlu_personel_norm,
+                ),
+            )
+        )
+        license_ = license_.where(
+            _matches(
+                term,
+                cast(License.id, String),
+                License.lisans_adi,
+                License.lisans_anahtari,
+                License.bagli_envanter_no,
+                License.notlar,
+                keys=(License.sorumlu_personel_norm, License.ifs_no_norm),
+            )
+        )
+        printer = printer.where(
+            _matches(
+                term,
+                cast(ScrapPrinter.printer_id, String),
+                ScrapPrinter.reason,
+                *printer_fields.values(),
+            )
+        )
+    return {"envanter": inventory, "lisans": license_, "yazici": printer}
+
+
+def latest_inventory_logs(
+    db: Session, inventory_ids, per_item: int = SCRAP_LOG_LIMIT
+) -> dict[int, list[InventoryLog]]:
+    """Return the newest ``per_item`` logs of each inventory in one query."""
+
+    inventory_ids = list(inventory_ids)
+    if not inventory_ids:
+        return {}
+    ranked = (
+        select(
+            InventoryLog.id,
+            func.row_number()
+            .over(
+                partition_by=InventoryLog.inventory_id,
+                order_by=(InventoryLog.created_at.desc(), InventoryLog.id.desc()),
+            )
+            .label("rn"),
+        )
+        .where(InventoryLog.inventory_id.in_(inventory_ids))
+        .subquery()
+    )
+    rows = (
+        db.query(InventoryLog)
+        .join(ranked, ranked.c.id == InventoryLog.id)
+        .filter(ranked.c.rn <= per_item)
+        .order_by(InventoryLog.created_at.desc(), InventoryLog.id.desc())
+    )
+    logs: dict[int, list[InventoryLog]] = {}
+    for log in rows:
+        logs.setdefault(log.inventory_id, []).append(log)
+    return logs
+
+
+def _load(db: Session, model, ids: list[int]) -> dict[int, Any]:
+    if not ids:
+        return {}
+    return {row.id: row for row in db.query(model).filter(model.id.in_(ids))}
+
+
+def _display_date(value) -> str:
+    if isinstance(value, datetime):
+        return value.strftime("%d.%m.%Y %H:%M")
+    if isinstance(value, date):
+        return value.strftime("%d.%m.%Y")
+    return "-"
+
+
+def _inventory_entry(item: Inventory, logs: list[InventoryLog]) -> dict[str, Any]:
+    details = [
+        {"label": "Envanter No", "value": item.no or "-"},
+        {"label": "Seri No", "value": item.seri_no or "-"},
+        {"label": "Departman", "value": item.departman or item.fabrika or "-"},
+        {"label": "Sorumlu", "value": item.sorumlu_personel or "-"},
+        {"label": "Bağlı Envanter", "value": item.bagli_envanter_no or "-"},
+        {"label": "Kullanım Alanı", "value": item.kullanim_alani or "-"},
+    ]
+    if item.not_:
+        details.append({"label": "Not", "value": item.not_})
+    return {
+        "type": "envanter",
+        "type_label": "Envanter",
+        "title": " ".join(filter(None, [item.marka, item.model])).strip() or "-",
+        "subtitle": f"Envanter No: {item.no}",
+        "details": details,
+        "logs": logs,
+        "display_date": _display_date(item.tarih),
+        "detail_url": f"/scrap/inventory/{item.id}",
+    }
+
+
+def _license_entry(row: License) -> dict[str, Any]:
+    details = [
+        {"label": "Lisans ID", "value": row.id},
+        {"label": "Lisans Key", "value": row.lisans_key or "-"},
+        {"label": "Sorumlu", "value": row.sorumlu_personel or "-"},
+        {"label": "Bağlı Envanter", "value": row.bagli_envanter_no or "-"},
+        {"label": "IFS No", "value": row.ifs_no or "-"},
+    ]
+    if row.notlar:
+        details.append({"label": "Not", "value": row.notlar})
+    return {
+        "type": "lisans",
+        "type_label": "Lisans",
+        "title": row.lisans_adi or f"Lisans #{row.id}",
+        "subtitle": f"Lisans ID: {row.id}",
+        "details": details,
+        "logs": [],
+        "display_date": _display_date(row.tarih),
+        "detail_url": f"/lisans/detail/{row.id}",
+    }
+
+
+def _printer_entry(scrap: ScrapPrinter) -> dict[str, Any]:
+    snapshot = scrap.snapshot or {}
+    seri = snapshot.get("seri_no")
+    title = " ".join(filter(None, [snapshot.get("marka"), snapshot.get("model")]))
+    details = [
+        {"label": "Yazıcı ID", "value": f"#{scrap.printer_id}"},
+        {"label": "Seri No", "value": seri or "-"},
+        {"label": "Fabrika", "value": snapshot.get("fabrika") or "-"},
+        {"label": "Kullanım Alanı", "value": snapshot.get("kullanim_alani") or "-"},
+        {"label": "Sorumlu", "value": snapshot.get("sorumlu_personel") or "-"},
+        {
+            "label": "Bağlı Envanter",
+            "value": snapshot.get("bagli_envanter_no") or "-",
+        },
+    ]
+    reason = scrap.reason or snapshot.get("notlar") or snapshot.get("not")
+    if reason:
+        details.append({"label": "Sebep", "value": reason})
+    return {
+        "type": "yazici",
+        "type_label": "Yazıcı",
+        "title": title.strip() or f"Yazıcı #{scrap.printer_id}",
+        "subtitle": f"Seri No: {seri or '-'}",
+        "details": details,
+        "logs": [],
+        "display_date": _display_date(scrap.created_at),
+        "detail_url": f"/printers/{scrap.printer_id}",
+    }
+
+
+def scrap_page(
+    db: Session,
+    *,
+    tur: str | None = None,
+    q: str | None = None,
+    sort: str = "tarih",
+    desc: bool = True,
+    page: int = 1,
+    per_page: int = SCRAP_PAGE_SIZE,
+) -> ScrapPage:
+    """Return one page of the merged scrap list.
+
+    ``tur`` limits the list to one of :data:`SCRAP_TYPES`, ``q`` searches
+    the same fields the page shows and ``sort`` is one of
+    :data:`SORT_FIELDS`.  Unknown values fall back to the defaults.
+    """
+
+    per_page = max(1, min(int(per_page), SCRAP_PAGE_MAX))
+    page = max(1, int(page))
+    sources = _sources(normalize_search(q) or None)
+    if tur in SCRAP_TYPES:
+        sources = {tur: sources[tur]}
+    keys = union_all(*sources.values()).subquery()
+
+    total = db.execute(select(func.count()).select_from(keys)).scalar() or 0
+    sort_column = keys.c[sort if sort in SORT_FIELDS else "tarih"]
+    order = [sort_column.desc() if desc else sort_column.asc()]
+    if sort_column is not keys.c.tarih:
+        order.append(keys.c.tarih.desc())
+    order += [keys.c.tip, keys.c.id.desc()]
+    page_keys = db.execute(
+        select(keys.c.tip, keys.c.id)
+        .order_by(*order)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+    ).all()
+
+    wanted: dict[str, list[int]] = {name: [] for name in SCRAP_TYPES}
+    for tip, row_id in page_keys:
+        wanted[tip].append(row_id)
+    inventories = _load(db, Inventory, wanted["envanter"])
+    licenses = _load(db, License, wanted["lisans"])
+    printers = _load(db, ScrapPrinter, wanted["yazici"])
+    logs = latest_inventory_logs(db, wanted["envanter"])
+
+    items = []
+    for tip, row_id in page_keys:
+        if tip == "envanter":
+            items.append(_inventory_entry(inventories[row_id], logs.get(row_id, [])))
+        elif tip == "lisans":
+            items.append(_license_entry(licenses[row_id]))
+        else:
+            items.append(_printer_entry(printers[row_id]))
+    return ScrapPage(items=items, total=total, page=page, per_page=per_page)
@@ -0,0 +1,389 @@
+"""Global full-text search over inventories, printers, licenses, requests and
+knowledge-base articles.
+
+The list screens filter with ``ILIKE '%q%'`` over many columns, which SQLite
+can only answer with a full scan.  This module keeps an FTS5 table,
+``search_index``, with one ``(title, body)`` document per searchable row.
+The table is created together with the ORM tables (``Base.metadata``
+``after_create``) and kept current by ``after_insert``/``after_update``/
+``after_delete`` hooks in the same transaction as the write.  The rowid
+encodes ``(entity_type, entity_id)`` so updates and deletes are direct rowid
+lookups.
+
+:func:`search` answers ``/api/search`` with bm25-ranked, typed hits and
+snippets; :func:`rebuild_search_index` (``python -m
+scripts.rebuild_search_index``) refills the table after bulk imports or
+writes that bypass the ORM.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+from urllib.parse import urlencode
+
+from sqlalchemy import DDL, event, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from models import (
+    Base,
+    Bilgi,
+    HardwareType,
+    Inventory,
+    License,
+    LicenseName,
+    Printer,
+    Talep,
+)
+from utils.refdata import NameMap
+
+SEARCH_TABLE = "search_index"
+SEARCH_LIMIT = 20
+SEARCH_LIMIT_MAX = 100
+BATCH_SIZE = 1000
+
+# ``remove_diacritics`` folds ş/ç/ğ/ö/ü; the dotless/dotted i pairs are not
+# diacritics, so words containing them are also indexed folded in ``alt``.
+# ``prefix`` indexes serve the prefix queries built by :func:`match_query`.
+CREATE_SEARCH_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    "entity_type UNINDEXED, entity_id UNINDEXED, title, body, alt,"
+    " tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+)
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(CREATE_SEARCH_TABLE).execute_if(dialect="sqlite"),
+)
+event.listen(
+    Base.metadata,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {SEARCH_TABLE}").execute_if(dialect="sqlite"),
+)
+
+_INSERT = text(
+    f"INSERT OR REPLACE INTO {SEARCH_TABLE}"
+    " (rowid, entity_type, entity_id, title, body, alt)"
+    " VALUES (:rowid, :entity_type, :entity_id, :title, :body, :alt)"
+)
+_DELETE = text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :rowid")
+
+# Snippet markers; the text is HTML-escaped before they become ``<mark>``.
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+
+
+_TURKISH_I = str.maketrans({"ı": "i", "İ": "i"})
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _fold(value: str) -> str:
+    return value.translate(_TURKISH_I)
+
+
+def _folded_words(*values: str) -> str:
+    words = {word for value in values for word in _TOKEN.findall(value)}
+    return " ".join(sorted({_fold(w) for w in words if _fold(w) != w}))
+
+
+def _join(*values: Any) -> str:
+    return " ".join(str(v) for v in values if v not in (None, ""))
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """How rows of ``model`` become ``(title, body)`` documents."""
+
+    entity_type: str
+    code: int
+    model: type
+    document: Callable[[Any, Callable[[Any], Any]], tuple[str, str]]
+    url: Callable[[int, str], str]
+
+
+def _inventory_document(row, names) -> tuple[str, str]:
+    return (
+        _join(row.no, row.marka, row.model),
+        _join(
+            row.seri_no,
+            row.fabrika,
+            row.departman,
+            row.sorumlu_personel,
+            row.bagli_envanter_no,
+            row.kullanim_alani,
+            row.ifs_no,
+            row.not_,
+        ),
+    )
+
+
+def _printer_document(row, names) -> tuple[str, str]:
+    return (
+        _join(row.envanter_no, row.marka, row.model),
+        _join(
+            row.seri_no,
+            row.fabrika,
+            row.kullanim_alani,
+            row.sorumlu_personel,
+            row.bagli_envanter_no,
+            row.ip_adresi,
+            row.mac,
+            row.hostname,
+            row.ifs_no,
+            row.notlar,
+        ),
+    )
+
+
+def _license_document(row, names) -> tuple[str, str]:
+    # The license key itself is deliberately not searchable.
+    return (
+        row.lisans_adi or f"Lisans #{row.id}",
+        _join(
+            row.sorumlu_personel,
+            row.bagli_envanter_no,
+            row.ifs_no,
+            row.mail_adresi,
+            row.notlar,
+        ),
+    )
+
+
+def _talep_document(row, names) -> tuple[str, str]:
+    return (
+        _join(names(row.donanim_tipi), row.lisans_adi, row.marka, row.model)
+        or f"Talep #{row.id}",
+        _join(
+            row.ifs_no,
+            row.envanter_no,
+            row.sorumlu_personel,
+            row.bagli_envanter_no,
+            row.aciklama,
+        ),
+    )
+
+
+def _bilgi_document(row, names) -> tuple[str, str]:
+    return row.baslik or "", row.icerik or ""
+
+
+SOURCES = (
+    SearchSource(
+        "inventory",
+        1,
+        Inventory,
+        _inventory_document,
+        lambda entity_id, title: f"/inventory/{entity_id}/detail",
+    ),
+    SearchSource(
+        "printer",
+        2,
+        Printer,
+        _printer_document,
+        lambda entity_id, title: f"/printers/{entity_id}",
+    ),
+    SearchSource(
+        "license",
+        3,
+        License,
+        _license_document,
+        lambda entity_id, title: f"/lisans/{entity_id}",
+    ),
+    SearchSource(
+        "talep",
+        4,
+        Talep,
+        _talep_document,
+        lambda entity_id, title: f"/talepler/{entity_id}",
+    ),
+    SearchSource(
+        "bilgi",
+        5,
+        Bilgi,
+        _bilgi_document,
+        lambda entity_id, title: f"/bilgiler?{urlencode({'q': title})}",
+    ),
+)
+SEARCH_TYPES = tuple(source.entity_type for source in SOURCES)
+_BY_TYPE = {source.entity_type: source for source in SOURCES}
+# Room for the type code in the low bits of the rowid.
+_CODE_BITS = 3
+
+
+def _rowid(source: SearchSource, entity_id: int) -> int:
+    return (entity_id << _CODE_BITS) | source.code
+
+
+def _type_names(conn: Connection, *, preload: bool = False) -> Callable[[Any], Any]:
+    """Return a resolver for ``donanim_tipi`` values stored as reference ids.
+
+    ``preload`` reads both reference tables up front, for resolving many rows
+    (a rebuild); otherwise each new id is looked up when first seen, which
+    suits the single rows of the write hooks.
+    """
+
+    if preload:
+        hardware = NameMap(conn.execute(select(HardwareType.id, HardwareType.name)))
+        licenses = NameMap(conn.execute(select(LicenseName.id, LicenseName.name)))
+        return lambda value: hardware.name(value) or licenses.name(value) or value
+
+    cache: dict[str, Any] = {}
+
+    def resolve(value: Any) -> Any:
+        if value is None or not str(value).strip().isdigit():
+            return value
+        key = str(value).strip()
+        if key not in cache:
+            name = None
+            for model in (HardwareType, LicenseName):
+                name = conn.execute(
+                    select(model.name).where(model.id == int(key))
+                ).scalar()
+                if name:
+                    break
+            cache[key] = name or value
+        return cache[key]
+
+    return resolve
+
+
+def _index_row(source: SearchSource, row, names) -> dict[str, Any]:
+    title, body = source.document(row, names)
+    return {
+        "rowid": _rowid(source, row.id),
+        "entity_type": source.entity_type,
+        "entity_id": row.id,
+        "title": title,
+        "body": body,
+        "alt": _folded_words(title, body),
+    }
+
+
+# -- ORM hooks -----------------------------------------------------------------
+
+
+def _watch(source: SearchSource) -> None:
+    @event.listens_for(source.model, "after_insert")
+    @event.listens_for(source.model, "after_update")
+    def _indexed(mapper, connection, target) -> None:
+        names = _type_names(connection)
+        connection.execute(_INSERT, _index_row(source, target, names))
+
+    @event.listens_for(source.model, "after_delete")
+    def _removed(mapper, connection, target) -> None:
+        connection.execute(_DELETE, {"rowid": _rowid(source, target.id)})
+
+
+for _source in SOURCES:
+    _watch(_source)
+
+
+# -- Rebuild -------------------------------------------------------------------
+
+
+def rebuild_search_index(db: Session) -> dict[str, int]:
+    """Re-create every document; return the number indexed per type.
+
+    The caller owns the transaction and is expected to commit.
+    """
+
+    conn = db.connection()
+    conn.execute(text(CREATE_SEARCH_TABLE))
+    conn.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+    names = _type_names(conn, preload=True)
+    counts = {}
+    for source in SOURCES:
+        count = 0
+        batch: list[dict[str, Any]] = []
+        for row in db.query(source.model).yield_per(BATCH_SIZE):
+            batch.append(_index_row(source, row, names))
+            if len(batch) >= BATCH_SIZE:
+                conn.execute(_INSERT, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            conn.execute(_INSERT, batch)
+        counts[source.entity_type] = count + len(batch)
+    return counts
+
+
+def search_index_is_empty(db: Session) -> bool:
+    """Whether the index has no documents (e.g. right after it was added)."""
+
+    return db.execute(text(f"SELECT 1 FROM {SEARCH_TABLE} LIMIT 1")).first() is None
+
+
+# -- Query ---------------------------------------------------------------------
+
+def match_query(q: str) -> str | None:
+    """Turn free text into an FTS5 query: every word, as a prefix, must match.
+
+    Words are folded like the ``alt`` column so "ışık" and "isik" both find
+    "Işık".
+    """
+
+    tokens = _TOKEN.findall(_fold(q or ""))
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _snippet_html(value: str | None) -> str:
+    escaped = html.escape(value or "")
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def search(
+    db: Session,
+    q: str,
+    *,
+    types: Iterable[str] | None = None,
+    limit: int = SEARCH_LIMIT,
+) -> list[dict[str, Any]]:
+    """Return ranked hits for ``q`` (best first), optionally limited to ``types``.
+
+    Title matches weigh ten times more than body matches.  ``snippet`` is
+    HTML with the matched words wrapped in ``<mark>``.
+    """
+
+    query = match_query(q)
+    if query is None:
+        return []
+    limit = max(1, min(int(limit), SEARCH_LIMIT_MAX))
+    wanted = [t for t in (types or SEARCH_TYPES) if t in _BY_TYPE]
+    if not wanted:
+        return []
+    type_params = {f"t{i}": t for i, t in enumerate(wanted)}
+    stmt = text(
+        f"SELECT entity_type, entity_id, title,"
+        f" snippet({SEARCH_TABLE}, 3, :ms, :me, '…', 12) AS snippet,"
+        f" bm25({SEARCH_TABLE}, 0.0, 0.0, 10.0, 1.0, 1.0) AS score"
+        f" FROM {SEARCH_TABLE}"
+        f" WHERE {SEARCH_TABLE} MATCH :query"
+        f" AND entity_type IN ({', '.join(':' + k for k in type_params)})"
+        f" ORDER BY score LIMIT :limit"
+    )
+    rows = db.execute(
+        stmt,
+        {
+            "query": query,
+            "ms": _MARK_START,
+            "me": _MARK_END,
+            "limit": limit,
+            **type_params,
+        },
+    ).mappings()
+    return [
+        {
+            "type": row["entity_type"],
+            "id": row["entity_id"],
+            "title": row["title"],
+            "snippet": _snippet_html(row["snippet"]),
+            "url": _BY_TYPE[row["entity_type"]].url(row["entity_id"], row["title"]),
+            "score": round(-row["score"], 4),
+        }
+        for row in rows
+    ]
@@ -0,0 +1,303 @@
+"""Materialised per-item stock balances derived from ``stock_logs``.
+
+``stock_logs`` is an append-only ledger; summing it on every status request
+gets slower with every movement ever recorded.  The ``stock_balances`` table
+keeps one row per ``donanim_tipi|marka|model|ifs_no`` key instead.  Rows are
+updated in the same transaction as the ledger insert (through the ORM
+``after_insert`` hook or explicitly by :func:`utils.stock_log.create_stock_log`
+for legacy schemas) and can be rebuilt from the ledger at any time with
+:func:`rebuild_stock_balances` (``python -m scripts.rebuild_stock_balances``).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable
+
+from sqlalchemy import case, delete, event, func, insert, literal, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from models import StockBalance, StockLog
+from utils.data_version import STOCK, touch
+
+KEY_FIELDS = ("donanim_tipi", "marka", "model", "ifs_no")
+SOURCE_FIELDS = ("source_type", "source_id", "lisans_anahtari", "mail_adresi")
+# Columns that must physically exist in ``stock_logs`` for the materialised
+# balances to carry the same information as the ledger aggregate.
+REQUIRED_LEDGER_COLUMNS = frozenset(KEY_FIELDS + SOURCE_FIELDS + ("tarih",))
+
+
+def stock_key(
+    donanim_tipi: Any, marka: Any = None, model: Any = None, ifs_no: Any = None
+) -> str:
+    """Return the ``donanim|marka|model|ifs`` key used by stock screens."""
+
+    return "|".join(
+        "" if value is None else str(value)
+        for value in (donanim_tipi, marka, model, ifs_no)
+    )
+
+
+def _signed(islem: Any, miktar: Any) -> int:
+    qty = int(miktar or 0)
+    return qty if str(islem) == "girdi" else -qty
+
+
+def _is_newer(
+    tarih: datetime | None,
+    log_id: int | None,
+    last_tarih: datetime | None,
+    last_log_id: int | None,
+) -> bool:
+    return (tarih or datetime.min, log_id or 0) >= (
+        last_tarih or datetime.min,
+        last_log_id or 0,
+    )
+
+
+def _last_fields(fields: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "last_tarih": fields.get("tarih"),
+        "last_log_id": fields.get("id"),
+        **{name: fields.get(name) for name in SOURCE_FIELDS},
+    }
+
+
+def apply_stock_movement(conn: Connection | Session, **fields: Any) -> None:
+    """Fold a single ledger movement into ``stock_balances``.
+
+    ``fields`` are the column values of the inserted ``stock_logs`` row
+    (``id`` included when known).  Missing optional columns are treated as
+    ``NULL`` so the helper also works for legacy ledgers.
+    """
+
+    apply_stock_movements(conn, [fields])
+
+
+def apply_stock_movements(
+    conn: Connection | Session, movements: Iterable[dict[str, Any]]
+) -> None:
+    """Fold a batch of ledger movements into ``stock_balances``.
+
+    Movements are grouped by key first, so every affected balance row is
+    read once and written once regardless of the batch size.
+    """
+
+    table = StockBalance.__table__
+    grouped: dict[str, tuple[int, dict[str, Any]]] = {}
+    for fields in movements:
+        key = stock_key(*(fields.get(name) for name in KEY_FIELDS))
+        delta = _signed(fields.get("islem"), fields.get("miktar"))
+        current = grouped.get(key)
+        if current is None:
+            grouped[key] = (delta, fields)
+            continue
+        total, newest = current
+        if _is_newer(
+            fields.get("tarih"), fields.get("id"), newest.get("tarih"), newest.get("id")
+        ):
+            newest = fields
+        grouped[key] = (total + delta, newest)
+    if not grouped:
+        return
+
+    existing = {
+        row.stock_key: row
+        for row in conn.execute(
+            select(
+                table.c.id, table.c.stock_key, table.c.last_tarih, table.c.last_log_id
+            ).where(table.c.stock_key.in_(list(grouped)))
+        )
+    }
+
+    new_rows = []
+    for key, (delta, newest) in grouped.items():
+        last = _last_fields(newest)
+        current = existing.get(key)
+        if current is None:
+            new_rows.append(
+                {
+                    "stock_key": key,
+                    "miktar": delta,
+                    **{name: newest.get(name) for name in KEY_FIELDS},
+                    **last,
+                }
+            )
+            continue
+        values: dict[str, Any] = {"miktar": table.c.miktar + delta}
+        if _is_newer(
+            last["last_tarih"],
+            last["last_log_id"],
+            current.last_tarih,
+            current.last_log_id,
+        ):
+            values.update(last)
+        conn.execute(update(table).where(table.c.id == current.id).values(**values))
+    if new_rows:
+        conn.execute(insert(table), new_rows)
+
+
+@event.listens_for(StockLog, "after_insert")
+def _stock_log_inserted(mapper, connection, target) -> None:
+    apply_stock_movement(
+        connection,
+        **{col.key: getattr(target, col.key, None) for col in mapper.column_attrs},
+    )
+
+
+def _balance_dict(row: StockBalance) -> dict[str, Any]:
+    return {
+        "donanim_tipi": row.donanim_tipi,
+        "marka": row.marka,
+        "model": row.model,
+        "ifs_no": row.ifs_no,
+        "qty": int(row.miktar or 0),
+        "last_tarih": row.last_tarih,
+        "last_log_id": row.last_log_id,
+        "source_type": row.source_type,
+        "source_id": row.source_id,
+        "lisans_anahtari": row.lisans_anahtari,
+        "mail_adresi": row.mail_adresi,
+    }
+
+
+def read_stock_balances(db: Session) -> list[dict[str, Any]]:
+    """Return materialised balances in the shape of :func:`ledger_balances`."""
+
+    rows = (
+        db.query(StockBalance)
+        .order_by(
+            StockBalance.donanim_tipi,
+            StockBalance.marka,
+            StockBalance.model,
+            StockBalance.ifs_no,
+        )
+        .all()
+    )
+    return [_balance_dict(row) for row in rows]
+
+
+def get_stock_balance(db: Session, key: str) -> dict[str, Any] | None:
+    """Return the balance stored under ``key`` (see :func:`stock_key`).
+
+    The lookup goes through the unique ``stock_key`` index, so its cost does
+    not depend on the size of the ledger or the number of stock items.
+    """
+
+    row = db.query(StockBalance).filter(StockBalance.stock_key == key).first()
+    return _balance_dict(row) if row is not None else None
+
+
+def ledger_balances(
+    db: Session, columns: Iterable[str], *criteria: Any
+) -> list[dict[str, Any]]:
+    """Aggregate ``stock_logs`` into per-key balances in a single SQL pass.
+
+    Window functions compute the net quantity and the latest movement per
+    key alongside each row, and only the newest row of every partition is
+    returned, so memory stays proportional to the number of items rather
+    than the number of movements.  ``columns`` is the set of physical
+    ``stock_logs`` columns; optional columns that are missing are reported
+    as ``None``.  ``criteria`` restrict the aggregated movements (e.g. to a
+    date range).
+    """
+
+    available = set(columns)
+
+    def col(name: str):
+        if name in available:
+            return getattr(StockLog, name)
+        return literal(None)
+
+    partition = [getattr(StockLog, n) for n in KEY_FIELDS if n in available]
+    window = {"partition_by": partition}
+
+    ranked = (
+        select(
+            *[col(name).label(name) for name in KEY_FIELDS],
+            *[col(name).label(name) for name in SOURCE_FIELDS],
+            StockLog.id.label("last_log_id"),
+            func.sum(
+                case(
+                    (StockLog.islem == "girdi", StockLog.miktar),
+                    else_=-StockLog.miktar,
+                )
+            )
+            .over(**window)
+            .label("qty"),
+            func.max(StockLog.tarih).over(**window).label("last_tarih"),
+            func.row_number()
+            .over(
+                **window,
+                order_by=(StockLog.tarih.desc(), StockLog.id.desc()),
+            )
+            .label("rn"),
+        ).where(*criteria)
+    ).subquery("ranked")
+
+    stmt = (
+        select(*[c for c in ranked.c if c.name != "rn"])
+        .where(ranked.c.rn == 1)
+        .order_by(*[ranked.c[name] for name in KEY_FIELDS])
+    )
+    return [
+        {**row, "qty": int(row["qty"] or 0)}
+        for row in db.execute(stmt).mappings()
+    ]
+
+
+def merge_balances(
+    rows: Iterable[dict[str, Any]],
+    merged: dict[str, dict[str, Any]] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Fold balances in :func:`ledger_balances` shape into ``stock_balances`` rows.
+
+    The result maps ``stock_key`` to row values.  Passing an existing
+    ``merged`` mapping adds the quantities of ``rows`` on top of it, which is
+    how later movements are applied to an earlier snapshot.
+    """
+
+    merged = {} if merged is None else merged
+    for row in rows:
+        key = stock_key(*(row[name] for name in KEY_FIELDS))
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = {
+                "stock_key": key,
+                **{name: row[name] for name in KEY_FIELDS},
+                "miktar": row["qty"],
+                "last_tarih": row["last_tarih"],
+                "last_log_id": row["last_log_id"],
+                **{name: row[name] for name in SOURCE_FIELDS},
+            }
+            continue
+        # ``NULL`` and ``""`` collapse onto the same key; fold them together.
+        existing["miktar"] += row["qty"]
+        if _is_newer(
+            row["last_tarih"],
+            row["last_log_id"],
+            existing["last_tarih"],
+            existing["last_log_id"],
+        ):
+            existing["last_tarih"] = row["last_tarih"]
+            existing["last_log_id"] = row["last_log_id"]
+            existing.update({name: row[name] for name in SOURCE_FIELDS})
+    return merged
+
+
+def rebuild_stock_balances(db: Session, columns: Iterable[str]) -> int:
+    """Replace ``stock_balances`` with a fresh aggregate of the ledger.
+
+    Returns the number of balance rows written.  The caller owns the
+    transaction and is expected to commit.
+    """
+
+    merged = merge_balances(ledger_balances(db, columns))
+
+    table = StockBalance.__table__
+    db.execute(delete(table))
+    if merged:
+        db.execute(insert(table), list(merged.values()))
+    touch(db, STOCK)
+    return len(merged)
@@ -0,0 +1,82 @@
+"""Process-wide cache for computed stock status snapshots.
+
+Building the stock status joins the balances with system room entries and
+reference names on every request, although the result only changes when
+the ledger, the system room or the reference tables do.  Snapshots are
+stored together with a cheap version key -- ``MAX(stock_logs.id)`` plus the
+``data_versions`` counters maintained by :mod:`utils.data_version` -- and
+reused until the key moves.
+
+Cached values are shared between requests and must be treated as
+read-only by callers.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Hashable, TypeVar
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models import StockLog
+from utils.data_version import current_versions, has_pending_writes, local_generation
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_snapshots: dict[str, tuple[Hashable, Any]] = {}
+_stats = {"hits": 0, "misses": 0}
+
+
+def snapshot_key(db: Session) -> Hashable | None:
+    """Return the version key of the committed stock data, if available."""
+
+    try:
+        last_log_id = db.execute(select(func.max(StockLog.id))).scalar()
+        versions = current_versions(db)
+    except Exception:  # pragma: no cover - tables missing during bootstrap
+        return None
+    return (id(db.get_bind()), local_generation(), last_log_id, versions)
+
+
+def cached_snapshot(db: Session, name: str, compute: Callable[[], T]) -> T:
+    """Return the snapshot ``name``, recomputing it when the data changed.
+
+    Sessions with uncommitted writes to the watched tables always compute a
+    fresh result and never store it, so a request sees its own changes and
+    other requests never see uncommitted ones.
+    """
+
+    if has_pending_writes(db):
+        return compute()
+
+    key = snapshot_key(db)
+    if key is None:
+        return compute()
+
+    with _lock:
+        cached = _snapshots.get(name)
+        if cached is not None and cached[0] == key:
+            _stats["hits"] += 1
+            return cached[1]
+        _stats["misses"] += 1
+
+    value = compute()
+    with _lock:
+        _snapshots[name] = (key, value)
+    return value
+
+
+def clear() -> None:
+    """Drop every cached snapshot."""
+
+    with _lock:
+        _snapshots.clear()
+
+
+def stats() -> dict[str, int]:
+    """Return cache hit/miss counters."""
+
+    with _lock:
+        return dict(_stats)
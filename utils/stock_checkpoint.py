@@ -0,0 +1,202 @@
+"""Point-in-time stock balances backed by periodic ledger checkpoints.
+
+Answering "what did we hold at month end?" from ``stock_logs`` alone means
+replaying the whole ledger up to that date.  Checkpoints store the balance
+of every stock key at a ``taken_at`` timestamp (``stock_checkpoints`` and
+``stock_checkpoint_balances``), so a historical query starts from the
+nearest earlier checkpoint and only aggregates the movements after it.
+
+A checkpoint also records the highest ledger id that existed when it was
+written.  Movements inserted later with an earlier ``tarih`` (imports,
+corrections) are picked up through that id, so checkpoints never have to be
+invalidated.  New checkpoints are built the same way from the previous one,
+which keeps :func:`ensure_monthly_checkpoints` cheap enough to run from a
+scheduled job (``python -m scripts.stock_checkpoints``).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from sqlalchemy import and_, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from models import StockCheckpoint, StockCheckpointBalance, StockLog
+from utils.stock_balance import (
+    KEY_FIELDS,
+    REQUIRED_LEDGER_COLUMNS,
+    SOURCE_FIELDS,
+    ledger_balances,
+    merge_balances,
+)
+from utils.stock_log import get_available_columns
+
+_BALANCE_FIELDS = (
+    "stock_key",
+    *KEY_FIELDS,
+    "miktar",
+    "last_tarih",
+    "last_log_id",
+    *SOURCE_FIELDS,
+)
+
+
+def naive_utc(value: datetime) -> datetime:
+    """Convert an aware timestamp to the naive UTC values stored in the ledger."""
+
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _movements_until(as_of: datetime, base: StockCheckpoint | None):
+    """Criteria selecting the movements to apply on top of ``base``."""
+
+    dated_before = or_(StockLog.tarih <= as_of, StockLog.tarih.is_(None))
+    if base is None:
+        return dated_before
+    return or_(
+        and_(StockLog.tarih > base.taken_at, StockLog.tarih <= as_of),
+        and_(
+            StockLog.id > base.last_log_id,
+            or_(StockLog.tarih <= base.taken_at, StockLog.tarih.is_(None)),
+        ),
+    )
+
+
+def nearest_checkpoint(db: Session, as_of: datetime) -> StockCheckpoint | None:
+    """Return the latest checkpoint taken at or before ``as_of``."""
+
+    return (
+        db.query(StockCheckpoint)
+        .filter(StockCheckpoint.taken_at <= as_of)
+        .order_by(StockCheckpoint.taken_at.desc())
+        .first()
+    )
+
+
+def _checkpoint_rows(db: Session, checkpoint: StockCheckpoint) -> dict[str, dict]:
+    table = StockCheckpointBalance.__table__
+    stmt = select(*[table.c[name] for name in _BALANCE_FIELDS]).where(
+        table.c.checkpoint_id == checkpoint.id
+    )
+    return {row["stock_key"]: dict(row) for row in db.execute(stmt).mappings()}
+
+
+def _balances_at(
+    db: Session, as_of: datetime, columns: Iterable[str]
+) -> tuple[dict[str, dict[str, Any]], int]:
+    """Return ``(stock_key -> balance row, highest ledger id seen)``."""
+
+    last_log_id = db.execute(select(func.max(StockLog.id))).scalar() or 0
+    base = nearest_checkpoint(db, as_of)
+    merged = _checkpoint_rows(db, base) if base is not None else {}
+    movements = ledger_balances(
+        db, columns, _movements_until(as_of, base), StockLog.id <= last_log_id
+    )
+    return merge_balances(movements, merged), last_log_id
+
+
+def stock_balances_as_of(
+    db: Session, as_of: datetime, columns: Iterable[str] | None = None
+) -> list[dict[str, Any]]:
+    """Return the balances at ``as_of`` in the shape of :func:`ledger_balances`.
+
+    Movements dated exactly ``as_of`` are included.  Legacy ledgers without
+    the materialised key columns are aggregated directly.
+    """
+
+    as_of = naive_utc(as_of)
+    available = set(columns if columns is not None else get_available_columns(db))
+    if "tarih" not in available:
+        raise ValueError("stock_logs tablosunda tarih sütunu yok")
+    if not REQUIRED_LEDGER_COLUMNS <= available:
+        return ledger_balances(db, available, _movements_until(as_of, None))
+
+    merged, _ = _balances_at(db, as_of, available)
+    rows = [
+        {
+            **{name: row[name] for name in KEY_FIELDS},
+            **{name: row[name] for name in SOURCE_FIELDS},
+            "qty": int(row["miktar"] or 0),
+            "last_tarih": row["last_tarih"],
+            "last_log_id": row["last_log_id"],
+        }
+        for row in merged.values()
+    ]
+    rows.sort(key=lambda row: tuple(row[name] or "" for name in KEY_FIELDS))
+    return rows
+
+
+def create_stock_checkpoint(
+    db: Session, taken_at: datetime | None = None
+) -> StockCheckpoint:
+    """Write a checkpoint at ``taken_at`` (default: now) and return it.
+
+    The balances are derived from the previous checkpoint plus the movements
+    since then.  An existing checkpoint at the same timestamp is returned
+    unchanged.  The caller owns the transaction and is expected to commit.
+    """
+
+    taken_at = naive_utc(taken_at or datetime.utcnow())
+    existing = (
+        db.query(StockCheckpoint).filter(StockCheckpoint.taken_at == taken_at).first()
+    )
+    if existing is not None:
+        return existing
+
+    columns = set(get_available_columns(db))
+    if not REQUIRED_LEDGER_COLUMNS <= columns:
+        raise ValueError("stock_logs tablosunda kontrol noktası için sütunlar eksik")
+
+    merged, last_log_id = _balances_at(db, taken_at, columns)
+    checkpoint = StockCheckpoint(taken_at=taken_at, last_log_id=last_log_id)
+    db.add(checkpoint)
+    db.flush()
+    if merged:
+        db.execute(
+            insert(StockCheckpointBalance.__table__),
+            [{**row, "checkpoint_id": checkpoint.id} for row in merged.values()],
+        )
+    return checkpoint
+
+
+def _month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def _next_month(value: datetime) -> datetime:
+    if value.month == 12:
+        return datetime(value.year + 1, 1, 1)
+    return datetime(value.year, value.month + 1, 1)
+
+
+def ensure_monthly_checkpoints(
+    db: Session, until: datetime | None = None
+) -> list[StockCheckpoint]:
+    """Create the missing month-start checkpoints up to ``until`` (default: now).
+
+    Checkpoints start at the first month boundary after the oldest movement
+    and are built in order, each one from its predecessor.  Returns the
+    checkpoints created by this call.
+    """
+
+    until = naive_utc(until or datetime.utcnow())
+    first = db.execute(select(func.min(StockLog.tarih))).scalar()
+    if first is None:
+        return []
+
+    existing = {
+        taken_at
+        for (taken_at,) in db.query(StockCheckpoint.taken_at).filter(
+            StockCheckpoint.taken_at <= until
+        )
+    }
+    created = []
+    boundary = _next_month(_month_start(first))
+    while boundary <= until:
+        if boundary not in existing:
+            created.append(create_stock_checkpoint(db, boundary))
+        boundary = _next_month(boundary)
+    return created
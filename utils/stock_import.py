@@ -0,0 +1,299 @@
+"""Bulk stock import from xlsx/CSV files.
+
+Rows are read lazily (openpyxl read-only mode, ``csv`` reader), validated
+against :func:`utils.stock_log.normalize_islem` and the in-memory reference
+data of :mod:`utils.refdata`, and written in batches: one multi-row INSERT
+into ``stock_logs`` and one balance fold per batch, and a single
+``stock_totals`` update per hardware type at the end.  Invalid rows are
+reported with their line numbers and skipped; ``dry_run`` performs the full
+validation without writing anything.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import IO, Any, Iterator
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from models import StockLog, StockTotal
+from utils.data_version import STOCK, touch
+from utils.events import record_events, stock_log_event
+from utils.refdata import RefData, get_refdata
+from utils.stock_balance import apply_stock_movements
+from utils.stock_log import get_available_columns, normalize_islem
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 500
+
+_HEADER_TRANSLATION = str.maketrans("çğıöşüÇĞİÖŞÜ", "cgiosuCGIOSU")
+# Normalised header -> stock_logs column.  Export headers are accepted too so
+# an exported sheet can be edited and imported back.
+HEADER_ALIASES = {
+    "donanim_tipi": "donanim_tipi",
+    "donanim": "donanim_tipi",
+    "tip": "donanim_tipi",
+    "marka": "marka",
+    "model": "model",
+    "ifs_no": "ifs_no",
+    "ifs": "ifs_no",
+    "miktar": "miktar",
+    "adet": "miktar",
+    "stok": "miktar",
+    "islem": "islem",
+    "aciklama": "aciklama",
+    "islem_yapan": "actor",
+    "lisans_anahtari": "lisans_anahtari",
+    "mail_adresi": "mail_adresi",
+    "tarih": "tarih",
+}
+OUT_OPERATIONS = ("cikti", "hurda", "atama")
+
+
+class StockImportError(ValueError):
+    """Raised when the uploaded file cannot be read at all."""
+
+
+@dataclass
+class ImportReport:
+    total: int = 0
+    imported: int = 0
+    dry_run: bool = False
+    totals: dict[str, int] = field(default_factory=dict)
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    error_count: int = 0
+
+    def add_error(self, line: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"satir": line, "hata": message})
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "ok": self.error_count == 0,
+            "dry_run": self.dry_run,
+            "toplam": self.total,
+            "aktarilan": self.imported,
+            "hatali": self.error_count,
+            "stok_degisimi": self.totals,
+            "hatalar": self.errors,
+        }
+
+
+def _normalize_header(value: Any) -> str:
+    text = str(value or "").strip().translate(_HEADER_TRANSLATION).lower()
+    return "_".join(text.replace(".", " ").split())
+
+
+def _map_headers(raw_headers) -> list[str | None]:
+    mapped = [HEADER_ALIASES.get(_normalize_header(h)) for h in raw_headers]
+    if "donanim_tipi" not in mapped or "miktar" not in mapped:
+        raise StockImportError("Dosyada 'Donanım Tipi' ve 'Miktar' sütunları olmalı.")
+    return mapped
+
+
+def _rows_from_sheet(handle: IO[bytes]) -> Iterator[tuple[int, dict[str, Any]]]:
+    from openpyxl import load_workbook
+
+    try:
+        wb = load_workbook(handle, read_only=True, data_only=True)
+    except Exception as exc:  # zipfile/openpyxl raise various errors
+        raise StockImportError("Excel dosyası okunamadı.") from exc
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        headers = _map_headers(next(rows, ()))
+        for line, values in enumerate(rows, start=2):
+            yield line, {
+                name: value
+                for name, value in zip(headers, values)
+                if name is not None
+            }
+    finally:
+        wb.close()
+
+
+def _rows_from_csv(handle: IO[bytes]) -> Iterator[tuple[int, dict[str, Any]]]:
+    text = io.TextIOWrapper(handle, encoding="utf-8-sig", newline="")
+    sample = text.read(4096)
+    text.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(text, dialect)
+    headers = _map_headers(next(reader, []))
+    for line, values in enumerate(reader, start=2):
+        yield line, {
+            name: value for name, value in zip(headers, values) if name is not None
+        }
+
+
+def read_rows(
+    handle: IO[bytes], filename: str
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield ``(line_number, row)`` pairs from an xlsx or CSV upload."""
+
+    if filename.lower().endswith(".csv"):
+        return _rows_from_csv(handle)
+    return _rows_from_sheet(handle)
+
+
+def _clean(value: Any) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    return text or None
+
+
+def _parse_tarih(value: Any) -> datetime | None:
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    text = str(value).strip()
+    for fmt in ("%d.%m.%Y %H:%M", "%d.%m.%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Geçersiz tarih: {text}")
+
+
+def _resolve(names, value: str | None, label: str) -> str | None:
+    if value is None:
+        return None
+    resolved = names.name(value)
+    if resolved is None:
+        row_id = names.id_for(value)
+        resolved = names.by_id.get(row_id) if row_id else None
+    if resolved is None:
+        raise ValueError(f"Bilinmeyen {label}: {value}")
+    return resolved
+
+
+def _validate(
+    row: dict[str, Any], refdata: RefData, actor: str
+) -> dict[str, Any]:
+    donanim = _clean(row.get("donanim_tipi"))
+    if not donanim:
+        raise ValueError("Donanım tipi boş")
+    hardware = refdata.hardware
+    try:
+        donanim = _resolve(hardware, donanim, "donanım tipi")
+    except ValueError:
+        donanim = _resolve(refdata.licenses, donanim, "donanım tipi")
+
+    try:
+        miktar = int(float(str(row.get("miktar")).replace(",", ".")))
+    except (TypeError, ValueError):
+        raise ValueError("Miktar sayı olmalı")
+    if miktar <= 0:
+        raise ValueError("Miktar 0'dan büyük olmalı")
+
+    islem, islem_valid = normalize_islem(row.get("islem"))
+    if not islem_valid:
+        raise ValueError(f"Geçersiz işlem türü: {row.get('islem')}")
+
+    return {
+        "donanim_tipi": donanim,
+        "marka": _resolve(refdata.brands, _clean(row.get("marka")), "marka"),
+        "model": _resolve(refdata.models, _clean(row.get("model")), "model"),
+        "ifs_no": _clean(row.get("ifs_no")),
+        "miktar": miktar,
+        "islem": islem,
+        "aciklama": _clean(row.get("aciklama")),
+        "actor": _clean(row.get("actor")) or actor,
+        "lisans_anahtari": _clean(row.get("lisans_anahtari")),
+        "mail_adresi": _clean(row.get("mail_adresi")),
+        "tarih": _parse_tarih(row.get("tarih")) or datetime.utcnow(),
+        "source_type": "import",
+    }
+
+
+def _write_batch(db: Session, batch: list[dict[str, Any]], columns: set[str]) -> None:
+    table = StockLog.__table__
+    payload = [{k: v for k, v in row.items() if k in columns} for row in batch]
+    # RETURNING sırası ancak bu bayrakla parametre sırasına eşlenir.
+    stmt = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+    ids = db.execute(stmt, payload).scalars().all()
+    movements = [{**row, "id": log_id} for row, log_id in zip(payload, ids)]
+    apply_stock_movements(db, movements)
+    # Core INSERT ORM kancalarını atlar; olay akışı da burada yazılır.
+    record_events(db, [stock_log_event(row) for row in movements])
+
+
+def import_stock_rows(
+    db: Session,
+    rows: Iterator[tuple[int, dict[str, Any]]],
+    *,
+    actor: str,
+    dry_run: bool = False,
+    batch_size: int = BATCH_SIZE,
+) -> ImportReport:
+    """Validate and import ``rows``; the caller commits (or rolls back).
+
+    Outgoing movements are checked against the running stock per hardware
+    type, so a file cannot take a type below zero even when the stock for
+    it is received earlier in the same file.
+    """
+
+    report = ImportReport(dry_run=dry_run)
+    refdata = get_refdata(db)
+    columns = get_available_columns(db)
+    stock: dict[str, int] = {}
+    batch: list[dict[str, Any]] = []
+
+    def available(donanim: str) -> int:
+        if donanim not in stock:
+            total = db.get(StockTotal, donanim)
+            stock[donanim] = int(total.toplam) if total else 0
+        return stock[donanim]
+
+    for line, raw in rows:
+        if not any(_clean(v) for v in raw.values()):
+            continue
+        report.total += 1
+        try:
+            data = _validate(raw, refdata, actor)
+        except ValueError as exc:
+            report.add_error(line, str(exc))
+            continue
+
+        donanim = data["donanim_tipi"]
+        delta = data["miktar"] if data["islem"] == "girdi" else -data["miktar"]
+        if data["islem"] in OUT_OPERATIONS and available(donanim) < data["miktar"]:
+            report.add_error(line, f"Yetersiz stok: {donanim}")
+            continue
+        stock[donanim] = available(donanim) + delta
+        report.totals[donanim] = report.totals.get(donanim, 0) + delta
+        report.imported += 1
+
+        if dry_run:
+            continue
+        batch.append(data)
+        if len(batch) >= batch_size:
+            _write_batch(db, batch, columns)
+            batch.clear()
+
+    if dry_run:
+        return report
+    if batch:
+        _write_batch(db, batch, columns)
+
+    for donanim, delta in report.totals.items():
+        total = db.get(StockTotal, donanim)
+        if total is None:
+            db.add(StockTotal(donanim_tipi=donanim, toplam=delta))
+        else:
+            total.toplam = (total.toplam or 0) + delta
+    if report.imported:
+        touch(db, STOCK)
+    return report
@@ -0,0 +1,209 @@
+"""Verify and repair the stock read models against the ``stock_logs`` ledger.
+
+``stock_totals`` (used for the sufficiency checks of ``stock_add`` and the
+assignment screens) and ``stock_balances`` (used by the status screens) are
+both maintained incrementally and can drift from the ledger after failed
+writes or manual edits.  :func:`verify_stock_ledger` recomputes every
+per-key and per-type balance in a single aggregate pass over the ledger,
+compares them with both tables and, with ``repair=True``, rewrites only the
+rows that differ using bulk statements.  ``python -m
+scripts.verify_stock_ledger`` runs it as a scheduled job.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from models import StockBalance, StockTotal
+from utils.data_version import STOCK, touch
+from utils.stock_balance import (
+    KEY_FIELDS,
+    REQUIRED_LEDGER_COLUMNS,
+    SOURCE_FIELDS,
+    ledger_balances,
+    merge_balances,
+)
+from utils.stock_log import get_available_columns
+
+BALANCE_FIELDS = (*KEY_FIELDS, "miktar", "last_tarih", "last_log_id", *SOURCE_FIELDS)
+# Only the first discrepancies are kept in the report; the counters are exact.
+MAX_REPORTED = 200
+
+
+@dataclass
+class IntegrityReport:
+    keys_checked: int = 0
+    types_checked: int = 0
+    balances_checked: bool = True
+    repaired: bool = False
+    balance_issues: int = 0
+    total_issues: int = 0
+    balances: list[dict[str, Any]] = field(default_factory=list)
+    totals: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.balance_issues or self.total_issues)
+
+    def add_balance(self, key: str, problem: str, **details: Any) -> None:
+        self.balance_issues += 1
+        if len(self.balances) < MAX_REPORTED:
+            self.balances.append({"stock_key": key, "sorun": problem, **details})
+
+    def add_total(self, donanim_tipi: str, expected: int, actual: int | None) -> None:
+        self.total_issues += 1
+        if len(self.totals) < MAX_REPORTED:
+            self.totals.append(
+                {"donanim_tipi": donanim_tipi, "beklenen": expected, "mevcut": actual}
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "repaired": self.repaired,
+            "keys_checked": self.keys_checked,
+            "types_checked": self.types_checked,
+            "balances_checked": self.balances_checked,
+            "balance_issues": self.balance_issues,
+            "total_issues": self.total_issues,
+            "balances": self.balances,
+            "totals": self.totals,
+        }
+
+
+def _expected_totals(rows: Iterable[dict[str, Any]]) -> dict[str, int]:
+    totals: dict[str, int] = {}
+    for row in rows:
+        donanim = row["donanim_tipi"]
+        if donanim is None:
+            continue
+        totals[donanim] = totals.get(donanim, 0) + int(row["qty"] or 0)
+    return totals
+
+
+def _check_balances(
+    db: Session, expected: dict[str, dict[str, Any]], report: IntegrityReport
+) -> tuple[list[dict], list[dict], list[str]]:
+    """Return ``(missing rows, changed rows, stale keys)`` of ``stock_balances``."""
+
+    table = StockBalance.__table__
+    stmt = select(table.c.id, table.c.stock_key, *[table.c[n] for n in BALANCE_FIELDS])
+    missing: list[dict] = []
+    changed: list[dict] = []
+    stale: list[str] = []
+    seen: set[str] = set()
+    for row in db.execute(stmt).mappings():
+        key = row["stock_key"]
+        seen.add(key)
+        want = expected.get(key)
+        if want is None:
+            report.add_balance(key, "fazla", mevcut=row["miktar"])
+            stale.append(key)
+            continue
+        diffs = [name for name in BALANCE_FIELDS if row[name] != want[name]]
+        if diffs:
+            report.add_balance(
+                key,
+                "farkli",
+                alanlar=diffs,
+                beklenen=want["miktar"],
+                mevcut=row["miktar"],
+            )
+            changed.append({"b_id": row["id"], **{n: want[n] for n in BALANCE_FIELDS}})
+    for key, want in expected.items():
+        if key not in seen:
+            report.add_balance(key, "eksik", beklenen=want["miktar"])
+            missing.append(want)
+    return missing, changed, stale
+
+
+def _check_totals(
+    db: Session, expected: dict[str, int], report: IntegrityReport
+) -> tuple[list[dict], list[dict]]:
+    """Return ``(missing rows, changed rows)`` of ``stock_totals``."""
+
+    actual = {
+        donanim: toplam
+        for donanim, toplam in db.execute(
+            select(StockTotal.donanim_tipi, StockTotal.toplam)
+        )
+    }
+    missing: list[dict] = []
+    changed: list[dict] = []
+    for donanim in sorted(set(expected) | set(actual)):
+        want = expected.get(donanim, 0)
+        have = actual.get(donanim)
+        if have == want or (have is None and want == 0):
+            continue
+        report.add_total(donanim, want, have)
+        if have is None:
+            missing.append({"donanim_tipi": donanim, "toplam": want})
+        else:
+            changed.append({"b_donanim": donanim, "toplam": want})
+    return missing, changed
+
+
+def verify_stock_ledger(
+    db: Session, *, repair: bool = False, columns: Iterable[str] | None = None
+) -> IntegrityReport:
+    """Compare the stock read models with the ledger; optionally repair them.
+
+    Repairs are issued as bulk ``INSERT``/``UPDATE``/``DELETE`` statements for
+    the differing rows only.  The caller owns the transaction and is expected
+    to commit after a repair.
+    """
+
+    available = set(columns if columns is not None else get_available_columns(db))
+    rows = ledger_balances(db, available)
+    report = IntegrityReport()
+
+    expected_totals = _expected_totals(rows)
+    report.types_checked = len(expected_totals)
+    totals_missing, totals_changed = _check_totals(db, expected_totals, report)
+
+    # Legacy ledgers are not materialised into ``stock_balances``.
+    report.balances_checked = REQUIRED_LEDGER_COLUMNS <= available
+    balances_missing: list[dict] = []
+    balances_changed: list[dict] = []
+    balances_stale: list[str] = []
+    if report.balances_checked:
+        expected = merge_balances(rows)
+        report.keys_checked = len(expected)
+        balances_missing, balances_changed, balances_stale = _check_balances(
+            db, expected, report
+        )
+
+    if not repair or report.ok:
+        return report
+
+    totals = StockTotal.__table__
+    if totals_missing:
+        db.execute(insert(totals), totals_missing)
+    if totals_changed:
+        db.execute(
+            update(totals)
+            .where(totals.c.donanim_tipi == bindparam("b_donanim"))
+            .values(toplam=bindparam("toplam")),
+            totals_changed,
+        )
+
+    balances = StockBalance.__table__
+    if balances_stale:
+        db.execute(delete(balances).where(balances.c.stock_key.in_(balances_stale)))
+    if balances_missing:
+        db.execute(insert(balances), balances_missing)
+    if balances_changed:
+        db.execute(
+            update(balances)
+            .where(balances.c.id == bindparam("b_id"))
+            .values({name: bindparam(name) for name in BALANCE_FIELDS}),
+            balances_changed,
+        )
+
+    touch(db, STOCK)
+    report.repaired = True
+    return report
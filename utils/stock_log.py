@@ -5,13 +5,15 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import func, insert, inspect, select, text
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
 
-from models import SessionLocal, StockLog
+from models import StockLog
+from utils.data_version import STOCK, touch
+from utils.events import record_event, stock_log_event
+from utils.schema_capabilities import TableCapabilities, table_capabilities
+from utils.stock_balance import apply_stock_movement
 
-_AVAILABLE_COLUMNS: set[str] | None = None
-_CACHE_VERIFIED = False
 _ISLEM_TRANSLATION = str.maketrans(
     {"ç": "c", "ğ": "g", "ı": "i", "ö": "o", "ş": "s", "ü": "u"}
 )
@@ -47,92 +49,21 @@ def normalize_islem(value: Any, default: str = "girdi") -> tuple[str, bool]:
     return default, False
 
 
-def _load_available_columns() -> set[str]:
-    global _AVAILABLE_COLUMNS
-    if _AVAILABLE_COLUMNS is not None:
-        return _AVAILABLE_COLUMNS
-
-    session = None
-    try:
-        session = SessionLocal()
-        bind = session.get_bind()
-        if bind is None:
-            _AVAILABLE_COLUMNS = {col.name for col in StockLog.__table__.columns}
-        else:
-            try:
-                inspector = inspect(bind)
-                columns = inspector.get_columns("stock_logs")
-                if not columns:
-                    raise RuntimeError("no columns")
-                _AVAILABLE_COLUMNS = {col["name"] for col in columns}
-            except Exception:  # pragma: no cover
-                _AVAILABLE_COLUMNS = {col.name for col in StockLog.__table__.columns}
-    except Exception:  # pragma: no cover - session init failure
-        _AVAILABLE_COLUMNS = {col.name for col in StockLog.__table__.columns}
-    finally:
-        if session is not None:
-            session.close()
-
-    return _AVAILABLE_COLUMNS
-
-
-def get_available_columns(db: Session | None = None) -> set[str]:
+def stock_log_capabilities(db: Session | None = None) -> TableCapabilities:
+    """Return the column flags of ``stock_logs`` (``has_marka`` ...)."""
+
+    return table_capabilities(StockLog.__tablename__, db)
+
+
+def get_available_columns(db: Session | None = None) -> frozenset[str]:
     """Return the set of physical columns for the ``stock_logs`` table.
 
-    The helper preserves the module-level cache so expensive reflection is
-    only performed once per process.  When a session is provided its bind is
-    preferred for reflection, falling back to a new session (and ultimately
-    to the model-defined columns) if necessary.
+    The columns come from the process-wide registry in
+    :mod:`utils.schema_capabilities`; ``db`` is only used when the table has
+    not been reflected yet.
     """
 
-    global _AVAILABLE_COLUMNS, _CACHE_VERIFIED
-
-    if db is not None:
-        runtime_columns: set[str] | None = None
-        try:
-            result = db.execute(text("SELECT * FROM stock_logs LIMIT 0"))
-        except Exception:  # pragma: no cover - runtime lookup failures
-            pass
-        else:
-            try:
-                columns = tuple(result.keys())
-                if columns:
-                    runtime_columns = set(columns)
-            finally:
-                result.close()
-
-        if runtime_columns:
-            if _AVAILABLE_COLUMNS != runtime_columns:
-                _AVAILABLE_COLUMNS = runtime_columns
-            _CACHE_VERIFIED = True
-            return _AVAILABLE_COLUMNS
-
-    if _AVAILABLE_COLUMNS is not None and (_CACHE_VERIFIED or db is None):
-        return _AVAILABLE_COLUMNS
-
-    if db is not None:
-        bind = db.get_bind()
-        if bind is not None:
-            try:
-                inspector = inspect(bind)
-                columns = inspector.get_columns("stock_logs")
-            except Exception:  # pragma: no cover - reflection failures fallback
-                columns = None
-            else:
-                if columns:
-                    _AVAILABLE_COLUMNS = {col["name"] for col in columns}
-                    _CACHE_VERIFIED = True
-                    return _AVAILABLE_COLUMNS
-
-            # Reflection failed or returned no columns; rely on the loader
-            _AVAILABLE_COLUMNS = _load_available_columns()
-            _CACHE_VERIFIED = True
-            return _AVAILABLE_COLUMNS
-
-    result = _load_available_columns()
-    if db is None:
-        _CACHE_VERIFIED = False
-    return result
+    return stock_log_capabilities(db).columns
 
 
 def create_stock_log(
@@ -143,20 +74,25 @@ def create_stock_log(
     Older deployments may not have all of the newer optional columns
     (``marka``, ``model``, ``source_type`` ...).  Writing through the ORM
     would fail in those environments because SQLAlchemy would still try to
-    reference the missing columns.  This helper inspects the real table
-    definition at runtime and only includes the columns that physically
-    exist before issuing a manual INSERT statement.
+    reference the missing columns.  This helper looks the real table
+    definition up in the schema capability registry and only includes the
+    columns that physically exist before issuing a manual INSERT statement.
+
+    ``stock_balances`` and the ``events`` stream are updated in the same
+    transaction: ORM inserts go through the ``after_insert`` hooks in
+    :mod:`utils.stock_balance` and :mod:`utils.events`, the manual INSERT
+    path writes both explicitly and bumps the stock data version so cached
+    status snapshots are invalidated.
 
     The function returns the inserted primary key when available so callers
     that need to expose it (e.g. API responses) can continue to do so.
     """
 
-    available = get_available_columns(db)
-    model_columns = {col.name for col in StockLog.__table__.columns}
-    missing_columns = model_columns - available
+    caps = stock_log_capabilities(db)
+    available = caps.columns
 
-    if not missing_columns:
-        payload = {k: v for k, v in fields.items() if k in model_columns}
+    if not caps.missing:
+        payload = {k: v for k, v in fields.items() if k in available}
         if "tarih" not in payload:
             payload["tarih"] = datetime.utcnow()
         log = StockLog(**payload)
@@ -177,27 +113,20 @@ def create_stock_log(
     stmt = insert(StockLog.__table__).values(**data)
     result = db.execute(stmt)
 
-    if not return_id:
-        return None
-
+    inserted_id: int | None = None
     inserted_pk = getattr(result, "inserted_primary_key", None)
-    if inserted_pk:
-        return int(inserted_pk[0])
-
-    if "id" in available:
+    if inserted_pk and inserted_pk[0] is not None:
+        inserted_id = int(inserted_pk[0])
+    elif return_id and "id" in available:
         try:
-            return int(result.scalar_one())  # type: ignore[arg-type]
+            inserted_id = int(result.scalar_one())  # type: ignore[arg-type]
         except Exception:  # pragma: no cover - fallback for drivers w/out RETURNING
             pk = db.execute(select(func.max(StockLog.id))).scalar()
-            return int(pk) if pk is not None else None
+            inserted_id = int(pk) if pk is not None else None
 
-    return None
+    apply_stock_movement(db, **data, id=inserted_id)
+    record_event(db, **stock_log_event({**data, "id": inserted_id}))
+    touch(db, STOCK)
 
+    return inserted_id if return_id else None
 
-# Preload available columns when module is imported to avoid reflection
-# during transactional operations. Any failures simply fall back to the
-# model-defined columns and will be re-evaluated lazily if needed.
-try:  # pragma: no cover - defensive preload
-    _load_available_columns()
-except Exception:
-    _AVAILABLE_COLUMNS = None
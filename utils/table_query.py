@@ -0,0 +1,128 @@
+"""Server-side filtering, sorting and keyset paging for the list tables.
+
+The inventory, printer and license lists used to render every active row and
+let ``static/js/unified-filters.js`` show and hide them in the browser.
+:func:`table_page` answers the same questions in SQL: equality filters on the
+columns a :class:`TableSpec` declares (``FILTER_MAP`` in
+:mod:`routers.lookup`), free text through the full-text ``search_index``, a
+sort on any of those columns and a ``(key, id)`` keyset cursor.  Every
+request reads one page, however large the table is.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping
+
+from sqlalchemy import Integer, func, text
+from sqlalchemy.orm import Session
+
+from utils.pagination import after_key, encode_key_cursor
+from utils.search_index import SEARCH_TABLE, match_query
+
+TABLE_PAGE_SIZE = 50
+TABLE_PAGE_MAX = 200
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """A list table: the rows it shows and the columns it filters on.
+
+    ``entity`` is also the ``search_index`` type of the rows, ``scope``
+    returns the criterion of the rows the list shows at all and
+    ``row_template`` renders one ``<tr>`` for a ``row``.
+    """
+
+    entity: str
+    model: type
+    columns: tuple[str, ...]
+    scope: Callable[[], Any] | None = None
+    row_template: str | None = None
+
+    @property
+    def sortable(self) -> tuple[str, ...]:
+        """The ``sort`` values :func:`table_page` honours."""
+
+        return ("id",) + self.columns
+
+    def column(self, name: str):
+        return self.model.__table__.c[name]
+
+
+@dataclass
+class TablePage:
+    rows: list[Any]
+    next_cursor: str | None
+
+
+def _search_hits(spec: TableSpec, q: str):
+    match = match_query(q)
+    if match is None:
+        return None
+    return (
+        text(
+            f"SELECT entity_id FROM {SEARCH_TABLE}"
+            f" WHERE {SEARCH_TABLE} MATCH :match AND entity_type = :entity_type"
+        )
+        .bindparams(match=match, entity_type=spec.entity)
+        .columns(entity_id=Integer)
+    )
+
+
+def _sort_key(spec: TableSpec, sort: str | None):
+    if sort == "id" or sort not in spec.sortable:
+        return "id", spec.model.id
+    # NULL ve boş değerler aynı sırada; imleç anahtarı hiçbir zaman NULL olmaz.
+    return sort, func.coalesce(spec.column(sort), "")
+
+
+def table_page(
+    db: Session,
+    spec: TableSpec,
+    *,
+    filters: Mapping[str, Iterable[Any]] | None = None,
+    q: str | None = None,
+    sort: str | None = None,
+    desc: bool = True,
+    cursor: str | None = None,
+    limit: int = TABLE_PAGE_SIZE,
+) -> TablePage:
+    """Return one page of ``spec``'s rows and the cursor of the next page.
+
+    ``filters`` maps column names to accepted values (several values of one
+    column are alternatives); unknown columns are ignored, as is a ``sort``
+    outside :attr:`TableSpec.sortable`, which falls back to the id.
+    """
+
+    limit = max(1, min(int(limit), TABLE_PAGE_MAX))
+    query = db.query(spec.model)
+    if spec.scope is not None:
+        query = query.filter(spec.scope())
+    for name, values in (filters or {}).items():
+        if name not in spec.columns:
+            continue
+        values = [v for v in values if v not in (None, "")]
+        if values:
+            query = query.filter(spec.column(name).in_(values))
+    if q and q.strip():
+        hits = _search_hits(spec, q)
+        if hits is None:
+            return TablePage(rows=[], next_cursor=None)
+        query = query.filter(spec.model.id.in_(hits))
+
+    sort, key = _sort_key(spec, sort)
+    if cursor:
+        query = query.filter(after_key(key, spec.model.id, cursor, descending=desc))
+    if desc:
+        query = query.order_by(key.desc(), spec.model.id.desc())
+    else:
+        query = query.order_by(key.asc(), spec.model.id.asc())
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        value = last.id if sort == "id" else getattr(last, sort) or ""
+        next_cursor = encode_key_cursor(value, last.id)
+    return TablePage(rows=rows, next_cursor=next_cursor)
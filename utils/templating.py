@@ -0,0 +1,65 @@
+"""The Jinja2 environment shared by every router.
+
+One environment means one template cache and one set of filters for the
+whole worker.  Compiled templates are also kept in a filesystem bytecode
+cache (``TEMPLATE_CACHE_DIR``, a per-user temp directory by default) so a
+new worker loads them without parsing, and :func:`precompile_templates`
+fills both caches at start-up instead of on the first request of each page.
+``TEMPLATE_AUTO_RELOAD=false`` stops Jinja from checking the template files
+for changes on every render; production deployments should set it.
+"""
+
+from __future__ import annotations
+
+import os
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from jinja2.exceptions import TemplateError
+
+from utils.template_filters import register_filters
+
+TEMPLATE_DIR = "templates"
+TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR") or None
+TEMPLATE_AUTO_RELOAD = os.getenv("TEMPLATE_AUTO_RELOAD", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+TEMPLATE_SUFFIXES = (".html",)
+
+
+def _bytecode_cache() -> FileSystemBytecodeCache:
+    if TEMPLATE_CACHE_DIR:
+        os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+    return FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+
+
+def create_templates() -> Jinja2Templates:
+    """Build a ``Jinja2Templates`` with the application's environment."""
+
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=True,
+        auto_reload=TEMPLATE_AUTO_RELOAD,
+        bytecode_cache=_bytecode_cache(),
+    )
+    return register_filters(Jinja2Templates(env=env))
+
+
+templates = create_templates()
+
+
+def precompile_templates(target: Jinja2Templates | None = None) -> list[str]:
+    """Compile every page template up front and return the broken ones."""
+
+    env = (target or templates).env
+    failed: list[str] = []
+    for name in env.list_templates(
+        filter_func=lambda name: name.endswith(TEMPLATE_SUFFIXES)
+    ):
+        try:
+            env.get_template(name)
+        except TemplateError:
+            failed.append(name)
+    return failed